@@ -1470,6 +1470,42 @@ def generate_siaf_pre_flight_reference_files_fgs(verbose=False, mode='siaf'):
                                      delimiter_pad=' ', bookend=False, overwrite=True)
 
 
+def generate_siaf_xml_field_format_module():
+    """Write the precompiled SIAF XML field format module pysiaf/siaf_xml_field_format.py.
+
+    The module holds the content of source_data/siaf_xml_field_format.txt as Python literals so
+    that pysiaf does not have to parse the reference file with astropy.table at import time. It
+    has to be regenerated whenever the reference file changes.
+
+    """
+    # parse the text file directly, field_nr would be converted to float by astropy.table
+    reference_file = os.path.join(JWST_SOURCE_DATA_ROOT, 'siaf_xml_field_format.txt')
+    with open(reference_file) as file_object:
+        rows = [tuple(entry.strip() for entry in line.split(','))
+                for line in file_object if line.strip() and not line.startswith('#')]
+    header, rows = rows[0], rows[1:]
+
+    lines = []
+    lines.append('"""Format and order of the XML fields present in the SIAF.')
+    lines.append('')
+    lines.append('This module is generated from source_data/siaf_xml_field_format.txt by')
+    lines.append('generate.generate_reference_files.generate_siaf_xml_field_format_module.')
+    lines.append('Do not edit it by hand.')
+    lines.append('')
+    lines.append('"""')
+    lines.append('')
+    lines.append('# ({})'.format(', '.join(header)))
+    lines.append('SIAF_XML_FIELDS = (')
+    for row in rows:
+        lines.append('    ({}),'.format(', '.join([repr(entry) for entry in row])))
+    lines.append(')')
+
+    outfile = os.path.join(os.path.dirname(pysiaf.__file__), 'siaf_xml_field_format.py')
+    with open(outfile, 'w') as file_object:
+        file_object.write('\n'.join(lines) + '\n')
+    print('Wrote {}'.format(outfile))
+
+
 def generate_siaf_xml_field_format_reference_files(verbose=False):
 
     # from constants import JWST_PRD_DATA_ROOT
@@ -10,10 +10,10 @@ import requests
 # Configure logging
 logger = logging.getLogger(__name__)
 
-from pkg_resources import get_distribution, DistributionNotFound
+from importlib.metadata import version, PackageNotFoundError
 try:
-    __version__ = get_distribution(__name__).version
-except DistributionNotFound:
+    __version__ = version(__name__)
+except PackageNotFoundError:
     # package is not installed
     __version__ = 'unknown'
 
@@ -21,12 +21,12 @@ from .aperture import Aperture, HstAperture, JwstAperture, RomanAperture
 from .constants import JWST_PRD_VERSION, JWST_PRD_DATA_ROOT, JWST_PRD_DATA_ROOT_EXCEL, HST_PRD_VERSION, \
     HST_PRD_DATA_ROOT
 from .iando import read, write
-from .siaf import Siaf, ApertureCollection
+from .siaf import Siaf, ApertureCollection, ApertureIndex, get_cached_siaf, load_many, SIAF_REGISTRY
 # from .tests import test_aperture#, test_polynomial
 from .utils import polynomial, rotations, tools, projection
 from .specpars import SpecPars
 
-__all__ = ['Aperture', 'HstAperture', 'JwstAperture', 'SIAF', 'JWST_PRD_VERSION', 'JWST_PRD_DATA_ROOT', 'HST_PRD_VERSION', 'HST_PRD_DATA_ROOT', '_JWST_STAGING_ROOT', 'siaf', 'iando', 'polynomial', 'rotations', 'tools', 'compare', 'JWST_PRD_DATA_ROOT_EXCEL', 'generate', 'projection']
+__all__ = ['Aperture', 'HstAperture', 'JwstAperture', 'SIAF', 'JWST_PRD_VERSION', 'JWST_PRD_DATA_ROOT', 'HST_PRD_VERSION', 'HST_PRD_DATA_ROOT', '_JWST_STAGING_ROOT', 'siaf', 'iando', 'polynomial', 'rotations', 'tools', 'compare', 'JWST_PRD_DATA_ROOT_EXCEL', 'generate', 'projection', 'get_cached_siaf', 'load_many', 'SIAF_REGISTRY', 'ApertureIndex']
 
 # Check PRD version is up to date
 try:
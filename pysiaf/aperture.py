@@ -26,27 +26,33 @@ Notes
 
 from __future__ import absolute_import, print_function, division
 
+from collections import OrderedDict
 import copy
+import hashlib
 import math
 import os
 import subprocess
 import sys
 
 import numpy as np
-import matplotlib.pyplot as pl
-from astropy.modeling import models
 from astropy.table import Table
 import astropy.units as u
-import matplotlib
 
 from .utils import rotations, projection, polynomial
 from .utils.tools import an_to_tel, tel_to_an
 from .iando import read
-from .constants import HST_PRD_DATA_ROOT, HST_PRD_VERSION
+from .constants import HST_PRD_DATA_ROOT, HST_PRD_VERSION, PIXEL_AREA_MAP_CACHE_ROOT
+from .siaf_xml_field_format import SIAF_XML_FIELDS
+
+# matplotlib and astropy.modeling are imported where they are used, they are costly to import
 
 # shorthands for supported coordinate systems
 FRAMES = ('det', 'sci', 'idl', 'tel', 'raw', 'sky')
 
+# marker color and size of the frame origins shown by plot_frame_origin
+FRAME_ORIGIN_MARKERS = OrderedDict([('det', ('red', 9)), ('sci', ('blue', 7)),
+                                    ('raw', ('black', 5)), ('idl', ('green', 3))])
+
 # list of attributes for the distortion coefficients up to degree 5
 POLYNOMIAL_COEFFICIENT_NAMES = 'Sci2IdlX Sci2IdlY Idl2SciX Idl2SciY'.split()
 DISTORTION_ATTRIBUTES = []
@@ -55,6 +61,12 @@ for i in range(5 + 1):
         for name in POLYNOMIAL_COEFFICIENT_NAMES:
             DISTORTION_ATTRIBUTES.append('{}{:d}{:d}'.format(name, i, j))
 
+# the coefficients are also held in a (name, coefficient) array on every aperture, this maps
+# each attribute to its position in that array
+DISTORTION_ATTRIBUTE_INDEX = {attribute: (k % len(POLYNOMIAL_COEFFICIENT_NAMES),
+                                          k // len(POLYNOMIAL_COEFFICIENT_NAMES))
+                              for k, attribute in enumerate(DISTORTION_ATTRIBUTES)}
+
 # list of attributes that have to be defined for a new aperture
 VALIDATION_ATTRIBUTES = ('InstrName AperName AperType AperShape '
                          'XDetSize YDetSize XDetRef YDetRef '
@@ -67,18 +79,17 @@ VALIDATION_ATTRIBUTES = ('InstrName AperName AperType AperShape '
 # list of attributes written to the JWST SIAFXML required by the JWST PRD
 # the order of the XML tags in the SIAFXML is relevant, therefore define IRCD order here
 # see JWST PRDS IRCD Volume III: S&OC Subsystems (JWST-STScI-000949) Table 4-3
-SIAF_XML_FIELD_FORMAT = read.read_siaf_xml_field_format_reference_file()
-PRD_REQUIRED_ATTRIBUTES_ORDERED = list(SIAF_XML_FIELD_FORMAT['field_name'])
+# the field format is precompiled from source_data/siaf_xml_field_format.txt, the corresponding
+# astropy table SIAF_XML_FIELD_FORMAT is read on first access (see __getattr__ below)
+PRD_REQUIRED_ATTRIBUTES_ORDERED = [field[1] for field in SIAF_XML_FIELDS]
 
 # As per JWST PRDS IRCD Volume III: S&OC Subsystems (JWST-STScI-000949) Table 4-3,
 # these attributes have to be integers, DetSciYAngle to be discussed (because it differs from SI
 # to SI)
-INTEGER_ATTRIBUTES = list(
-    SIAF_XML_FIELD_FORMAT['field_name'][SIAF_XML_FIELD_FORMAT['format'] == 'integer'])
+INTEGER_ATTRIBUTES = [np.str_(field[1]) for field in SIAF_XML_FIELDS if field[2] == 'integer']
 
 # these attributes have to be strings
-STRING_ATTRIBUTES = list(
-    SIAF_XML_FIELD_FORMAT['field_name'][SIAF_XML_FIELD_FORMAT['format'] == 'string'])
+STRING_ATTRIBUTES = [np.str_(field[1]) for field in SIAF_XML_FIELDS if field[2] == 'string']
 
 # these attributes have to be doubles/floats
 FLOAT_ATTRIBUTES = np.setdiff1d(PRD_REQUIRED_ATTRIBUTES_ORDERED,
@@ -93,11 +104,99 @@ ATTRIBUTES_THAT_CAN_BE_NONE = 'XDetSize YDetSize XDetRef YDetRef XSciSize YSciSi
 ATTRIBUTES_THAT_CAN_BE_NONE += 'AperShape V2Ref V3Ref V3IdlYAngle VIdlParity XIdlVert1 XIdlVert2 ' \
                                'XIdlVert3 XIdlVert4 YIdlVert1 YIdlVert2 YIdlVert3 YIdlVert4'.split()
 
+# per-attribute validator table used by Aperture.__setattr__, built once for O(1) lookups:
+# attribute name -> (format, accepted value types)
+ATTRIBUTE_VALIDATORS = {}
+for _format, _names, _types in [('integer', INTEGER_ATTRIBUTES, (int, np.int64)),
+                                ('string', STRING_ATTRIBUTES, (str, np.str_)),
+                                ('float', FLOAT_ATTRIBUTES, (float, np.float32, np.float64))]:
+    for _name in _names:
+        ATTRIBUTE_VALIDATORS[str(_name)] = (_format, frozenset(_types))
+_ATTRIBUTES_THAT_CAN_BE_NONE = frozenset(ATTRIBUTES_THAT_CAN_BE_NONE)
+
 # NIRSpec target acquisition filters
 NIRSPEC_TA_FILTER_NAMES = 'CLEAR F110W F140X'.split()
 
+# counter of aperture attribute changes. Every aperture records the counter value of its last
+# attribute change in _geometry_version, which lets caches of derived geometry, e.g. the
+# siaf.ApertureIndex, detect that they are outdated
+_geometry_version = 0
+
+# attributes that do not affect the outline of an aperture
+_NON_GEOMETRY_ATTRIBUTES = frozenset(['_attitude_matrix', '_tvs_matrix_cache'])
+
+
+def __getattr__(name):
+    """Return module attributes that are expensive to compute on first access.
+
+    SIAF_XML_FIELD_FORMAT requires parsing a reference file with astropy.table and the HST FGS
+    TVS matrices require reading the amu.rep file, neither is needed to import pysiaf.
+
+    """
+    if name == 'SIAF_XML_FIELD_FORMAT':
+        value = read.read_siaf_xml_field_format_reference_file()
+    elif name == 'amudotrep':
+        value = read.get_hst_fgs_amudotrep()
+    elif name in _HST_TVS_FGS_KEYS:
+        value = read.get_hst_fgs_amudotrep()[_HST_TVS_FGS_KEYS[name]]['tvs']
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    globals()[name] = value
+    return value
+
 
 # private functions
+
+def _increment_geometry_version():
+    """Increment and return the counter of aperture attribute changes."""
+    global _geometry_version
+    _geometry_version += 1
+    return _geometry_version
+
+
+def _canonical_value(value):
+    """Return a canonical string representation of an attribute value for content hashing.
+
+    Numbers are formatted independently of their numpy or python type, NaN and None have fixed
+    representations, and apertures referenced by other apertures are represented by their name.
+    Values of other types raise a TypeError, because their repr can depend on the object identity.
+
+    """
+    if type(value) is float:
+        # most common case first
+        if value != value:
+            return 'nan'
+        return '0.0' if value == 0 else repr(value)
+    elif value is None:
+        return 'None'
+    elif isinstance(value, Aperture):
+        return 'Aperture({})'.format(value.AperName)
+    elif isinstance(value, (bool, np.bool_)):
+        return repr(bool(value))
+    elif isinstance(value, (int, np.integer)):
+        return repr(int(value))
+    elif isinstance(value, (float, np.floating)):
+        value = float(value)
+        if math.isnan(value):
+            return 'nan'
+        elif value == 0:
+            # 0.0 and -0.0 are equal
+            return '0.0'
+        return repr(value)
+    elif isinstance(value, str):
+        return repr(str(value))
+    elif isinstance(value, np.ndarray):
+        return 'array({}, {})'.format(value.shape, _canonical_value(value.ravel().tolist()))
+    elif isinstance(value, (list, tuple)):
+        return '[{}]'.format(', '.join(_canonical_value(item) for item in value))
+    elif isinstance(value, dict):
+        return '{{{}}}'.format(', '.join('{}: {}'.format(_canonical_value(key),
+                                                         _canonical_value(value[key]))
+                                         for key in sorted(value, key=str)))
+    raise TypeError('No canonical representation for values of type {}.'.format(
+        type(value).__name__))
+
+
 def _telescope_transform_model(from_sys, to_sys, par, angle):
     """Return astropy.modeling models for tel<->idl transformations.
 
@@ -129,6 +228,7 @@ def _telescope_transform_model(from_sys, to_sys, par, angle):
     Adapted from https://github.com/spacetelescope/ramp_simulator/blob/master/read_siaf_table.py
 
     """
+    from astropy.modeling import models
     if from_sys != 'tel' and to_sys != 'tel':
         raise ValueError(
             'This function is designed to generate the transformation either to or from tel/V2V3.')
@@ -168,6 +268,19 @@ def _y_from_polar(y0, radius, phi_rad):
     return y0 + radius * np.cos(phi_rad)
 
 
+def _units_scale(units):
+    """Return the factor that converts arcseconds to units ('arcsec', 'arcmin', 'deg')."""
+    if units.lower() == 'arcsec':
+        scale = 1
+    elif units.lower() == 'arcmin':
+        scale = 1. / 60
+    elif units.lower() == 'deg':
+        scale = 1. / 60 / 60
+    else:
+        raise ValueError("Unknown units: " + units)
+    return scale
+
+
 class Aperture(object):
     """A class for aperture definitions of astronomical telescopes.
 
@@ -205,6 +318,9 @@ class Aperture(object):
     There exist methods for all of the possible ``{tel,idl,sci,det}_to_{tel,idl,sci,det}``
     combinations.
 
+    Apertures compare by the content of their PRD attributes, see content_hash. Hashing is by
+    identity, use content_hash to key apertures by content.
+
     """
 
     def __init__(self):
@@ -216,6 +332,12 @@ class Aperture(object):
         # attribute that indicates whether the aperture has been validated for formal correctness
         self.__dict__['_initial_attributes_validated'] = False
 
+        # contiguous copy of the distortion coefficient attributes, one row per coefficient name,
+        # undefined coefficients are NaN
+        self.__dict__['_polynomial_coefficients'] = np.full(
+            (len(POLYNOMIAL_COEFFICIENT_NAMES),
+             len(DISTORTION_ATTRIBUTES) // len(POLYNOMIAL_COEFFICIENT_NAMES)), np.nan)
+
         # attribute that controls whether DVA is corrected for when transforming from Ideal to
         # tel/V2V3 frame
         self.__dict__['_correct_dva'] = False
@@ -237,30 +359,124 @@ class Aperture(object):
         value : str, int, float
             Attribute value
 
+        """
+        self.__dict__[key] = self._validated_value(key, value, getattr(self, 'AperType', None))
+        if key in DISTORTION_ATTRIBUTE_INDEX:
+            self._update_polynomial_coefficient_array([key])
+        if key not in _NON_GEOMETRY_ATTRIBUTES:
+            self._geometry_changed()
+
+    def _geometry_changed(self):
+        """Record that an attribute changed that may affect the aperture geometry or content.
+
+        Every method that modifies attributes, including those that write to __dict__ directly
+        like set_polynomial_coefficients, calls this method. It also discards the content hash.
+
+        """
+        self.__dict__['_geometry_version'] = _increment_geometry_version()
+        self.__dict__.pop('_content_hash', None)
+
+    def _geometry_dependencies(self):
+        """Return the other apertures whose attributes enter the transformations of this one."""
+        return ()
+
+    def _geometry_key(self):
+        """Return a key that changes when the geometry of the aperture may have changed.
+
+        The key combines the geometry versions of the aperture and of the apertures it depends
+        on, see _geometry_dependencies.
+
+        """
+        return (self.__dict__.get('_geometry_version', 0),) + tuple(
+            (id(aperture), aperture._geometry_key())
+            for aperture in self._geometry_dependencies())
+
+    def _update_polynomial_coefficient_array(self, keys):
+        """Copy the values of distortion coefficient attributes into the coefficient array.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            Attribute names, names that are not in DISTORTION_ATTRIBUTES are ignored
+
+        """
+        coefficients = self.__dict__['_polynomial_coefficients']
+        for key in keys:
+            index = DISTORTION_ATTRIBUTE_INDEX.get(key)
+            if index is not None:
+                value = self.__dict__[key]
+                coefficients[index] = np.nan if value is None else value
+
+    def _validated_value(self, key, value, aper_type):
+        """Return attribute value after verifying that it has the correct format.
+
+        Parameters
+        ----------
+        key : str
+            Attribute name
+        value : str, int, float
+            Attribute value
+        aper_type : str
+            AperType of the aperture, needed for the NIRSpec special case
+
+        Returns
+        -------
+        value : str, int, float
+            Value to be assigned, masked floats are replaced by 0.0
+
         """
         if (key == 'AperType') and (value not in self._accepted_aperture_types):
             raise AttributeError(
                 '{} attributes has to be one of {}'.format(key, self._accepted_aperture_types))
 
-        if (value is None) and (key in ATTRIBUTES_THAT_CAN_BE_NONE):
-            pass
-        elif (value is None) and (key in ['DDCName']) and (self.AperType in ['TRANSFORM', None]):
-            # NIRSpec case
-            pass
-        elif (key in INTEGER_ATTRIBUTES) and (type(value) not in [int, np.int64]):
+        if value is None:
+            if key in _ATTRIBUTES_THAT_CAN_BE_NONE:
+                return value
+            elif (key == 'DDCName') and (aper_type in ['TRANSFORM', None]):
+                # NIRSpec case
+                return value
+
+        validator = ATTRIBUTE_VALIDATORS.get(key)
+        if (validator is None) or (type(value) in validator[1]):
+            return value
+
+        attribute_format = validator[0]
+        if attribute_format == 'integer':
             raise AttributeError('pysiaf Aperture attribute `{}` has to be an integer.'.format(key))
-        elif (key in STRING_ATTRIBUTES) and (type(value) not in [str, np.str_]):
+        elif attribute_format == 'string':
             raise AttributeError(
                 'pysiaf Aperture attribute `{}` has to be a string (tried to assign it type {'
                 '}).'.format(
                     key, type(value)))
-        elif (key in FLOAT_ATTRIBUTES) and (type(value) not in [float, np.float32, np.float64]):
-            if np.ma.is_masked(value):  # accomodate `None` entries in SIAF definition source files
-                value = 0.0
-            else:
-                raise AttributeError('pysiaf Aperture attribute `{}` has to be a float.'.format(key))
+        elif np.ma.is_masked(value):  # accomodate `None` entries in SIAF definition source files
+            return 0.0
+        else:
+            raise AttributeError('pysiaf Aperture attribute `{}` has to be a float.'.format(key))
 
-        self.__dict__[key] = value
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Create an aperture from a mapping of attribute names to values.
+
+        All values are validated like in __setattr__ and then assigned in bulk, which is faster
+        than setting the attributes one by one.
+
+        Parameters
+        ----------
+        mapping : dict
+            Attribute names and values, e.g. one SiafEntry of a SIAF xml file
+
+        Returns
+        -------
+        aperture : instance of cls
+            The new aperture
+
+        """
+        aperture = cls()
+        aper_type = mapping.get('AperType', aperture.AperType)
+        aperture.__dict__.update({key: aperture._validated_value(key, value, aper_type)
+                                  for key, value in mapping.items()})
+        aperture._update_polynomial_coefficient_array(mapping.keys())
+        return aperture
 
     def __str__(self):
         """Return string describing the instance."""
@@ -270,6 +486,45 @@ class Aperture(object):
         """Representation of instance."""
         return "<pysiaf.Aperture object AperName={0} >".format(self.AperName)
 
+    @property
+    def content_hash(self):
+        """SHA-1 hash of the PRD attributes of the aperture.
+
+        The hash is computed on first access and discarded whenever an attribute is modified,
+        see _geometry_changed.
+        Floats are formatted canonically, i.e. numpy and python numbers of equal value, 0.0 and
+        -0.0, and NaN values have the same hash. Other attributes, e.g. caches of derived
+        quantities or the Roman SpecPars, are not hashed.
+
+        Returns
+        -------
+        content_hash : str
+            Hexadecimal digest
+
+        """
+        content_hash = self.__dict__.get('_content_hash')
+        if content_hash is None:
+            content = '\n'.join('{}={}'.format(key, _canonical_value(getattr(self, key, None)))
+                                 for key in PRD_REQUIRED_ATTRIBUTES_ORDERED)
+            content_hash = hashlib.sha1(content.encode()).hexdigest()
+            self.__dict__['_content_hash'] = content_hash
+        return content_hash
+
+    def __eq__(self, other):
+        """Return whether two apertures have the same PRD attributes, see content_hash.
+
+        Apertures compare by content, not by identity: two separately read apertures with equal
+        attributes are equal. Use ``is`` to test for the same object.
+
+        """
+        if not isinstance(other, Aperture):
+            return NotImplemented
+        return (self is other) or (self.content_hash == other.content_hash)
+
+    # Apertures are mutable, so they hash by identity and stay valid dictionary keys and set
+    # members when modified. Equal apertures can therefore have different hashes.
+    __hash__ = object.__hash__
+
     def set_distortion_coefficients_from_file(self, file_name):
         """Set polynomial from standardized file.
 
@@ -316,8 +571,7 @@ class Aperture(object):
         """
         points_x, points_y = self.corners(to_frame, rederive=rederive)
 
-        return points_x[np.append(np.arange(len(points_x)), 0)], points_y[
-            np.append(np.arange(len(points_y)), 0)]
+        return np.concatenate((points_x, points_x[:1])), np.concatenate((points_y, points_y[:1]))
 
     def complement(self):
         """Complement the attributes of an aperture.
@@ -448,7 +702,35 @@ class Aperture(object):
         x, y : tuple of float arrays
             coordinates of vertices in to_frame
 
+        Notes
+        -----
+        The vertices are memoized per (to_frame, rederive) until the next attribute of the
+        aperture, or of an aperture it depends on, e.g. the parent aperture of a NIRSpec slit,
+        changes. Vertices in the sky frame, which depend on the attitude matrix, are not
+        memoized.
+
         """
+        return self._memoized_corners(to_frame, rederive)
+
+    def _memoized_corners(self, to_frame, rederive):
+        """Return copies of the vertices computed by _corners, see corners()."""
+        if to_frame == 'sky':
+            return self._corners(to_frame, rederive)
+
+        version = self._geometry_key()
+        cache = self.__dict__.get('_corners_cache')
+        if (cache is None) or (cache[0] != version):
+            cache = (version, {})
+            self.__dict__['_corners_cache'] = cache
+        key = (to_frame, rederive)
+        if key not in cache[1]:
+            x, y = self._corners(to_frame, rederive)
+            cache[1][key] = (np.array(x, dtype=float), np.array(y, dtype=float))
+        x, y = cache[1][key]
+        return x.copy(), y.copy()
+
+    def _corners(self, to_frame, rederive):
+        """Compute the vertices of the aperture, see corners()."""
         if rederive or not hasattr(self, 'XIdlVert1'):
             # see Colin's Calc worksheet
             x1 = -1 * getattr(self, 'XSciRef') + 0.5
@@ -468,16 +750,18 @@ class Aperture(object):
         return self.convert(corners.x, corners.y, corners.frame, to_frame)
 
     def get_polynomial_coefficients(self):
-        """Return a dictionary of arrays holding the significant idl/sci coefficients."""
+        """Return a dictionary of arrays holding the significant idl/sci coefficients.
+
+        The arrays are copies of the coefficients held by the aperture, undefined coefficients
+        are NaN. Use set_polynomial_coefficients to modify the coefficients of the aperture.
+
+        """
         if self.Sci2IdlDeg is None:
             return None
 
         number_of_coefficients = polynomial.number_of_coefficients(self.Sci2IdlDeg)
-        cdict = {}
-        for seed in 'Sci2IdlX Sci2IdlY Idl2SciX Idl2SciY'.split():
-            cdict[seed] = np.array([getattr(self, s) for s in DISTORTION_ATTRIBUTES if
-                                   seed in s])[0:number_of_coefficients]
-        return cdict
+        coefficients = self._polynomial_coefficients[:, 0:number_of_coefficients].copy()
+        return dict(zip(POLYNOMIAL_COEFFICIENT_NAMES, coefficients))
 
 
     def get_polynomial_derivatives(self, location='fiducial', coefficient_seed='Sci2Idl'):
@@ -520,14 +804,10 @@ class Aperture(object):
             evaluation_point_y = location['y'] - reference_point_y
 
             coefficients = self.get_polynomial_coefficients()
-            b = polynomial.dpdx(coefficients['{}X'.format(coefficient_seed)], evaluation_point_x,
-                                evaluation_point_y)
-            c = polynomial.dpdy(coefficients['{}X'.format(coefficient_seed)], evaluation_point_x,
-                                evaluation_point_y)
-            e = polynomial.dpdx(coefficients['{}Y'.format(coefficient_seed)], evaluation_point_x,
-                                evaluation_point_y)
-            f = polynomial.dpdy(coefficients['{}Y'.format(coefficient_seed)], evaluation_point_x,
-                                evaluation_point_y)
+            b, c, e, f = polynomial.partial_derivatives(
+                coefficients['{}X'.format(coefficient_seed)],
+                coefficients['{}Y'.format(coefficient_seed)], evaluation_point_x,
+                evaluation_point_y)
 
         return {'b': b, 'c': c, 'e': e, 'f': f}
 
@@ -555,6 +835,39 @@ class Aperture(object):
                                                                   derivatives['f'])
         return results
 
+    def get_polynomial_linear_parameters_at(self, x_sci, y_sci, coefficient_seed='Sci2Idl'):
+        """Return linear polynomial parameters at many science frame positions.
+
+        Vectorized equivalent of get_polynomial_linear_parameters with a location dictionary,
+        the derivatives at all positions are computed from one table of powers.
+
+        Parameters
+        ----------
+        x_sci : float or numpy array
+            science frame x coordinates
+        y_sci : float or numpy array
+            science frame y coordinates, broadcastable with x_sci
+        coefficient_seed : str
+            'Sci2Idl' or 'Idl2Sci'
+
+        Returns
+        -------
+        results : OrderedDict
+            scale, rotation, and skew parameters for every position, see
+            polynomial.rotation_scale_skew_from_derivatives
+
+        """
+        if self.Sci2IdlDeg is None:
+            raise RuntimeError('No distortion coefficients available.')
+
+        derivatives = self.get_polynomial_derivatives(
+            location={'x': np.asarray(x_sci, dtype=float), 'y': np.asarray(y_sci, dtype=float)},
+            coefficient_seed=coefficient_seed)
+        return polynomial.rotation_scale_skew_from_derivatives(derivatives['b'],
+                                                               derivatives['c'],
+                                                               derivatives['e'],
+                                                               derivatives['f'])
+
     def set_polynomial_coefficients(self, sci2idlx, sci2idly, idl2scix, idl2sciy):
         """Set the values of polynomial coefficients.
 
@@ -574,13 +887,96 @@ class Aperture(object):
             raise KeyError('This aperture has no polynomial coefficients')
         else:
             number_of_coefficients = polynomial.number_of_coefficients(self.Sci2IdlDeg)
+            aper_type = self.AperType
+            # DISTORTION_ATTRIBUTES is ordered by coefficient, then by name
+            attributes = OrderedDict()
             for i in range(number_of_coefficients):
-                setattr(self, DISTORTION_ATTRIBUTES[4*i], sci2idlx[i])
-                setattr(self, DISTORTION_ATTRIBUTES[4*i+1], sci2idly[i])
-                setattr(self, DISTORTION_ATTRIBUTES[4*i+2], idl2scix[i])
-                setattr(self, DISTORTION_ATTRIBUTES[4*i+3], idl2sciy[i])
+                for k, values in enumerate([sci2idlx, sci2idly, idl2scix, idl2sciy]):
+                    key = DISTORTION_ATTRIBUTES[4 * i + k]
+                    attributes[key] = self._validated_value(key, values[i], aper_type)
+            self.__dict__.update(attributes)
+            self._update_polynomial_coefficient_array(attributes.keys())
+            self._geometry_changed()
             return None
 
+    def pixel_area_map(self, shape=None, dtype=np.float32, cache=True, cache_dir=None,
+                       chunk_size=256):
+        """Return the area of every science pixel in the ideal frame.
+
+        The area is the absolute value of the Jacobian determinant of the Sci2Idl polynomial,
+        evaluated at the pixel centres in rows of chunk_size pixels. Maps are cached on disk,
+        keyed by a hash of the coefficients, the reference point, the shape, and the dtype.
+
+        Parameters
+        ----------
+        shape : tuple
+            (number of rows, number of columns) of the map, defaults to (YSciSize, XSciSize).
+            The first pixel is centred at science coordinates (1, 1).
+        dtype : numpy dtype
+            data type of the returned map
+        cache : bool
+            whether to read and write the disk cache
+        cache_dir : str
+            cache directory, defaults to constants.PIXEL_AREA_MAP_CACHE_ROOT
+        chunk_size : int
+            number of rows evaluated at once
+
+        Returns
+        -------
+        area_map : numpy array
+            pixel areas in square arcseconds
+
+        """
+        if self.Sci2IdlDeg is None:
+            raise RuntimeError('No distortion coefficients available.')
+        if shape is None:
+            if (self.XSciSize is None) or (self.YSciSize is None):
+                raise RuntimeError('Aperture {} has no science frame size, specify the shape.'
+                                   .format(self.AperName))
+            shape = (self.YSciSize, self.XSciSize)
+        shape = tuple(int(n) for n in shape)
+        dtype = np.dtype(dtype)
+
+        coefficients = self.get_polynomial_coefficients()
+        sci2idlx = np.array(coefficients['Sci2IdlX'], dtype=float)
+        sci2idly = np.array(coefficients['Sci2IdlY'], dtype=float)
+
+        if cache_dir is None:
+            cache_dir = PIXEL_AREA_MAP_CACHE_ROOT
+        key = hashlib.sha1()
+        for item in [sci2idlx, sci2idly, np.array([self.XSciRef, self.YSciRef], dtype=float),
+                     np.array(shape)]:
+            key.update(item.tobytes())
+        key.update(dtype.str.encode())
+        cache_file = os.path.join(cache_dir, '{}_{}.npy'.format(self.AperName, key.hexdigest()))
+
+        if cache and os.path.isfile(cache_file):
+            try:
+                return np.load(cache_file)
+            except (OSError, ValueError):
+                # unreadable cache files are recomputed and overwritten
+                pass
+
+        x = np.arange(1, shape[1] + 1) - self.XSciRef
+        area_map = np.empty(shape, dtype=dtype)
+        for start in range(0, shape[0], chunk_size):
+            stop = min(start + chunk_size, shape[0])
+            y = np.arange(start + 1, stop + 1) - self.YSciRef
+            area_map[start:stop] = polynomial.jacob(sci2idlx, sci2idly, x[np.newaxis, :],
+                                                    y[:, np.newaxis])
+
+        if cache:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # write to a temporary file first so that concurrent readers never see partial maps
+                temporary_file = '{}.{:d}.tmp'.format(cache_file, os.getpid())
+                with open(temporary_file, 'wb') as file:
+                    np.save(file, area_map)
+                os.replace(temporary_file, cache_file)
+            except OSError:
+                pass
+        return area_map
+
     def path(self, to_frame):
         """Return matplotlib path generated from aperture vertices.
 
@@ -595,6 +991,7 @@ class Aperture(object):
             Path describing the aperture outline
 
         """
+        import matplotlib.path
         return matplotlib.path.Path(np.array(self.closed_polygon_points(to_frame)).T)
 
     def plot(self, frame='tel', label=False, ax=None, title=False, units='arcsec',
@@ -644,6 +1041,7 @@ class Aperture(object):
         #             error('Please provide attitude_ref')
 
         """
+        import matplotlib.pyplot as pl
         if self.AperType == "TRANSFORM":
             raise TypeError("Cannot plot aperture of type: TRANSFORM")
 
@@ -722,40 +1120,26 @@ class Aperture(object):
 
 
         """
+        import matplotlib.pyplot as pl
         if ax is None:
             ax = pl.gca()
 
-        if units.lower() == 'arcsec':
-            scale = 1
-        elif units.lower() == 'arcmin':
-            scale = 1. / 60
-        elif units.lower() == 'deg':
-            scale = 1. / 60 / 60
-        else:
-            raise ValueError("Unknown units: " + units)
+        scale = _units_scale(units)
+        for origin, (c1, c2) in self._frame_origins(frame, which).items():
+            color, markersize = FRAME_ORIGIN_MARKERS[origin]
+            ax.plot(c1 * scale, c2 * scale, color=color, marker='s', markersize=markersize)
 
+    def _frame_origins(self, frame, which):
+        """Return the origins of the frames selected by which, see plot_frame_origin."""
         # Set which variable to be a list if not already for easy parsing
         if isinstance(which, str):
             which = [which]
 
-        # detector frame
-        if 'det' in which or 'all' in which:
-            c1, c2 = self.convert(0, 0, 'det', frame)
-            ax.plot(c1 * scale, c2 * scale, color='red', marker='s', markersize=9)
-
-        # science frame
-        if 'sci' in which or 'all' in which:
-            c1, c2 = self.convert(0, 0, 'sci', frame)
-            ax.plot(c1 * scale, c2 * scale, color='blue', marker='s', markersize=7)
-
-        # raw frame
-        if 'raw' in which or 'all' in which:
-            c1, c2 = self.convert(0, 0, 'raw', frame)
-            ax.plot(c1 * scale, c2 * scale, color='black', marker='s', markersize=5)
-
-        if 'idl' in which or 'all' in which:
-            c1, c2 = self.convert(0, 0, 'idl', frame)
-            ax.plot(c1 * scale, c2 * scale, color='green', marker='s', markersize=3)
+        origins = OrderedDict()
+        for origin in FRAME_ORIGIN_MARKERS:
+            if origin in which or 'all' in which:
+                origins[origin] = self.convert(0, 0, origin, frame)
+        return origins
 
     def plot_detector_channels(self, frame, color='0.5', alpha=0.3, evenoddratio=0.5, ax=None):
         """Outline the detector readout channels.
@@ -781,7 +1165,29 @@ class Aperture(object):
             axes are inferred from pyplot.)
 
         """
+        import matplotlib.patches
+        import matplotlib.pyplot as pl
+
+        if ax is None:
+            ax = pl.gca()
+
+        for chan, plotpoints in enumerate(self._detector_channel_vertices(frame)):
+            chan_alpha = alpha if chan % 2 == 1 else alpha * evenoddratio
+            rect = matplotlib.patches.Polygon(
+                plotpoints,
+                closed=True,
+                alpha=chan_alpha,
+                facecolor=color,
+                edgecolor='none',
+                lw=0)
+            ax.add_patch(rect)
+
+    def _detector_channel_vertices(self, frame):
+        """Return the vertices of the four readout channels, shape (4, 4, 2).
 
+        The vertices of all channels are transformed from the det frame in one call.
+
+        """
         # NIRSpec MSA requires plotting underlying channels
         msa_dict = {"NRS_FULL_MSA1": "NRS2_FULL", "NRS_FULL_MSA2": "NRS2_FULL",
                     "NRS_FULL_MSA3": "NRS1_FULL", "NRS_FULL_MSA4": "NRS1_FULL",
@@ -790,35 +1196,23 @@ class Aperture(object):
         if self.AperName not in msa_dict.keys():
             npixels = self.XDetSize
         else:
+            from .siaf import get_cached_siaf  # runtime import to avoid circular import on startup
             aper = msa_dict[self.AperName]
-            nrs = read.read_jwst_siaf(self.InstrName)[aper]
+            nrs = get_cached_siaf(self.InstrName)[aper]
             npixels = nrs.XDetSize
 
         ch = npixels / 4
 
-        if ax is None:
-            ax = pl.gca()
-
+        offsets = np.arange(4)[:, np.newaxis] * ch
         if self.InstrName in ['NIRISS', 'FGS', 'NIRSPEC']:
-            pts = ((0, 0), (0, ch), (npixels, ch), (npixels, 0))
+            x_det = np.array([0, 0, npixels, npixels]) + 0 * offsets
+            y_det = np.array([0, ch, ch, 0]) + offsets
         else:
-            pts = ((0, 0), (ch, 0), (ch, npixels), (0, npixels))
-        for chan in range(4):
-            plotpoints = np.zeros((4, 2))
-            for i, xy in enumerate(pts):
-                if self.InstrName in ['NIRISS', 'FGS', 'NIRSPEC']:
-                    plotpoints[i] = self.convert(xy[0], xy[1] + chan * ch, 'det', frame)
-                else:
-                    plotpoints[i] = self.convert(xy[0] + chan * ch, xy[1], 'det', frame)
-            chan_alpha = alpha if chan % 2 == 1 else alpha * evenoddratio
-            rect = matplotlib.patches.Polygon(
-                plotpoints,
-                closed=True,
-                alpha=chan_alpha,
-                facecolor=color,
-                edgecolor='none',
-                lw=0)
-            ax.add_patch(rect)
+            x_det = np.array([0, ch, ch, 0]) + offsets
+            y_det = np.array([0, 0, npixels, npixels]) + 0 * offsets
+        x, y = self.convert(x_det.ravel(), y_det.ravel(), 'det', frame)
+        return np.stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)),
+                        axis=-1).reshape(4, 4, 2)
 
     def reference_point(self, to_frame):
         """Return the defining reference point of the aperture in to_frame."""
@@ -846,6 +1240,7 @@ class Aperture(object):
         x_model, y_model : tuple of astropy.modeling models
 
         """
+        from astropy.modeling import models
         # create the model for the transformation
         if parity is None:
             parity = getattr(self, 'DetSciParity')
@@ -887,10 +1282,8 @@ class Aperture(object):
         y_model : astropy.modeling.Model
             Correction in y
 
-        .. todo:: Clean up part with all_keys = self.__dict__.keys()
-
-
         """
+        from astropy.modeling import models
         if from_system not in ['idl', 'sci']:
             raise ValueError('Requested from_system of {} not recognized.'.format(from_system))
 
@@ -909,7 +1302,7 @@ class Aperture(object):
         degree = int(getattr(self, 'Sci2IdlDeg'))
 
         number_of_coefficients = polynomial.number_of_coefficients(degree)
-        all_keys = self.__dict__.keys()
+        all_keys = DISTORTION_ATTRIBUTES
 
         for axis in ['X', 'Y']:
             coeff_keys = np.array([c for c in all_keys if label + axis in c])
@@ -962,6 +1355,7 @@ class Aperture(object):
         .. todo:: upgrade: use astropy.units to allow any type of input angular unit
 
         """
+        from astropy.modeling import models
         if verbose:
             print('Using planar approximation to convert between IDL and V2V3')
 
@@ -1547,10 +1941,14 @@ HST_FLIP_2 = np.array([[0, 0, 1], [-1, 0, 0], [0, -1, 0]])
 HST_FLIP_3 = np.array([[0, 0, 1], [0, -1, 0], [1, 0, 0]])
 
 # TVS matrices
-amudotrep = read.read_hst_fgs_amudotrep()
-HST_TVS_FGS_1R = amudotrep['fgs1']['tvs']
-HST_TVS_FGS_2R2 = amudotrep['fgs2']['tvs']
-HST_TVS_FGS_3 = amudotrep['fgs3']['tvs']
+# HST_TVS_FGS_1R, HST_TVS_FGS_2R2, HST_TVS_FGS_3 and amudotrep are read on first access
+_HST_TVS_FGS_KEYS = {'HST_TVS_FGS_1R': 'fgs1', 'HST_TVS_FGS_2R2': 'fgs2', 'HST_TVS_FGS_3': 'fgs3'}
+
+# attributes that the TVS matrix of an HST FGS aperture depends on. Setting any of these
+# invalidates the memoized TVS matrices of that aperture
+HST_TVS_DEPENDENT_ATTRIBUTES = ('AperName', 'tvs_flip_matrix', 'db_tvs_v2_arcsec',
+                                'db_tvs_v3_arcsec', 'db_tvs_pa_deg',
+                                '_fgs_use_rearranged_alignment_parameters')
 
 
 class HstAperture(Aperture):
@@ -1579,6 +1977,29 @@ class HstAperture(Aperture):
                           'ya0': 'YSciRef',
                           'ideg': 'Sci2IdlDeg'})
 
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Create an aperture from a mapping of attribute names to values.
+
+        HST attributes are converted to JWST convention on assignment, therefore they are set one
+        by one.
+
+        Parameters
+        ----------
+        mapping : dict
+            Attribute names and values
+
+        Returns
+        -------
+        aperture : HstAperture
+            The new aperture
+
+        """
+        aperture = cls()
+        for key, value in mapping.items():
+            setattr(aperture, key, value)
+        return aperture
+
     def __setattr__(self, key, value):
         """Set attribute in JWST convention and check format.
 
@@ -1589,8 +2010,21 @@ class HstAperture(Aperture):
         1, x, y, x2, xy, y2 ... (This is a more natural order than is used on
         HST which results in 1, y, x, y2, xy, x2...)
 
+        The TVS flip matrix is stored as a read-only copy, so that the memoized TVS matrices
+        cannot be invalidated by in-place changes.
+
         """
+        if (key == 'tvs_flip_matrix') and (value is not None):
+            value = np.array(value)
+            value.setflags(write=False)
         self.__dict__[key] = value
+        if key not in _NON_GEOMETRY_ATTRIBUTES:
+            self._geometry_changed()
+
+        if key in HST_TVS_DEPENDENT_ATTRIBUTES:
+            self.__dict__['_tvs_matrix_cache'] = {}
+        elif key in DISTORTION_ATTRIBUTE_INDEX:
+            self._update_polynomial_coefficient_array([key])
 
         # set attributes using JWST naming convention
         if key in self._hst_to_jwst_keys.keys():
@@ -1607,13 +2041,10 @@ class HstAperture(Aperture):
             jwst_ordered_coefficients = self.polynomial_coefficients[conversion_index, :]
 
             self.jwst_ordered_coefficients = jwst_ordered_coefficients
-            m = 0
-            for i in range(self.Sci2IdlDeg + 1):
-                for j in np.arange(i + 1):
-                    for k, name in enumerate(POLYNOMIAL_COEFFICIENT_NAMES):
-                        self.__dict__['{}{:d}{:d}'.format(name, i, j)] = jwst_ordered_coefficients[
-                            m, k]
-                    m += 1
+            # DISTORTION_ATTRIBUTES is ordered like the flattened (coefficient, name) array
+            self.__dict__.update(zip(DISTORTION_ATTRIBUTES, jwst_ordered_coefficients.ravel()))
+            self._polynomial_coefficients[:, 0:len(jwst_ordered_coefficients)] = \
+                jwst_ordered_coefficients.T
 
     def _tvs_parameters(self, tvs=None, units=None, apply_rearrangement=True):
         """Compute V2_tvs, V3_tvs, and V3angle_tvs from the TVS matrices stored in the database.
@@ -1623,12 +2054,8 @@ class HstAperture(Aperture):
 
         """
         if tvs is None:
-            if self.AperName == 'FGS1':
-                tvs = HST_TVS_FGS_1R
-            elif self.AperName == 'FGS2':
-                tvs = HST_TVS_FGS_2R2
-            elif self.AperName == 'FGS3':
-                tvs = HST_TVS_FGS_3
+            if self.AperName in ['FGS1', 'FGS2', 'FGS3']:
+                tvs = read.get_hst_fgs_amudotrep()[self.AperName.lower()]['tvs']
             else:
                 raise NotImplementedError
 
@@ -1674,8 +2101,7 @@ class HstAperture(Aperture):
             points_x, points_y = self.corners(to_frame)
 
         # return the closed polygon coordinates
-        return points_x[np.append(np.arange(len(points_x)), 0)], points_y[
-            np.append(np.arange(len(points_y)), 0)]
+        return np.concatenate((points_x, points_x[:1])), np.concatenate((points_y, points_y[:1]))
 
     def rearrange_fgs_alignment_parameters(self, pa_deg_in, v2_arcsec_in, v3_arcsec_in, direction):
         """Convert to/from alignment parameters make FGS look like a regular camera aperture.
@@ -1728,9 +2154,13 @@ class HstAperture(Aperture):
         return pa, v2, v3
 
 
-    def compute_tvs_matrix(self, v2_arcsec=None, v3_arcsec=None, pa_deg=None, verbose=False):
+    def compute_tvs_matrix(self, v2_arcsec=None, v3_arcsec=None, pa_deg=None, verbose=False,
+                           transpose=False):
         """Compute the TVS matrix from tvs-specific v2,v3,pa parameters.
 
+        The matrix is memoized per aperture and per (v2, v3, pa) combination and is recomputed
+        only after one of the attributes it depends on has been modified.
+
         Parameters
         ----------
         v2_arcsec : float
@@ -1741,11 +2171,13 @@ class HstAperture(Aperture):
             angle
         verbose : bool
             verbosity
+        transpose : bool
+            If True, return the transpose (i.e. the inverse) of the TVS matrix
 
         Returns
         -------
         tvs : numpy matrix
-            TVS matrix
+            TVS matrix (read-only)
 
         """
         if v2_arcsec is None:
@@ -1758,6 +2190,50 @@ class HstAperture(Aperture):
         if verbose:
             print('Computing TVS with tvs_v2_arcsec={}, tvs_v3_arcsec={}, tvs_pa_deg={}'.format(v2_arcsec, v3_arcsec, pa_deg))
 
+        tvs, tvs_transpose = self._tvs_matrices(v2_arcsec, v3_arcsec, pa_deg)
+        if transpose:
+            return tvs_transpose
+        return tvs
+
+    def _tvs_matrices(self, v2_arcsec, v3_arcsec, pa_deg):
+        """Return the TVS matrix and its transpose, memoized per (v2, v3, pa) combination.
+
+        The cache is reset whenever one of HST_TVS_DEPENDENT_ATTRIBUTES is set. The returned
+        arrays are shared between calls and, like the stored tvs_flip_matrix, flagged read-only,
+        so that the cached matrices cannot become stale through in-place changes.
+
+        Parameters
+        ----------
+        v2_arcsec : float
+            offset
+        v3_arcsec : float
+            offset
+        pa_deg : float
+            angle
+
+        Returns
+        -------
+        tvs, tvs_transpose : tuple of numpy arrays
+            TVS matrix and its transpose
+
+        """
+        if np.ndim(v2_arcsec) or np.ndim(v3_arcsec) or np.ndim(pa_deg):
+            # non-scalar parameters cannot serve as cache key
+            tvs = self._compute_tvs_matrix(v2_arcsec, v3_arcsec, pa_deg)
+            return tvs, np.transpose(tvs)
+
+        key = (float(v2_arcsec), float(v3_arcsec), float(pa_deg))
+        cache = self.__dict__.setdefault('_tvs_matrix_cache', {})
+        if key not in cache:
+            tvs = np.array(self._compute_tvs_matrix(v2_arcsec, v3_arcsec, pa_deg))
+            tvs_transpose = np.ascontiguousarray(tvs.T)
+            tvs.setflags(write=False)
+            tvs_transpose.setflags(write=False)
+            cache[key] = (tvs, tvs_transpose)
+        return cache[key]
+
+    def _compute_tvs_matrix(self, v2_arcsec, v3_arcsec, pa_deg):
+        """Compute the TVS matrix without caching, see compute_tvs_matrix."""
         if self._fgs_use_rearranged_alignment_parameters:
             pa, v2, v3 = self.rearrange_fgs_alignment_parameters(pa_deg, v2_arcsec, v3_arcsec, 'fgs_to_camera')
             # attitude = rotations.attitude(v2, v3, 0.0, 0.0, pa)
@@ -1770,6 +2246,10 @@ class HstAperture(Aperture):
 
     def corners(self, to_frame, rederive=False):
         """Return coordinates of the aperture vertices in the specified frame."""
+        return self._memoized_corners(to_frame, rederive)
+
+    def _corners(self, to_frame, rederive):
+        """Compute the vertices of the aperture, see corners()."""
         if self.a_shape == 'PICK':
             # compute pickle corner points in tel/V2V3 frame
             x0 = 0.
@@ -1898,7 +2378,8 @@ class HstAperture(Aperture):
             tvs_v3_arcsec = V3Ref_arcsec
 
             # treat V3IdlYAngle, V2Ref, V3Ref in the TVS-specific way
-            tvs = self.compute_tvs_matrix(tvs_v2_arcsec, tvs_v3_arcsec, tvs_pa_deg)
+            tvs_transpose = self.compute_tvs_matrix(tvs_v2_arcsec, tvs_v3_arcsec, tvs_pa_deg,
+                                                    transpose=True)
 
             if method == 'spherical':
                 if input_coordinates == 'cartesian':
@@ -1908,7 +2389,7 @@ class HstAperture(Aperture):
                     unit_vector_tel = rotations.unit_vector_sky(v2_arcsec * u.arcsec, v3_arcsec * u.arcsec)
 
                 # apply inverse TVS alignment matrix to unit vector, produces Star Vector in FGS object space
-                unit_vector_idl = np.dot(np.transpose(tvs), unit_vector_tel)
+                unit_vector_idl = np.dot(tvs_transpose, unit_vector_tel)
 
                 x_idl_arcsec, y_idl_arcsec = unit_vector_idl[0]*u.rad.to(u.arcsec), unit_vector_idl[1]*u.rad.to(u.arcsec)
 
@@ -1917,7 +2398,7 @@ class HstAperture(Aperture):
             elif method == 'planar_approximation':
                 # unit vector
                 unit_vector_tel = rotations.unit_vector_from_cartesian(y=v2_arcsec*u.arcsec, z=v3_arcsec*u.arcsec)
-                unit_vector_idl = np.dot(np.transpose(tvs), unit_vector_tel)
+                unit_vector_idl = np.dot(tvs_transpose, unit_vector_tel)
                 x_idl_arcsec, y_idl_arcsec = unit_vector_idl[0]*u.rad.to(u.arcsec), unit_vector_idl[1]*u.rad.to(u.arcsec)
 
                 return x_idl_arcsec, y_idl_arcsec
@@ -2071,6 +2552,7 @@ def linear_transform_model(from_system, to_system, parity, angle_deg):
         Transformation models
 
     """
+    from astropy.modeling import models
     if type(angle_deg) not in [int, float, np.float64, np.int64]:
         raise TypeError('Angle has to be a float. It is of type {} and has the value {}'.format(
             type(angle_deg), angle_deg))
@@ -2140,6 +2622,13 @@ class NirspecAperture(JwstAperture):
         """Return coordinates of aperture vertices."""
         return super(NirspecAperture, self).corners(to_frame, rederive=False)
 
+    def _geometry_dependencies(self):
+        """Return the parent aperture and the GWA to OTE transform apertures, if attached."""
+        return tuple(self.__dict__[key] for key in
+                     ['_parent_aperture'] + ['_{}_GWA_OTE'.format(filter_name)
+                                             for filter_name in NIRSPEC_TA_FILTER_NAMES]
+                     if self.__dict__.get(key) is not None)
+
     def gwa_to_ote(self, gwa_x, gwa_y):
         """NIRSpec transformation from GWA sky side to OTE frame XAN, YAN.
 
@@ -2519,6 +3008,7 @@ def to_distortion_model(coefficients, degree=5):
         Polynomial model transforming one coordinate (x or y) between two systems.
 
     """
+    from astropy.modeling import models
     # map coefficients into the order expected by Polynomial2D
     c = {}
     for cname in coefficients.colnames:
@@ -2618,4 +3108,209 @@ class RomanAperture(Aperture):
 
     def __init__(self):
         super(RomanAperture, self).__init__()
-        self.observatory = 'Roman'
\ No newline at end of file
+        self.observatory = 'Roman'
+
+# layout of the PRD attributes of compact apertures, distortion coefficients are held by the
+# _polynomial_coefficients array of every aperture
+COMPACT_NUMERIC_ATTRIBUTES = tuple(
+    name for name in PRD_REQUIRED_ATTRIBUTES_ORDERED if name not in DISTORTION_ATTRIBUTE_INDEX and
+    ATTRIBUTE_VALIDATORS[name][0] in ['integer', 'float'])
+COMPACT_STRING_ATTRIBUTES = tuple(
+    name for name in PRD_REQUIRED_ATTRIBUTES_ORDERED if ATTRIBUTE_VALIDATORS[name][0] == 'string')
+_COMPACT_NUMERIC_INDEX = {name: i for i, name in enumerate(COMPACT_NUMERIC_ATTRIBUTES)}
+_COMPACT_STRING_INDEX = {name: i for i, name in enumerate(COMPACT_STRING_ATTRIBUTES)}
+
+
+class CompactAperture(object):
+    """Mixin that stores the PRD attributes of an aperture in a compact form.
+
+    Numeric PRD attributes are held in a float64 array with a fixed layout
+    (COMPACT_NUMERIC_ATTRIBUTES), string attributes are interned and held in a list
+    (COMPACT_STRING_ATTRIBUTES), and distortion coefficients are read from the
+    _polynomial_coefficients array. Only non-PRD attributes remain in the instance __dict__. This
+    reduces the memory footprint of apertures considerably, at the cost of slower attribute
+    access.
+
+    Attribute access is the same as for the regular aperture classes. Undefined (None) numeric
+    attributes are stored as NaN. Values that do not have the type expected for the attribute,
+    which can happen for HST apertures, are kept in __dict__.
+
+    """
+
+    __slots__ = ('_numeric_values', '_string_values')
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the compact storage and the parent aperture class."""
+        self._initialize_compact_storage()
+        super(CompactAperture, self).__init__(*args, **kwargs)
+        self._pack_prd_attributes()
+
+    def _initialize_compact_storage(self):
+        """Set all PRD attributes held in the compact storage to None."""
+        object.__setattr__(self, '_numeric_values',
+                           np.full(len(COMPACT_NUMERIC_ATTRIBUTES), np.nan))
+        object.__setattr__(self, '_string_values', [None] * len(COMPACT_STRING_ATTRIBUTES))
+
+    def __getattr__(self, key):
+        """Return PRD attributes from the compact storage."""
+        index = _COMPACT_NUMERIC_INDEX.get(key)
+        if index is not None:
+            value = self._numeric_values[index]
+            if np.isnan(value):
+                return None
+            elif ATTRIBUTE_VALIDATORS[key][0] == 'integer':
+                return int(value)
+            return float(value)
+
+        index = _COMPACT_STRING_INDEX.get(key)
+        if index is not None:
+            return self._string_values[index]
+
+        index = DISTORTION_ATTRIBUTE_INDEX.get(key)
+        if index is not None:
+            value = self._polynomial_coefficients[index]
+            return None if np.isnan(value) else float(value)
+
+        raise AttributeError('{!r} object has no attribute {!r}'.format(
+            type(self).__name__, key))
+
+    def __setattr__(self, key, value):
+        """Set attribute through the parent aperture class and move PRD attributes to storage."""
+        if key in CompactAperture.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            super(CompactAperture, self).__setattr__(key, value)
+            self._pack_prd_attributes()
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Create a compact aperture from a mapping of attribute names to values.
+
+        Parameters
+        ----------
+        mapping : dict
+            Attribute names and values
+
+        Returns
+        -------
+        aperture : instance of cls
+            The new aperture
+
+        """
+        aperture = super(CompactAperture, cls).from_mapping(mapping)
+        aperture._pack_prd_attributes()
+        return aperture
+
+    def set_polynomial_coefficients(self, sci2idlx, sci2idly, idl2scix, idl2sciy):
+        """Set the values of polynomial coefficients.
+
+        Parameters
+        ----------
+        sci2idlx : array
+            Coefficients
+        sci2idly : array
+            Coefficients
+        idl2scix : array
+            Coefficients
+        idl2sciy : array
+            Coefficients
+
+        """
+        super(CompactAperture, self).set_polynomial_coefficients(sci2idlx, sci2idly, idl2scix,
+                                                                 idl2sciy)
+        self._pack_prd_attributes()
+
+    def _pack_prd_attributes(self):
+        """Move PRD attributes from the instance __dict__ to the compact storage."""
+        attributes = self.__dict__
+        prd_keys = [key for key in attributes if key in ATTRIBUTE_VALIDATORS]
+        for key in prd_keys:
+            value = attributes[key]
+            if key in _COMPACT_STRING_INDEX:
+                if (value is not None) and (not isinstance(value, str)):
+                    continue
+                self._string_values[_COMPACT_STRING_INDEX[key]] = \
+                    None if value is None else sys.intern(str(value))
+            elif key in DISTORTION_ATTRIBUTE_INDEX:
+                if (value is not None) and (not isinstance(value, (float, np.floating))):
+                    continue
+                self._polynomial_coefficients[DISTORTION_ATTRIBUTE_INDEX[key]] = \
+                    np.nan if value is None else value
+            else:
+                if ATTRIBUTE_VALIDATORS[key][0] == 'integer':
+                    accepted_types = (int, np.integer)
+                else:
+                    accepted_types = (float, np.floating)
+                if (value is not None) and ((not isinstance(value, accepted_types)) or
+                                            isinstance(value, bool) or np.isnan(value)):
+                    continue
+                self._numeric_values[_COMPACT_NUMERIC_INDEX[key]] = \
+                    np.nan if value is None else value
+            del attributes[key]
+
+        if prd_keys:
+            # dictionaries do not shrink when items are deleted, replace by a right-sized copy
+            object.__setattr__(self, '__dict__', dict(attributes))
+
+
+class CompactJwstAperture(CompactAperture, JwstAperture):
+    """JwstAperture with compact storage of the PRD attributes."""
+
+
+class CompactNirspecAperture(CompactAperture, NirspecAperture):
+    """NirspecAperture with compact storage of the PRD attributes."""
+
+
+class CompactHstAperture(CompactAperture, HstAperture):
+    """HstAperture with compact storage of the PRD attributes."""
+
+
+class CompactRomanAperture(CompactAperture, RomanAperture):
+    """RomanAperture with compact storage of the PRD attributes."""
+
+
+COMPACT_APERTURE_CLASSES = OrderedDict([(NirspecAperture, CompactNirspecAperture),
+                                        (JwstAperture, CompactJwstAperture),
+                                        (HstAperture, CompactHstAperture),
+                                        (RomanAperture, CompactRomanAperture)])
+
+
+def compact_apertures(apertures):
+    """Return compact copies of apertures.
+
+    References between the apertures, e.g. the NIRSpec parent and TRANSFORM apertures, are
+    replaced by references to the corresponding compact copies.
+
+    Parameters
+    ----------
+    apertures : OrderedDict
+        Dictionary of apertures, e.g. Siaf.apertures
+
+    Returns
+    -------
+    compact : OrderedDict
+        Dictionary of compact apertures with the same keys
+
+    """
+    compact = OrderedDict()
+    replacements = {}
+    for aperture_name, aperture in apertures.items():
+        if isinstance(aperture, CompactAperture):
+            compact_aperture = aperture
+        else:
+            compact_class = COMPACT_APERTURE_CLASSES[type(aperture)]
+            compact_aperture = compact_class.__new__(compact_class)
+            compact_aperture._initialize_compact_storage()
+            compact_aperture.__dict__.update(aperture.__dict__)
+            compact_aperture.__dict__['_polynomial_coefficients'] = \
+                aperture._polynomial_coefficients.copy()
+            compact_aperture._pack_prd_attributes()
+        compact[aperture_name] = compact_aperture
+        replacements[id(aperture)] = compact_aperture
+
+    for compact_aperture in compact.values():
+        for key, value in compact_aperture.__dict__.items():
+            if isinstance(value, Aperture) and (id(value) in replacements):
+                compact_aperture.__dict__[key] = replacements[id(value)]
+
+    return compact
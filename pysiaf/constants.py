@@ -26,6 +26,14 @@ TEST_DATA_ROOT = os.path.join(_THIS_DIRECTORY, 'tests', 'test_data')
 # directory for reports
 REPORTS_ROOT = os.path.join(_THIS_DIRECTORY, 'reports')
 
+# directory for cached pixel area maps, see Aperture.pixel_area_map
+PIXEL_AREA_MAP_CACHE_ROOT = os.path.join(
+    os.environ.get('PYSIAF_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pysiaf')),
+    'pixel_area_maps')
+
+# The PRD directories are listed at import. This takes about 0.1 ms of the import time and
+# JWST_PRD_VERSION, which is derived from it, is needed at import by the version check in
+# pysiaf/__init__.py, so deferring the listing would not make the import faster.
 AVAILABLE_PRD_JWST_VERSIONS = [os.path.basename(dir_name) for dir_name in
                                glob.glob(os.path.join(_DATA_ROOT, 'JWST', '*'))]
 AVAILABLE_PRD_JWST_VERSIONS.sort()
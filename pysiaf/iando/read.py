@@ -14,6 +14,7 @@ References
 
 """
 from collections import OrderedDict
+import functools
 import os
 import re
 
@@ -88,10 +89,111 @@ def month_name_to_number(month):
     return months.index(month.lower()) + 1
 
 
+# Fixed-width layout of the HST SIAF (siaf.dat) records, adapted from Lallo's plotap.f
+# Every field is given as (attribute_name, first_column, last_column + 1, conversion)
+# The three consecutive 'CAJ' records of an aperture are distinguished as CAJ1, CAJ2, CAJ3
+HST_SIAF_RECORD_FIELDS = OrderedDict([
+    ('CAJ1', (('ap_name', 0, 10, 'strip'),  # Aperture Identifier.
+              ('v2_cent', 10, 25, 'float'),  # SICS V2 Center. (same as a_v2_ref)
+              ('v3_cent', 25, 40, 'float'),  # SICS V3 Center. (same as a_v3_ref)
+              ('a_shape', 40, 44, 'str'),  # Aperture Shape.
+              ('maj', 44, 59, 'float_or_none'),  # Major Axis Dimension.
+              ('Mac_Flag', 59, 60, 'str'),  # !SI Macro Aperture Flag.
+              ('BR_OBJ_Flag', 60, 61, 'str'),  # !Bright Object Alert Flag.
+              ('brt_obj_thres', 61, 66, 'str'),  # !Bright Object Alert Threshold.
+              ('Macro_ID', 66, 70, 'str'))),  # !SI Macro Aperture Identifier.
+    ('CAJ2', (('min', 0, 15, 'float_or_none'),  # !Minor Axis Dimension.
+              ('plate_scale', 15, 30, 'float'),  # !Arcsecond per Pixel plate scale.
+              ('a_area', 30, 45, 'float'),  # !Area of SI Aperture.
+              ('theta', 45, 60, 'float'),  # !Aperture Rotation Angle.
+              ('SIAS_Flag', 60, 61, 'str'))),  # !SIAS coordinate system flag.
+    ('CAJ3', (('im_par', 0, 2, 'int'),  # Image Parity.
+              ('ideg', 2, 3, 'int'),  # !Polynomial Degree.
+              ('xa0', 3, 18, 'float'),  # !SIAS X Center. -> like JWST SCIENCE frame
+              ('ya0', 18, 33, 'float'),  # !SIAS Y Center.
+              ('xs0', 33, 48, 'float'),  # !SICS X Center. -> like JWST IDEAL frame
+              ('ys0', 48, 63, 'float'))),  # !SICS Y Center.
+    ('AJ', (('SI_mne', 0, 4, 'strip'),  # !Science Instrument Mnemonic
+            ('Tlm_mne', 4, 5, 'str'),  # !SI Telemetry Mnemonic.
+            ('Det_mne', 5, 6, 'str'),  # !SI Detector Mnemonic.
+            ('A_mne', 6, 10, 'str'),  # !SI Aperture Mnemonic.
+            ('APOS_mne', 10, 11, 'str'))),  # !SI Aperture Position Mnemonic.
+    ('CAQ', (('v1x', 0, 15, 'float'),  # !SICS Vertex 1_X -> like JWST IDEAL frame
+             ('v1y', 15, 30, 'float'),  # !SICS Vertex 1_Y
+             ('v2x', 30, 45, 'float'),  # !SICS Vertex 2_X
+             ('v2y', 45, 60, 'float'))),  # !SICS Vertex 2_Y
+    ('AQ', (('v3x', 0, 15, 'float'),  # !SICS Vertex 3_X
+            ('v3y', 15, 30, 'float'),  # !SICS Vertex 3_Y
+            ('v4x', 30, 45, 'float'),  # !SICS Vertex 4_X
+            ('v4y', 45, 60, 'float'))),  # !SICS Vertex 4_Y
+    ('AP', (('pi_angle', 0, 15, 'float'),  # !Inner Radius Orientation Angle.
+            ('pi_ext', 15, 30, 'float'),  # !Angular Extent of the Inner Radius.
+            ('po_angle', 30, 45, 'float'),  # !Outer Radius Orientation Angle.
+            ('po_ext', 45, 60, 'float'))),  # !Angular Extent of the Outer Radius.
+    ('AM', (('a_v2_ref', 0, 15, 'float'),  # !V2 Coordinate of Aperture Reference Point.
+            ('a_v3_ref', 15, 30, 'float'),  # !V3 Coordinate of Aperture Reference Point.
+            ('a_x_incr', 30, 45, 'float'),  # !First Coordinate Axis increment.
+            ('a_y_incr', 45, 60, 'float'))),  # !Second Coordinate Axis increment.
+])
+
+# record types that end in a three-letter code, all others are identified by their last two letters
+_HST_SIAF_THREE_LETTER_RECORDS = ('CAJ', 'CAQ', 'CAK')
+_HST_SIAF_TWO_LETTER_RECORDS = ('AJ', 'AQ', 'AP', 'AM', 'AN', 'AK')
+
+# width of the character grid used to parse fixed-width records, longer than any siaf.dat record
+_HST_SIAF_RECORD_WIDTH = 80
+
+
+def _fixed_width_field(characters, start, end, conversion):
+    """Extract and convert one fixed-width field from all rows of a character grid.
+
+    Parameters
+    ----------
+    characters : numpy array
+        Two-dimensional array of single characters, one row per record
+    start : int
+        Index of first column of the field
+    end : int
+        Index of the column following the field
+    conversion : str
+        One of 'float', 'float_or_none', 'int', 'str', 'strip'
+
+    Returns
+    -------
+    values : list
+        Converted field values, one per record
+
+    """
+    field = np.ascontiguousarray(characters[:, start:end]).view('U{}'.format(end - start)).ravel()
+    if conversion == 'float':
+        return field.astype(float).tolist()
+    elif conversion == 'float_or_none':
+        stripped = np.char.strip(field)
+        empty = stripped == ''
+        values = np.where(empty, 'nan', stripped).astype(float).tolist()
+        return [None if is_empty else value for is_empty, value in zip(empty, values)]
+    elif conversion == 'int':
+        return field.astype(int).tolist()
+    elif conversion == 'strip':
+        return np.char.strip(field).tolist()
+    elif conversion == 'str':
+        return field.tolist()
+    else:
+        raise ValueError('Unknown conversion {}'.format(conversion))
+
+
+def _character_grid(lines):
+    """Return lines as a two-dimensional array of single characters."""
+    return np.array(lines, dtype='U{}'.format(_HST_SIAF_RECORD_WIDTH)).view('U1').reshape(
+        -1, _HST_SIAF_RECORD_WIDTH)
+
+
 def read_hst_siaf(file=None, version=None):
     """Read apertures from HST SIAF file and return a collection.
 
     This was partially ported from Lallo's plotap.f.
+    The file is read in a single pass that classifies every record by its type. The fixed-width
+    fields of all records of one type are then parsed at once (see HST_SIAF_RECORD_FIELDS).
 
     Parameters
     ----------
@@ -112,160 +214,128 @@ def read_hst_siaf(file=None, version=None):
         file = os.path.join(HST_PRD_DATA_ROOT, 'siaf.dat-{}'.format(version))
 
     # read all lines
-    siaf_stream = open(file)
-    data = siaf_stream.readlines()
-    siaf_stream.close()
+    with open(file) as siaf_stream:
+        data = siaf_stream.read().splitlines()
+
+    # classify records by type and assign them to apertures. An aperture starts with the first
+    # of three consecutive 'CAJ' records
+    records = OrderedDict((key, ([], [])) for key in list(HST_SIAF_RECORD_FIELDS) + ['AN', 'AK'])
+    aperture_index = -1
+    caj_index = 0
+    for text in data:
+        record_type = text.rstrip()[-3:]
+        if record_type not in _HST_SIAF_THREE_LETTER_RECORDS:
+            record_type = record_type[-2:]
+            if record_type not in _HST_SIAF_TWO_LETTER_RECORDS:
+                continue  # comment or header
+        if record_type == 'CAJ':
+            if caj_index == 0:
+                aperture_index += 1
+            caj_index = (caj_index + 1) % 3
+            record_type = 'CAJ{}'.format(caj_index if caj_index else 3)
+        elif record_type == 'CAK':
+            # polynomial coefficients are stored in a sequence of 'CAK' records closed by 'AK'
+            record_type = 'AK'
+        if aperture_index < 0:
+            continue
+        records[record_type][0].append(aperture_index)
+        records[record_type][1].append(text)
+
+    # bulk-parse the fields of each record type
+    # record_rows[record_type] maps aperture index to the row in record_columns[record_type]
+    record_rows = {}
+    record_columns = {}
+    for record_type, fields in HST_SIAF_RECORD_FIELDS.items():
+        indices, lines = records[record_type]
+        record_rows[record_type] = dict(zip(indices, range(len(indices))))
+        if len(lines) == 0:
+            continue
+        characters = _character_grid(lines)
+        record_columns[record_type] = [(name, _fixed_width_field(characters, start, end, conversion))
+                                       for name, start, end, conversion in fields]
+
+    # polynomial coefficients, the order of the four columns is
+    # SIAS to SICS X Transformation.
+    # SIAS to SICS Y Transformation.
+    # SICS to SIAS X Transformation.
+    # SICS to SIAS X Transformation.
+    coefficient_indices = np.array(records['AK'][0], dtype=int)
+    if len(coefficient_indices):
+        characters = _character_grid(records['AK'][1])
+        coefficients = np.array([_fixed_width_field(characters, 15 * jj, 15 * (jj + 1), 'float')
+                                 for jj in range(4)]).T
+    coefficient_apertures, coefficient_start = np.unique(coefficient_indices, return_index=True)
+    coefficient_slices = dict(zip(coefficient_apertures.tolist(),
+                                  zip(coefficient_start, np.append(coefficient_start[1:],
+                                                                   len(coefficient_indices)))))
+    closing_records = set(records['AN'][0])
 
     # initialize dict of apertures
     apertures = OrderedDict()
 
-    # inspect SIAF and populate Apertures
-    CAJ_index = 0
-    CAK_index = 0
-
-    for l, text in enumerate(data):
-        skip_aperture = False
-        if (text.rstrip()[-3::] == 'CAJ') & (CAJ_index == 0):
-            a = aperture.HstAperture()
-            # Process the first 'CAJ' record.
-            a.ap_name = text[0:10].strip()  # Aperture Identifier.
-            a.v2_cent = float(text[10:25])  # SICS V2 Center. (same as a_v2_ref)
-            a.v3_cent = float(text[25:40])  # SICS V3 Center. (same as a_v3_ref)
-            a.a_shape = text[40:44]  # Aperture Shape.
-            try:
-                a.maj = float(text[44:59])  # Major Axis Dimension.
-            except ValueError:  # when field is empty
-                a.maj = None
-            a.Mac_Flag = text[59]  # !SI Macro Aperture Flag.
-            a.BR_OBJ_Flag = text[60]  # !Bright Object Alert Flag.
-            a.brt_obj_thres = text[61:66]  # !Bright Object Alert Threshold.
-            a.Macro_ID = text[66:70]  # !SI Macro Aperture Identifier.
-            rec_type = text[70:73]  # !Record type.
-            CAJ_index = 1
-            aperture_name = a.ap_name
-
-        elif (text.rstrip()[-3::] == 'CAJ') & (CAJ_index == 1):
-            # Process the second 'CAJ' record.
-            try:
-                a.min = float(text[0:15])  # !Minor Axis Dimension.
-            except ValueError:  # when field is empty
-                a.min = None
-            a.plate_scale = float(text[15:30])  # !Arcsecond per Pixel plate scale.
-            a.a_area = float(text[30:45])  # !Area of SI Aperture.
-            a.theta = float(text[45:60])  # !Aperture Rotation Angle.
-            a.SIAS_Flag = text[60]  # !SIAS coordinate system flag. (If set then AK rec.)
-            rec_type = text[70:73]  # !Record type.
-            CAJ_index = 2
-
-        elif (text.rstrip()[-3::] == 'CAJ') & (CAJ_index == 2):
-            # Process the third 'CAJ' record.
-            a.im_par = int(text[0:2])  # Image Parity.
-            a.ideg = int(text[2])  # !Polynomial Degree.
-            a.xa0 = float(text[3:18])  # !SIAS X Center. -> like JWST SCIENCE frame
-            a.ya0 = float(text[18:33])  # !SIAS Y Center.
-            a.xs0 = float(text[33:48])  # !SICS X Center. -> like JWST IDEAL frame
-            a.ys0 = float(text[48:63])  # !SICS Y Center.
-            rec_type = text[70:73]  # !Record type.
-            CAJ_index = 0
-
-        elif text.rstrip()[-2::] == 'AJ':
-            a.SI_mne = text[0:4].strip()  # !Science Instrument Mnemonic
-            a.Tlm_mne = text[4]  # !SI Telemetry Mnemonic.
-            a.Det_mne = text[5]  # !SI Detector Mnemonic.
-            a.A_mne = text[6:10]  # !SI Aperture Mnemonic.
-            a.APOS_mne = text[10]  # !SI Aperture Position Mnemonic.
-            rec_type = text[70:73]  # !Record type.
-
-        elif text.rstrip()[-3::] == 'CAQ':
-            a.v1x = float(text[0:15])  # !SICS Vertex 1_X -> like JWST IDEAL frame
-            a.v1y = float(text[15:30])  # !SICS Vertex 1_Y
-            a.v2x = float(text[30:45])  # !SICS Vertex 2_X
-            a.v2y = float(text[45:60])  # !SICS Vertex 2_Y
-            rec_type = text[70:73]  # !Record type.
-
-        elif text.rstrip()[-2::] == 'AQ':
-            a.v3x = float(text[0:15])  # !SICS Vertex 3_X
-            a.v3y = float(text[15:30])  # !SICS Vertex 3_Y
-            a.v4x = float(text[30:45])  # !SICS Vertex 4_X
-            a.v4y = float(text[45:60])  # !SICS Vertex 4_Y
-            rec_type = text[70:73]  # !Record type.
-
-        elif text.rstrip()[-2::] == 'AP':
-            # FGS pickles
-            a.pi_angle = float(text[0:15])  # !Inner Radius Orientation Angle.
-            a.pi_ext = float(text[15:30])  # !Angular Extent of the Inner Radius.
-            a.po_angle = float(text[30:45])  # !Outer Radius Orientation Angle.
-            a.po_ext = float(text[45:60])  # !Angular Extent of the Outer Radius.
-            rec_type = text[70:73]  # !Record type.
-
-        elif text.rstrip()[-2::] == 'AM':
-            a.a_v2_ref = float(text[0:15])  # !V2 Coordinate of Aperture Reference Point.
-            # (same as v2_cent)
-            a.a_v3_ref = float(text[15:30])  # !V3 Coordinate of Aperture Reference Point.
-            # (same as v3_cent)
-            a.a_x_incr = float(text[30:45])  # !First Coordinate Axis increment.
-            a.a_y_incr = float(text[45:60])  # !Second Coordinate Axis increment.
-
-        elif text.rstrip()[-2::] == 'AN':
+    # populate Apertures
+    for index in range(aperture_index + 1):
+        a = aperture.HstAperture()
+        for record_type in HST_SIAF_RECORD_FIELDS:
+            row = record_rows[record_type].get(index)
+            if row is not None:
+                for name, column in record_columns[record_type]:
+                    setattr(a, name, column[row])
+
+        if index in closing_records:
             if (a.a_shape == 'PICK') and ('FGS' in a.ap_name):
-                # HST FGS are special in the sense that the idl_to_tel transformation is implemented
-                # via the TVS matrix and not the standard way
-                # a.set_fgs_tel_reference_point(a.a_v2_ref, a.a_v2_ref)
+                # HST FGS are special in the sense that the idl_to_tel transformation is
+                # implemented via the TVS matrix and not the standard way
                 a.set_idl_reference_point(a.a_v2_ref, a.a_v3_ref, verbose=False)
-                # pass
 
             if (a.a_shape == 'PICK') | (a.a_shape == 'CIRC'):
-                # TO BE IMPLEMENTED
                 # FGS pickle record ends here
-                # apertures.append(a)
-                #                             read(10,1250)Beta1,     !Angle of increasing first
-                # coordinate axis.
-                #      *               Beta2,     !Angle of increasing second coordinate axis.
-                #      *               a_x_ref,   !X reference.
-                #      *               a_y_ref,   !Y reference.
-                #      *               X_TOT_PIX, !Total X-axis pixels.
-                #      *               Y_TOT_PIX, !Total Y-axis pixels.
-                #      *               rec_type   !Record type.
-                #  1250   format(4(G15.8),2(I5),a3)
-                # apertures.append(a)
                 apertures[a.AperName] = a
 
-        elif (text.rstrip()[-3::] == 'CAK') & (CAK_index == 0):
-            # Process the first 'CAK' record.
+        if index in coefficient_slices:
+            start, end = coefficient_slices[index]
             n_polynomial_coefficients = int(((a.ideg + 1) * (a.ideg + 2)) / 2)
-            # the order is
-            # SIAS to SICS X Transformation.
-            # SIAS to SICS Y Transformation.
-            # SICS to SIAS X Transformation.
-            # SICS to SIAS X Transformation.
-
             polynomial_coefficients = np.ones((n_polynomial_coefficients, 4)) * -99
-            for jj in np.arange(4):
-                polynomial_coefficients[CAK_index, jj] = float(text[15 * jj:15 * (jj + 1)])
-            CAK_index += 1
-
-        elif (text.rstrip()[-3::] == 'CAK') & (CAK_index != 0):
-            # Process the remaining 'CAK' records
-            for jj in np.arange(4):
-                polynomial_coefficients[CAK_index, jj] = float(text[15 * jj:15 * (jj + 1)])
-            CAK_index += 1
-
-        elif text.rstrip()[-2::] == 'AK':
-            # Process the last polynomial coefficient record.
-            for jj in np.arange(4):
-                polynomial_coefficients[CAK_index, jj] = float(text[15 * jj:15 * (jj + 1)])
+            polynomial_coefficients[0:end - start, :] = coefficients[start:end]
             a.polynomial_coefficients = polynomial_coefficients
-            CAK_index = 0
 
             apertures[a.AperName] = a
-            # apertures.append(a)
 
     return apertures
 
 
+# tables in amu.rep files. Every entry defines the column names of the table that follows the
+# header line matched by the identically named regular expression in read_hst_fgs_amudotrep
+HST_AMUDOTREP_TABLE_COLUMNS = {
+    'cone_vector': ('CONE', 'X', 'Y', 'Z', 'CONE_ANGLE_DEG'),
+    'cone_vector_tel': ('CONE', 'V1', 'V2', 'V3', 'V1_PREV', 'V2_PREV', 'V3_PREV'),
+    'tvs': ('NEW_1', 'NEW_2', 'NEW_3', 'OLD_1', 'OLD_2', 'OLD_3'),
+}
+
+# keys under which the tables are stored in the dictionary returned by read_hst_fgs_amudotrep
+_HST_AMUDOTREP_TABLE_KEYS = {'cone_vector': 'cone_parameters_fgs',
+                             'cone_vector_tel': 'cone_parameters_tel',
+                             'tvs': 'tvs_parameters'}
+
+
+def _amudotrep_table(rows, names):
+    """Return astropy table from the whitespace-separated rows of an amu.rep table."""
+    columns = []
+    for values in zip(*rows):
+        try:
+            column = np.array(values, dtype=int)
+        except ValueError:
+            column = np.array(values, dtype=float)
+        columns.append(column)
+    return Table(columns, names=names)
+
+
 def read_hst_fgs_amudotrep(file=None, version=None):
     """Read HST FGS amu.rep file which contain the TVS matrices.
 
+    The file is read in a single pass. The cone and TVS tables are captured as they are
+    encountered. See get_hst_fgs_amudotrep for a cached version of this function.
+
     Parameters
     ----------
     filepath : str
@@ -294,59 +364,80 @@ def read_hst_fgs_amudotrep(file=None, version=None):
     }
 
     data = {}
+    # table currently being read: key, number of rows, and rows collected so far
+    table_key = None
     with open(file, 'r') as file_object:
-        line_index = 0
-        astropy_table_index = 0
-        line = file_object.readline()
-        while line:
-            # print(line)
+        for line in file_object:
+            if table_key is not None:
+                if not line.strip():
+                    continue  # blank lines do not count as table rows
+                if skip_lines > 0:
+                    skip_lines -= 1  # line holding column names
+                    continue
+                table_rows.append(line.split())
+                if len(table_rows) == table_length:
+                    table = _amudotrep_table(table_rows, HST_AMUDOTREP_TABLE_COLUMNS[table_key])
+                    data[fgs_id][_HST_AMUDOTREP_TABLE_KEYS[table_key]] = table
+                    if table_key == 'tvs':
+                        data[fgs_id]['tvs'] = np.array(
+                            [table['NEW_{}'.format(j + 1)] for j in range(3)]).T
+                        data[fgs_id]['tvs_old'] = np.array(
+                            [table['OLD_{}'.format(j + 1)] for j in range(3)]).T
+                    table_key = None
+                continue
+
             # at each line check for a match with a regex
             key, match = _parse_line(line, rx_dict)
             if key == 'fgs':
                 fgs_number = int(match.group('fgs'))
-                # print('FGS {}:'.format(fgs_number))
                 fgs_id = 'fgs{}'.format(fgs_number)
                 data[fgs_id] = {}
             elif key == 'n_cones':
                 n_cones = int(match.group('n_cones'))
-            elif key == 'cone_vector':
-                table = Table.read(file, format='ascii.no_header', delimiter=' ',
-                                   data_start=astropy_table_index+2, data_end=astropy_table_index + 2 + n_cones,
-                                   guess=False, names=('CONE', 'X', 'Y', 'Z', 'CONE_ANGLE_DEG'))
-                # table.pprint()
-                data[fgs_id]['cone_parameters_fgs'] = table
-            elif key == 'cone_vector_tel':
-                table = Table.read(file, format='ascii.no_header', delimiter=' ',
-                                   data_start=astropy_table_index+2, data_end=astropy_table_index + 2 + n_cones,
-                                   guess=False, names=('CONE', 'V1', 'V2', 'V3', 'V1_PREV', 'V2_PREV', 'V3_PREV'))
-                data[fgs_id]['cone_parameters_tel'] = table
-            elif key == 'tvs':
-                table = Table.read(file, format='ascii.no_header', delimiter=' ',
-                                   data_start=astropy_table_index+2, data_end=astropy_table_index+2+3,
-                                   guess=False, names=('NEW_1', 'NEW_2', 'NEW_3', 'OLD_1', 'OLD_2', 'OLD_3'))
-                # table.pprint()
-                data[fgs_id]['tvs_parameters'] = table
-                data[fgs_id]['tvs'] = np.zeros((3,3))
-                data[fgs_id]['tvs_old'] = np.zeros((3,3))
-                for i in range(3):
-                    data[fgs_id]['tvs'][i,:] = [data[fgs_id]['tvs_parameters']['NEW_{}'.format(j+1)][i] for j in range(3)]
-                    data[fgs_id]['tvs_old'][i,:] = [data[fgs_id]['tvs_parameters']['OLD_{}'.format(j+1)][i] for j in range(3)]
-
+            elif key in HST_AMUDOTREP_TABLE_COLUMNS:
+                # the table data start after the line holding the column names
+                table_key = key
+                table_length = 3 if key == 'tvs' else n_cones
+                table_rows = []
+                skip_lines = 1
             elif key == 'date':
-                match.group('day')
-                match.group('month')
-                match.group('year')
                 data[fgs_id]['timestamp'] = Time('20{}-{:02d}-{}'.format(match.group('year'), month_name_to_number(match.group('month')), match.group('year')))
 
-            line = file_object.readline()
-            line_index += 1
-            if line.strip():
-                astropy_table_index += 1  # astropy.table.Table.read ignores blank lines
         data['ORIGIN'] = file
         data['VERSION'] = version
     return data
 
 
+@functools.lru_cache()
+def _cached_hst_fgs_amudotrep(file, version):
+    """Return read_hst_fgs_amudotrep result memoized by file and version."""
+    return read_hst_fgs_amudotrep(file=file, version=version)
+
+
+def get_hst_fgs_amudotrep(file=None, version=None):
+    """Return the content of an HST FGS amu.rep file, reading each file at most once per session.
+
+    The returned dictionary is shared between callers and must not be modified. Use
+    read_hst_fgs_amudotrep to obtain an independent copy.
+
+    Parameters
+    ----------
+    file : str
+        Path to file. Defaults to the amu.rep file of the specified version.
+    version : str
+        HST PRD version, defaults to HST_PRD_VERSION
+
+    Returns
+    -------
+    data : dict
+        Dictionary that holds the file content ordered by FGS number
+
+    """
+    if version is None:
+        version = HST_PRD_VERSION
+    return _cached_hst_fgs_amudotrep(file, version)
+
+
 def get_jwst_siaf_instrument(tree):
     """Return the instrument specified in the first aperture of a SIAF xml tree.
 
@@ -362,6 +453,31 @@ def get_jwst_siaf_instrument(tree):
                 return node.text
 
 
+def _iter_siaf_entries(filename):
+    """Yield the SiafEntry elements of a SIAF xml file one at a time.
+
+    The file is parsed incrementally and every entry is cleared and removed from the tree once the
+    caller has processed it, so that the complete tree is never held in memory.
+
+    Parameters
+    ----------
+    filename : str
+        SIAF xml file
+
+    Yields
+    ------
+    entry : lxml.etree._Element
+        SiafEntry element, valid until the next entry is requested
+
+    """
+    for event, entry in ET.iterparse(filename, events=('end',), tag='SiafEntry'):
+        yield entry
+        entry.clear()
+        # also drop the references of the root element to the processed entries
+        while entry.getprevious() is not None:
+            del entry.getparent()[0]
+
+
 def read_jwst_siaf(instrument=None, filename=None, basepath=None):
     """Read the JWST SIAF and return a collection of apertures.
 
@@ -400,19 +516,24 @@ def read_jwst_siaf(instrument=None, filename=None, basepath=None):
 
     file_seed, file_extension = os.path.splitext(filename)
     if file_extension == '.xml':
-        tree = ET.parse(filename)
-        instrument = get_jwst_siaf_instrument(tree)
-
-        # generate Aperture objects from SIAF XML file, parse the XML
-        for entry in tree.getroot().iter('SiafEntry'):
-            if instrument.upper() == 'NIRSPEC':
-                jwst_aperture = aperture.NirspecAperture()
-            else:
-                jwst_aperture = aperture.JwstAperture()
+        aperture_class = None
+
+        # generate Aperture objects from SIAF XML file, parse the XML one entry at a time
+        for entry in _iter_siaf_entries(filename):
+            if aperture_class is None:
+                # the instrument is specified in the first aperture
+                instrument = entry.findtext('InstrName')
+                if instrument.upper() == 'NIRSPEC':
+                    aperture_class = aperture.NirspecAperture
+                else:
+                    aperture_class = aperture.JwstAperture
+
+            values = {}
             for node in entry.iterchildren():
-                if (node.tag in aperture.ATTRIBUTES_THAT_CAN_BE_NONE) and (node.text is None):
+                attribute_format = aperture.ATTRIBUTE_VALIDATORS.get(node.tag, ('float',))[0]
+                if (node.text is None) and (node.tag in aperture._ATTRIBUTES_THAT_CAN_BE_NONE):
                     value = node.text
-                elif node.tag in aperture.INTEGER_ATTRIBUTES:
+                elif attribute_format == 'integer':
                     try:
                         value = int(node.text)
                     except (TypeError, ValueError) as e:
@@ -421,7 +542,7 @@ def read_jwst_siaf(instrument=None, filename=None, basepath=None):
                             value = int(float((node.text)))
                         else:
                             raise TypeError
-                elif node.tag in aperture.STRING_ATTRIBUTES:
+                elif attribute_format == 'string':
                     value = node.text
                 else:
                     try:
@@ -430,8 +551,9 @@ def read_jwst_siaf(instrument=None, filename=None, basepath=None):
                         print('{}: {}'.format(node.tag, node.text))
                         raise TypeError
 
-                setattr(jwst_aperture, node.tag, value)
+                values[node.tag] = value
 
+            jwst_aperture = aperture_class.from_mapping(values)
             apertures[jwst_aperture.AperName] = jwst_aperture
 
     else:
@@ -648,47 +770,51 @@ def read_roman_siaf(siaf_file=None):
                 siaf_file = str(siaf_file)
 
         apertures = OrderedDict()
-        tree = ET.parse(siaf_file)
-        for entry in tree.getroot().iter('SiafEntry'):
-            roman_aperture = aperture.RomanAperture()
+        for entry in _iter_siaf_entries(siaf_file):
+            values = {}
             apertype = None
             for node in entry:
                 if node.tag == 'AperType':
                     apertype = node.text
-                if (node.tag in aperture.ATTRIBUTES_THAT_CAN_BE_NONE) and \
+                attribute_format = aperture.ATTRIBUTE_VALIDATORS.get(node.tag, (None,))[0]
+                if (node.tag in aperture._ATTRIBUTES_THAT_CAN_BE_NONE) and \
                         (node.text is None):
                     value = node.text
-                elif node.tag in aperture.INTEGER_ATTRIBUTES:
+                elif attribute_format == 'integer':
                     try:
                         value = int(node.text)
                     except (TypeError, ValueError) as e:
                         if node.tag == 'DetSciYAngle':
-                            value = np.int(float(node.text))
+                            value = int(float(node.text))
                         elif not node.text:
                             value = None
                         else:
                             raise TypeError
-                elif node.tag in aperture.STRING_ATTRIBUTES:
+                elif attribute_format == 'string':
                     value = node.text
-                elif node.tag in aperture.FLOAT_ATTRIBUTES:
+                elif attribute_format == 'float':
                     value = float(node.text)
                 # If it has children (which we can test by a simple boolean),
                 # then we need to get things out of it. The only time this will
                 # happen is the containers for the prism and grism parameters.
-                # Each child will be a Position container.
+                # Each container holds one spectral element and is appended
+                # to the list of SpecPars of the aperture.
                 elif node.tag:
-                    if apertype == 'FULLSCA':
-                        data = list()
-                        for child in node:
-                            data.append(specpars.SpecPars(child))
+                    if (apertype == 'FULLSCA') and len(node):
+                        data = values.get(node.tag) or list()
+                        data.append(specpars.SpecPars(node))
                         value = data
+                    else:
+                        value = values.get(node.tag)
                 else:
                     try:
                         value = float(node.text)
                     except TypeError:
                         print('{}: {}'.format(node.tag, node.text))
                         raise TypeError
-                setattr(roman_aperture, node.tag, value)
+                values[node.tag] = value
+
+            roman_aperture = aperture.RomanAperture.from_mapping(values)
 
             apertures[roman_aperture.AperName] = roman_aperture
 
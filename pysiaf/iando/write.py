@@ -17,20 +17,14 @@ import numpy as np
 import lxml.etree as ET
 from astropy.time import Time
 from astropy.table import Table, Column
-from openpyxl import Workbook
-from openpyxl.styles import Font, Color
-from openpyxl.styles import Alignment
 
 from ..constants import _JWST_TEMPORARY_ROOT
-from ..aperture import PRD_REQUIRED_ATTRIBUTES_ORDERED, SIAF_XML_FIELD_FORMAT, FLOAT_ATTRIBUTES
+from ..aperture import PRD_REQUIRED_ATTRIBUTES_ORDERED, FLOAT_ATTRIBUTES
+from ..siaf_xml_field_format import SIAF_XML_FIELDS
 from .. import __version__
 
 # dictionary used to set field precision in SIAF.XML
-xml_decimal_precision = {}
-field_names = list(SIAF_XML_FIELD_FORMAT['field_name'])
-for attr in PRD_REQUIRED_ATTRIBUTES_ORDERED:
-    index = field_names.index(attr)
-    xml_decimal_precision[attr] = SIAF_XML_FIELD_FORMAT['pyformat'][index]
+xml_decimal_precision = {field[1]: field[3] for field in SIAF_XML_FIELDS}
 
 
 def write_jwst_siaf(aperture_collection, filename=None, basepath=None, label=None,
@@ -150,6 +144,10 @@ def write_jwst_siaf(aperture_collection, filename=None, basepath=None, label=Non
                 print('Wrote Siaf to xml file {}'.format(out_filename))
 
         elif file_format == 'xlsx':
+            # openpyxl is only needed here, do not import it on startup
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, Alignment
+
             siaf_workbook = Workbook()
 
             ws1 = siaf_workbook.active
@@ -21,12 +21,16 @@ References
 """
 from __future__ import absolute_import, print_function, division
 from collections import OrderedDict
+import concurrent.futures
+import copy
+import os
 import re
+import threading
 
 from astropy.table import Table
 import numpy as np
-import matplotlib.pyplot as pl
 
+from .constants import JWST_PRD_VERSION, _DATA_ROOT
 from .iando import read
 
 # from soc_roman_tools
@@ -85,6 +89,795 @@ class ApertureCollection(object):
         """Return number of apertures in Siaf object."""
         return len(self.apertures)
 
+    def _footprint_index(self, aperture_types):
+        """Return the index of aperture outlines in the tel frame used by locate().
+
+        The index is built on first use and cached per set of aperture types. Its validity is
+        keyed on the identities and geometry versions of the apertures of the collection, the
+        outlines are recomputed when an indexed aperture changes or the selected apertures change.
+
+        Parameters
+        ----------
+        aperture_types : tuple of str or None
+            AperType values of the apertures to include, None for all apertures
+
+        Returns
+        -------
+        index : dict
+            'position' holds the positions of the indexed apertures in self.apertures,
+            'apertures' the aperture objects, 'bounding_boxes' an (n, 4) array of
+            (v2_min, v2_max, v3_min, v3_max), and 'outlines' the closed polygon points.
+
+        """
+        from .utils.polygon import bounding_box
+
+        if '_footprint_indices' not in self.__dict__:
+            self._footprint_indices = {}
+        index = self._footprint_indices.get(aperture_types)
+        collection_state = _geometry_state(self.apertures.values())
+        if (index is not None) and (index['collection_state'] == collection_state):
+            return index
+
+        position = []
+        apertures = []
+        for j, aperture in enumerate(self.apertures.values()):
+            if (aperture_types is not None) and (aperture.AperType not in aperture_types):
+                continue
+            if not _has_tel_outline(aperture):
+                continue
+            position.append(j)
+            apertures.append(aperture)
+
+        state = _geometry_state(apertures)
+        if (index is None) or (index['state'] != state) or \
+                (index['position'].tolist() != position):
+            outlines = [_tel_outline(aperture) for aperture in apertures]
+            index = {'position': np.array(position, dtype=int),
+                     'apertures': apertures,
+                     'outlines': outlines,
+                     'bounding_boxes': np.array([bounding_box(*outline) for outline in outlines],
+                                                dtype=float).reshape(-1, 4),
+                     'state': state}
+        index['collection_state'] = collection_state
+        self._footprint_indices[aperture_types] = index
+        return index
+
+    def corners(self, frame, rederive=False):
+        """Return the vertices of all apertures in one array.
+
+        The vertices of JWST and Roman apertures that use the standard sci, idl, tel, and det
+        transformations and of HST quadrilaterals in the idl and tel frames are evaluated
+        together from the attribute arrays of all apertures. The remaining apertures, e.g.
+        NIRSpec apertures in the sci and det frames and HST apertures in the sci and det frames,
+        are handled by Aperture.corners.
+
+        Parameters
+        ----------
+        frame : str
+            Frame of returned coordinates, one of 'sci', 'idl', 'tel', 'det'
+        rederive : bool
+            See Aperture.corners. By default the IdlVert attributes are used, like for the
+            outlines drawn by Siaf.plot.
+
+        Returns
+        -------
+        corners : numpy array
+            Array of shape (N, 4, 2) holding the x and y coordinates of the four vertices of the
+            N apertures in the order of self.apertures. Apertures without outline in frame, e.g.
+            TRANSFORM apertures, are nan.
+
+        """
+        return _aperture_corners(list(self.apertures.values()), frame, rederive)
+
+    def linear_parameters(self, coefficient_seed='Sci2Idl'):
+        """Return scale, rotation, and skew at the reference point of every aperture.
+
+        At the reference point the partial derivatives are the linear polynomial coefficients,
+        the parameters of all apertures are therefore computed in one vectorized evaluation.
+        Apertures without distortion coefficients are omitted, undefined coefficients yield
+        NaN parameters.
+
+        Parameters
+        ----------
+        coefficient_seed : str
+            'Sci2Idl' or 'Idl2Sci'
+
+        Returns
+        -------
+        table : astropy.table.Table
+            AperName and the parameters returned by
+            polynomial.rotation_scale_skew_from_derivatives, one row per aperture
+
+        """
+        # runtime import to avoid circular import on startup
+        from .aperture import POLYNOMIAL_COEFFICIENT_NAMES
+        from .utils import polynomial
+
+        rows = [POLYNOMIAL_COEFFICIENT_NAMES.index('{}{}'.format(coefficient_seed, axis))
+                for axis in 'XY']
+        apertures = [aperture for aperture in self.apertures.values()
+                     if getattr(aperture, 'Sci2IdlDeg', None) is not None]
+        # linear coefficients (x10, x11) of both polynomials of every aperture
+        linear = np.array([aperture.__dict__['_polynomial_coefficients'][rows, 1:3]
+                           for aperture in apertures]).reshape(-1, 2, 2)
+
+        parameters = polynomial.rotation_scale_skew_from_derivatives(
+            linear[:, 0, 0], linear[:, 0, 1], linear[:, 1, 0], linear[:, 1, 1])
+        table = Table()
+        table['AperName'] = [aperture.AperName for aperture in apertures]
+        for key, value in parameters.items():
+            table[key] = value
+        return table
+
+    def spatial_index(self):
+        """Return the spatial index of the aperture outlines in this collection.
+
+        The index is created on first use and cached, see ApertureIndex.
+
+        Returns
+        -------
+        index : `ApertureIndex` object
+            Spatial index over the outlines in the tel frame
+
+        """
+        if '_spatial_index' not in self.__dict__:
+            self._spatial_index = ApertureIndex(self)
+        return self._spatial_index
+
+    def locate(self, v2, v3, frame='tel', aperture_types=('FULLSCA',), attitude=None):
+        """Return which aperture contains each of many positions.
+
+        The outlines of the selected apertures are indexed on first use. Points are first
+        tested against the bounding boxes and then against the outlines. If several apertures
+        contain a point, the first one in the collection is returned.
+
+        Parameters
+        ----------
+        v2 : float or numpy array
+            V2 coordinates in arcsec, or RA in degrees if frame is 'sky'
+        v3 : float or numpy array
+            V3 coordinates in arcsec, or Dec in degrees if frame is 'sky'
+        frame : str
+            Frame of the input coordinates: 'tel' or 'sky'
+        aperture_types : str, tuple of str, or None
+            AperType values of the apertures to consider. None selects all apertures that have
+            an outline in the tel frame.
+        attitude : 3 by 3 float array
+            The telescope attitude matrix used to convert sky coordinates to the tel frame, see
+            rotations.attitude. Required if frame is 'sky'. The attitude matrices of the apertures
+            are not used.
+
+        Returns
+        -------
+        aperture_index, x_sci, y_sci : tuple of numpy arrays
+            position of the containing aperture in self.apertures (-1 where no aperture
+            contains the point) and the science pixel coordinates in that aperture (nan where
+            no aperture contains the point)
+
+        """
+        if isinstance(aperture_types, str):
+            aperture_types = (aperture_types,)
+        elif aperture_types is not None:
+            aperture_types = tuple(aperture_types)
+        index = self._footprint_index(aperture_types)
+
+        if frame not in ['tel', 'sky']:
+            raise ValueError('Frame {} is not supported, use tel or sky.'.format(frame))
+
+        v2, v3 = np.broadcast_arrays(np.asarray(v2, dtype=float), np.asarray(v3, dtype=float))
+        if frame == 'sky':
+            from .utils import rotations  # runtime import to avoid circular import on startup
+
+            if attitude is None:
+                raise ValueError('An attitude matrix is required to locate sky coordinates.')
+            if np.shape(attitude) != (3, 3):
+                raise ValueError('Attitude has to be 3x3 array.')
+            shape = v2.shape
+            v2, v3 = rotations.v2v3(np.dot(np.transpose(attitude),
+                                           rotations.unit(v2.ravel(), v3.ravel())))
+            v2 = v2.reshape(shape)
+            v3 = v3.reshape(shape)
+        membership = _footprint_membership(index, v2, v3)
+        x_sci, y_sci = _footprint_tel_to_sci(index, membership, v2, v3)
+        aperture_index = np.where(membership >= 0, index['position'][membership], -1)
+        return aperture_index, x_sci, y_sci
+
+    def project_catalog(self, ra, dec, attitude, aperture_types=('FULLSCA',), chunk_size=1000000):
+        """Project a source catalog into the science frames of the apertures in this collection.
+
+        Sources are culled with a cone around the footprint of the selected apertures before
+        they are transformed to the tel frame with the attitude matrix, located in the aperture
+        outlines (see locate()) and transformed to science pixel coordinates. The catalog is
+        processed in chunks to limit the memory usage. The apertures are not modified, i.e. their
+        attitude matrices are not used.
+
+        Parameters
+        ----------
+        ra : numpy array
+            Right Ascension of the sources in degrees
+        dec : numpy array
+            Declination of the sources in degrees
+        attitude : 3 by 3 float array
+            The telescope attitude matrix, see rotations.attitude
+        aperture_types : str, tuple of str, or None
+            AperType values of the apertures to project into, see locate()
+        chunk_size : int
+            Number of sources processed at once
+
+        Returns
+        -------
+        table : astropy.table.Table
+            One row per source and aperture that contains it, with columns source_index (index
+            into ra and dec), aperture (name), x_sci, and y_sci. Sources in overlapping
+            apertures, e.g. the NIRCam short and long wavelength detectors, have several rows.
+            Rows are ordered by source_index.
+
+        """
+        from .utils import rotations  # runtime import to avoid circular import on startup
+
+        if isinstance(aperture_types, str):
+            aperture_types = (aperture_types,)
+        elif aperture_types is not None:
+            aperture_types = tuple(aperture_types)
+        index = self._footprint_index(aperture_types)
+        if np.shape(attitude) != (3, 3):
+            raise ValueError('Attitude has to be 3x3 array.')
+        inverse_attitude = np.transpose(attitude)
+
+        ra = np.ravel(np.asarray(ra, dtype=float))
+        dec = np.ravel(np.asarray(dec, dtype=float))
+        if ra.shape != dec.shape:
+            raise ValueError('ra and dec have to have the same length.')
+
+        source_index = []
+        membership = []
+        v2 = []
+        v3 = []
+        if len(index['outlines']) > 0:
+            # cone that contains all selected apertures with a margin of 1 arcsec
+            vertices = np.hstack([np.array(outline) for outline in index['outlines']])
+            center = 0.5 * (vertices.min(axis=1) + vertices.max(axis=1))
+            center_unit_vector = rotations.unit(*(center / 3600.))
+            radius = np.arccos(np.clip(np.min(np.dot(center_unit_vector,
+                                                     rotations.unit(*(vertices / 3600.)))), -1., 1.))
+            cos_radius = np.cos(radius + np.deg2rad(1. / 3600.))
+            center_unit_vector_sky = np.dot(attitude, center_unit_vector)
+            center_dec = rotations.radec(center_unit_vector_sky)[1]
+            radius_deg = np.rad2deg(np.arccos(cos_radius))
+
+            for start in range(0, len(ra), chunk_size):
+                # declination band first, it is cheaper than the cone
+                candidates = start + np.flatnonzero(
+                    np.abs(dec[start:start + chunk_size] - center_dec) <= radius_deg)
+                unit_vector_sky = rotations.unit(ra[candidates], dec[candidates])
+                in_cone = np.dot(center_unit_vector_sky, unit_vector_sky) >= cos_radius
+                candidates = candidates[in_cone]
+                if len(candidates) == 0:
+                    continue
+                chunk_v2, chunk_v3 = rotations.v2v3(np.dot(inverse_attitude,
+                                                           unit_vector_sky[:, in_cone]))
+                # one entry per source and containing aperture
+                points, chunk_membership = _footprint_pairs(index, chunk_v2, chunk_v3)
+                source_index.append(candidates[points])
+                membership.append(chunk_membership)
+                v2.append(chunk_v2[points])
+                v3.append(chunk_v3[points])
+
+        def stack(arrays, dtype):
+            return np.concatenate(arrays) if len(arrays) > 0 else np.array([], dtype=dtype)
+
+        membership = stack(membership, int)
+        v2 = stack(v2, float)
+        v3 = stack(v3, float)
+        # the science coordinates are computed once per aperture for all chunks
+        x_sci, y_sci = _footprint_tel_to_sci(index, membership, v2, v3)
+
+        aperture_names = np.array(list(self.apertures.keys()))
+        table = Table()
+        table['source_index'] = stack(source_index, int)
+        table['aperture'] = aperture_names[index['position'][membership]]
+        table['x_sci'] = x_sci
+        table['y_sci'] = y_sci
+        return table
+
+
+# keyword arguments of Siaf.plot supported by the collection plot, with their LineCollection names
+_COLLECTION_PLOT_KEYWORDS = {'color': 'colors', 'c': 'colors', 'linewidth': 'linewidths',
+                             'lw': 'linewidths', 'linestyle': 'linestyles', 'ls': 'linestyles',
+                             'alpha': 'alpha', 'zorder': 'zorder', 'transform': 'transform',
+                             'fill': None, 'fill_color': None, 'fill_alpha': None}
+
+
+def _aperture_corners(apertures, frame, rederive):
+    """Return the vertices of a list of apertures, see ApertureCollection.corners."""
+    # runtime import to avoid circular import on startup
+    from .aperture import Aperture, HstAperture, NirspecAperture
+
+    if frame not in ['sci', 'idl', 'tel', 'det']:
+        raise ValueError('Frame {} is not supported.'.format(frame))
+
+    corners = np.full((len(apertures), 4, 2), np.nan)
+
+    # positions of the apertures evaluated together, by frame of their defining vertices
+    from_sci = []
+    from_idl = []
+    from_hst_idl = []
+    for k, aperture in enumerate(apertures):
+        if not _has_tel_outline(aperture):
+            continue
+        if isinstance(aperture, NirspecAperture) and (aperture.AperType == 'SLIT') and \
+                (frame in ['sci', 'det']):
+            # slits have no sci and det frame of their own, their vertices are transformed with
+            # the parent aperture, which is possible if the parent is not a slit itself
+            parent_aperture = aperture.__dict__.get('_parent_aperture')
+            if (parent_aperture is not None) and (parent_aperture.AperType != 'SLIT'):
+                corners[k, :, 0], corners[k, :, 1] = aperture.corners(frame, rederive=rederive)
+            continue
+        if (frame == 'det') and (aperture.DetSciYAngle is None):
+            continue
+        hst_aperture = getattr(aperture, 'a_shape', None) is not None
+        if (not hst_aperture) and (aperture.XSciSize is None) and (frame == 'sci'):
+            continue
+        if hst_aperture:
+            # quadrilaterals defined in the idl frame, the tel frame of FGS uses the TVS matrix
+            if (aperture.a_shape == 'QUAD') and (frame in ['idl', 'tel']) and \
+                    (not aperture._correct_dva) and \
+                    (type(aperture)._corners is HstAperture._corners) and \
+                    (type(aperture).idl_to_tel is HstAperture.idl_to_tel):
+                from_hst_idl.append(k)
+            else:
+                corners[k, :, 0], corners[k, :, 1] = aperture.corners(frame, rederive=rederive)
+            continue
+
+        aperture_rederive = rederive and (aperture.XSciSize is not None)
+        standard = (not aperture._correct_dva) and \
+            (type(aperture).corners is Aperture.corners) and \
+            (type(aperture).sci_to_idl is Aperture.sci_to_idl) and \
+            (type(aperture).idl_to_sci is Aperture.idl_to_sci) and \
+            (type(aperture).idl_to_tel is Aperture.idl_to_tel) and \
+            (type(aperture).sci_to_det is Aperture.sci_to_det)
+        if (frame == 'det') and ((aperture.DetSciParity is None) or (aperture.XDetRef is None) or
+                                 (aperture.YDetRef is None)):
+            standard = False
+        has_polynomial = aperture.Sci2IdlDeg is not None
+        if standard and aperture_rederive and (has_polynomial or (frame in ['sci', 'det'])):
+            from_sci.append(k)
+        elif standard and (not aperture_rederive) and (aperture.XIdlVert1 is not None) and \
+                (has_polynomial or (frame in ['idl', 'tel'])):
+            from_idl.append(k)
+        else:
+            corners[k, :, 0], corners[k, :, 1] = aperture.corners(frame,
+                                                                  rederive=aperture_rederive)
+
+    for vectorized in [from_sci, from_idl, from_hst_idl]:
+        if len(vectorized) == 0:
+            continue
+        selected = [apertures[k] for k in vectorized]
+
+        def values(attribute):
+            return np.array([getattr(aperture, attribute) for aperture in selected],
+                            dtype=float)[:, np.newaxis]
+
+        if vectorized is from_sci:
+            # see Aperture.corners
+            x_sci_ref = values('XSciRef')
+            y_sci_ref = values('YSciRef')
+            x1 = -1 * x_sci_ref + 0.5
+            x2 = -1 * x_sci_ref + 0.5 + values('XSciSize')
+            y1 = -1 * y_sci_ref + 0.5
+            y3 = -1 * y_sci_ref + 0.5 + values('YSciSize')
+            x = np.hstack((x1, x2, x2, x1)) + x_sci_ref
+            y = np.hstack((y1, y1, y3, y3)) + y_sci_ref
+            if frame in ['idl', 'tel']:
+                x, y = _polynomial_transform(selected, 'Sci2Idl', x - x_sci_ref, y - y_sci_ref)
+        elif vectorized is from_idl:
+            x = np.hstack([values('XIdlVert{:d}'.format(j)) for j in [1, 2, 3, 4]])
+            y = np.hstack([values('YIdlVert{:d}'.format(j)) for j in [1, 2, 3, 4]])
+            if frame in ['sci', 'det']:
+                x, y = _polynomial_transform(selected, 'Idl2Sci', x, y)
+                x = x + values('XSciRef')
+                y = y + values('YSciRef')
+        else:
+            x = np.hstack([values('v{:d}x'.format(j)) for j in [1, 2, 3, 4]])
+            y = np.hstack([values('v{:d}y'.format(j)) for j in [1, 2, 3, 4]])
+
+        if frame == 'det':
+            # see Aperture.sci_to_det and aperture.linear_transform_model
+            parity = values('DetSciParity')
+            angle = np.deg2rad(values('DetSciYAngle'))
+            x = x - values('XSciRef')
+            y = y - values('YSciRef')
+            x, y = (values('XDetRef') + parity * (np.cos(angle) * x + np.sin(angle) * y),
+                    values('YDetRef') - np.sin(angle) * x + np.cos(angle) * y)
+        elif (frame == 'tel') and (vectorized is from_hst_idl):
+            x, y = _hst_idl_to_tel(selected, x, y)
+        elif frame == 'tel':
+            # planar approximation, see aperture._telescope_transform_model
+            parity = values('VIdlParity')
+            angle = np.deg2rad(values('V3IdlYAngle'))
+            x, y = (values('V2Ref') + parity * np.cos(angle) * x + np.sin(angle) * y,
+                    values('V3Ref') - parity * np.sin(angle) * x + np.cos(angle) * y)
+
+        corners[vectorized, :, 0] = x
+        corners[vectorized, :, 1] = y
+
+    return corners
+
+
+def _polynomial_transform(apertures, label, x, y):
+    """Evaluate the Sci2Idl or Idl2Sci polynomials of many apertures, see _aperture_corners.
+
+    Parameters
+    ----------
+    apertures : list of Aperture
+        Apertures with distortion polynomials
+    label : str
+        'Sci2Idl' or 'Idl2Sci'
+    x, y : numpy arrays
+        Input coordinates of shape (len(apertures), number of points), relative to the
+        reference point for Sci2Idl
+
+    Returns
+    -------
+    x, y : tuple of numpy arrays
+        Output coordinates without the reference point offset
+
+    """
+    from .utils import polynomial  # runtime import to avoid circular import on startup
+
+    rows = slice(0, 2) if label == 'Sci2Idl' else slice(2, 4)
+    # coefficients of all apertures, zero beyond their degree
+    coefficients = np.array([aperture.__dict__['_polynomial_coefficients'][rows]
+                             for aperture in apertures])
+    number_of_coefficients = np.array([polynomial.number_of_coefficients(aperture.Sci2IdlDeg)
+                                       for aperture in apertures])
+    valid = np.arange(coefficients.shape[2]) < number_of_coefficients[:, np.newaxis]
+    coefficients = np.where(valid[:, np.newaxis, :], coefficients, 0.)
+    # the coefficient arrays hold the coefficients up to degree 5
+    return (polynomial.poly(coefficients[:, 0, :].T[:, :, np.newaxis], x, y, order=5),
+            polynomial.poly(coefficients[:, 1, :].T[:, :, np.newaxis], x, y, order=5))
+
+
+def _hst_idl_to_tel(apertures, x_idl, y_idl):
+    """Transform idl to tel coordinates of many HST apertures, see HstAperture.idl_to_tel.
+
+    FGS apertures use the planar approximation with their TVS matrix, the other apertures use
+    the planar approximation with their reference point and angle.
+
+    """
+    v2 = np.empty(x_idl.shape)
+    v3 = np.empty(y_idl.shape)
+    fgs = np.array([('FGS' in aperture.AperName) and (aperture.AperType not in ['PSEUDO'])
+                    for aperture in apertures])
+    if np.any(fgs):
+        tvs = np.array([aperture.compute_tvs_matrix()
+                        for aperture, tvs_aperture in zip(apertures, fgs) if tvs_aperture])
+        x_rad = np.deg2rad(x_idl[fgs] / 3600.)
+        y_rad = np.deg2rad(y_idl[fgs] / 3600.)
+        xyz = np.stack((x_rad, y_rad, np.sqrt(1. - (x_rad ** 2 + y_rad ** 2))), axis=1)
+        v = np.rad2deg(np.einsum('nij,njk->nik', tvs, xyz)) * 3600.
+        v2[fgs] = v[:, 1]
+        v3[fgs] = v[:, 2]
+    if not np.all(fgs):
+        selected = [aperture for aperture, tvs_aperture in zip(apertures, fgs) if not tvs_aperture]
+
+        def values(attribute):
+            return np.array([getattr(aperture, attribute) for aperture in selected],
+                            dtype=float)[:, np.newaxis]
+
+        parity = values('VIdlParity')
+        angle = np.deg2rad(values('V3IdlYAngle'))
+        x = x_idl[~fgs]
+        y = y_idl[~fgs]
+        v2[~fgs] = values('V2Ref') + parity * np.cos(angle) * x + np.sin(angle) * y
+        v3[~fgs] = values('V3Ref') - parity * np.sin(angle) * x + np.cos(angle) * y
+    return v2, v3
+
+
+def _plot_frame_origins(apertures, frame, which, units, ax):
+    """Mark the frame origins of many apertures with one line artist per origin frame."""
+    # runtime import to avoid circular import on startup
+    from .aperture import FRAME_ORIGIN_MARKERS, _units_scale
+
+    scale = _units_scale(units)
+    origins = OrderedDict((origin, []) for origin in FRAME_ORIGIN_MARKERS)
+    for ap in apertures:
+        for origin, point in ap._frame_origins(frame, which).items():
+            origins[origin].append(point)
+    for origin, points in origins.items():
+        if len(points) == 0:
+            continue
+        color, markersize = FRAME_ORIGIN_MARKERS[origin]
+        points = np.array(points, dtype=float) * scale
+        ax.plot(points[:, 0], points[:, 1], color=color, marker='s', markersize=markersize,
+                linestyle='none')
+
+
+def _footprint_membership(index, v2, v3):
+    """Return for each point the position in the footprint index of the containing aperture.
+
+    Points that no aperture contains get -1. If several apertures contain a point, the first one
+    is returned.
+
+    """
+    from .utils.polygon import points_in_polygon  # runtime import to avoid circular import on startup
+
+    membership = np.full(v2.shape, -1, dtype=int)
+    for k, (outline, (v2_min, v2_max, v3_min, v3_max)) in enumerate(
+            zip(index['outlines'], index['bounding_boxes'])):
+        candidates = np.flatnonzero((membership == -1) & (v2 >= v2_min) & (v2 <= v2_max) &
+                                    (v3 >= v3_min) & (v3 <= v3_max))
+        if len(candidates) == 0:
+            continue
+        candidates = candidates[points_in_polygon(v2.flat[candidates], v3.flat[candidates],
+                                                  *outline)]
+        membership.flat[candidates] = k
+    return membership
+
+
+def _footprint_pairs(index, v2, v3):
+    """Return all pairs of points and apertures of the footprint index that contain them.
+
+    Parameters
+    ----------
+    index : dict
+        Footprint index, see ApertureCollection._footprint_index
+    v2, v3 : numpy arrays
+        One-dimensional point coordinates in the tel frame
+
+    Returns
+    -------
+    points, membership : tuple of numpy arrays
+        Point indices and positions of the containing apertures in the footprint index, ordered
+        by point and then by aperture
+
+    """
+    from .utils.polygon import points_in_polygon  # runtime import to avoid circular import on startup
+
+    points = []
+    membership = []
+    for k, (outline, (v2_min, v2_max, v3_min, v3_max)) in enumerate(
+            zip(index['outlines'], index['bounding_boxes'])):
+        candidates = np.flatnonzero((v2 >= v2_min) & (v2 <= v2_max) &
+                                    (v3 >= v3_min) & (v3 <= v3_max))
+        if len(candidates) == 0:
+            continue
+        candidates = candidates[points_in_polygon(v2[candidates], v3[candidates], *outline)]
+        points.append(candidates)
+        membership.append(np.full(len(candidates), k, dtype=int))
+    if len(points) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    points = np.concatenate(points)
+    membership = np.concatenate(membership)
+    order = np.lexsort((membership, points))
+    return points[order], membership[order]
+
+
+def _footprint_tel_to_sci(index, membership, v2, v3):
+    """Transform points to the science frame of their aperture, with one call per aperture."""
+    x_sci = np.full(v2.shape, np.nan)
+    y_sci = np.full(v2.shape, np.nan)
+    order = np.argsort(membership, axis=None, kind='stable')
+    boundaries = np.searchsorted(membership.flat[order], np.arange(len(index['apertures']) + 1))
+    for k, aperture in enumerate(index['apertures']):
+        selection = order[boundaries[k]:boundaries[k + 1]]
+        if len(selection) > 0:
+            x_sci.flat[selection], y_sci.flat[selection] = aperture.tel_to_sci(
+                v2.flat[selection], v3.flat[selection])
+    return x_sci, y_sci
+
+
+def _geometry_state(apertures):
+    """Return identities and geometry keys of apertures, see Aperture._geometry_key."""
+    return [(id(aperture), aperture._geometry_key()) for aperture in apertures]
+
+
+def _has_tel_outline(aperture):
+    """Return whether the outline of an aperture can be computed in the tel frame."""
+    if aperture.AperType == 'TRANSFORM':
+        return False
+    hst_shape = getattr(aperture, 'a_shape', None)
+    if hst_shape is not None:
+        return hst_shape in ['QUAD', 'PICK']
+    # apertures without science frame, e.g. slits, are outlined by their ideal vertices
+    return (aperture.XSciSize is not None) or (aperture.XIdlVert1 is not None)
+
+
+def _tel_outline(aperture):
+    """Return the closed outline of an aperture in the tel frame, see _has_tel_outline."""
+    if (getattr(aperture, 'a_shape', None) is None) and (aperture.XSciSize is None):
+        return aperture.closed_polygon_points('tel', rederive=False)
+    return aperture.closed_polygon_points('tel')
+
+
+class ApertureIndex(object):
+    """Spatial index of aperture outlines in the telescope (V2/V3) frame.
+
+    The bounding boxes of the aperture outlines are registered in a uniform grid of cells. Queries
+    look up the cells covered by a point, box or polygon and return the names of the apertures
+    whose bounding boxes overlap it. With exact=True, the candidates are filtered further with the
+    aperture outlines.
+
+    The index is rebuilt before the next query when an aperture of the indexed collections is
+    added, removed, replaced, or has an attribute changed, as recorded by the geometry versions
+    of the apertures. Changes to other apertures do not affect the index. Apertures without outline,
+    e.g. TRANSFORM apertures, are not indexed.
+
+    Examples
+    --------
+    index = ApertureIndex([get_cached_siaf(instrument) for instrument in ['NIRCam', 'MIRI']])
+    index.query_point(100., -500.)           # returns candidate aperture names
+    index.query_box(0., 200., -600., -400.)
+
+    """
+
+    def __init__(self, collections, cells_per_side=None):
+        """Build the index.
+
+        Parameters
+        ----------
+        collections : ApertureCollection or list of ApertureCollection
+            Collections whose apertures are indexed, e.g. the Siaf of several instruments
+        cells_per_side : int
+            Number of grid cells along each axis, by default the square root of the number of
+            indexed apertures
+
+        """
+        if isinstance(collections, ApertureCollection):
+            collections = [collections]
+        self._collections = list(collections)
+        self._cells_per_side = cells_per_side
+        self._build()
+
+    def __len__(self):
+        """Return number of indexed apertures."""
+        self._update()
+        return len(self.names)
+
+    def _apertures(self):
+        return [aperture for collection in self._collections
+                for aperture in collection.apertures.values()]
+
+    def _build(self):
+        """Compute the outlines and fill the grid cells."""
+        from .utils.polygon import bounding_box
+
+        names = []
+        outlines = []
+        for collection in self._collections:
+            for name, aperture in collection.apertures.items():
+                if _has_tel_outline(aperture):
+                    names.append(name)
+                    outlines.append(_tel_outline(aperture))
+        self.names = names
+        self.outlines = outlines
+        self.bounding_boxes = np.array([bounding_box(*outline) for outline in outlines],
+                                       dtype=float).reshape(-1, 4)
+
+        if self._cells_per_side is not None:
+            cells_per_side = self._cells_per_side
+        else:
+            cells_per_side = max(1, int(np.sqrt(len(names))))
+        if len(names) > 0:
+            self._origin = self.bounding_boxes[:, [0, 2]].min(axis=0)
+            extent = self.bounding_boxes[:, [1, 3]].max(axis=0) - self._origin
+        else:
+            self._origin = np.zeros(2)
+            extent = np.ones(2)
+        self._cell_size = np.where(extent > 0, extent / cells_per_side, 1.)
+        self._cells_per_side = cells_per_side
+
+        cells = {}
+        for k, (v2_min, v2_max, v3_min, v3_max) in enumerate(self.bounding_boxes):
+            ix0, ix1, iy0, iy1 = self._cell_range(v2_min, v2_max, v3_min, v3_max)
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    cells.setdefault((ix, iy), []).append(k)
+        self._cells = {key: np.array(value, dtype=int) for key, value in cells.items()}
+
+        self._state = _geometry_state(self._apertures())
+
+    def _cell_range(self, v2_min, v2_max, v3_min, v3_max):
+        """Return the range of grid cells covered by a box, clipped to the grid."""
+        limits = np.array([[v2_min, v3_min], [v2_max, v3_max]])
+        cell = np.floor((limits - self._origin) / self._cell_size).astype(int)
+        cell = np.clip(cell, 0, self._cells_per_side - 1)
+        return cell[0, 0], cell[1, 0], cell[0, 1], cell[1, 1]
+
+    def _update(self):
+        """Rebuild the index if apertures were added, removed, replaced, or modified."""
+        if self._state != _geometry_state(self._apertures()):
+            self._build()
+
+    def _candidates(self, v2_min, v2_max, v3_min, v3_max):
+        """Return indices of apertures whose bounding boxes overlap a box."""
+        self._update()
+        ix0, ix1, iy0, iy1 = self._cell_range(v2_min, v2_max, v3_min, v3_max)
+        found = [self._cells[key] for key in
+                 ((ix, iy) for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1))
+                 if key in self._cells]
+        if len(found) == 0:
+            return np.array([], dtype=int)
+        candidates = np.unique(np.concatenate(found)) if len(found) > 1 else found[0]
+        boxes = self.bounding_boxes[candidates]
+        overlap = (boxes[:, 0] <= v2_max) & (boxes[:, 1] >= v2_min) & \
+                  (boxes[:, 2] <= v3_max) & (boxes[:, 3] >= v3_min)
+        return candidates[overlap]
+
+    def query_point(self, v2, v3, exact=False):
+        """Return the names of apertures that contain a point.
+
+        Parameters
+        ----------
+        v2, v3 : float
+            Position in the tel frame in arcsec
+        exact : bool
+            If True, test the point against the aperture outlines, otherwise return all
+            apertures whose bounding box contains the point
+
+        Returns
+        -------
+        names : list of str
+            Aperture names
+
+        """
+        from .utils.polygon import points_in_polygon
+
+        candidates = self._candidates(v2, v2, v3, v3)
+        if exact:
+            candidates = [k for k in candidates
+                          if points_in_polygon(np.array([v2]), np.array([v3]),
+                                               *self.outlines[k])[0]]
+        return [self.names[k] for k in candidates]
+
+    def query_box(self, v2_min, v2_max, v3_min, v3_max, exact=False):
+        """Return the names of apertures that overlap a box.
+
+        Parameters
+        ----------
+        v2_min, v2_max, v3_min, v3_max : float
+            Limits of the box in the tel frame in arcsec
+        exact : bool
+            If True, test the box against the aperture outlines, otherwise return all
+            apertures whose bounding box overlaps the box
+
+        Returns
+        -------
+        names : list of str
+            Aperture names
+
+        """
+        if exact:
+            return self.query_polygon(np.array([v2_min, v2_max, v2_max, v2_min]),
+                                      np.array([v3_min, v3_min, v3_max, v3_max]), exact=True)
+        return [self.names[k] for k in self._candidates(v2_min, v2_max, v3_min, v3_max)]
+
+    def query_polygon(self, v2, v3, exact=False):
+        """Return the names of apertures that overlap a polygon.
+
+        Parameters
+        ----------
+        v2, v3 : numpy arrays
+            Vertices of the polygon in the tel frame in arcsec
+        exact : bool
+            If True, test the polygon against the aperture outlines, otherwise return all
+            apertures whose bounding box overlaps the bounding box of the polygon
+
+        Returns
+        -------
+        names : list of str
+            Aperture names
+
+        """
+        from .utils.polygon import bounding_box, polygons_overlap
+
+        v2 = np.asarray(v2, dtype=float)
+        v3 = np.asarray(v3, dtype=float)
+        candidates = self._candidates(*bounding_box(v2, v3))
+        if exact:
+            candidates = [k for k in candidates if polygons_overlap(v2, v3, *self.outlines[k])]
+        return [self.names[k] for k in candidates]
+
 
 def get_jwst_apertures(apertures_dict, include_oss_apertures=False, exact_pattern_match=False):
     """Return ApertureCollection that corresponds to constraints specified in apertures_dict.
@@ -121,7 +914,7 @@ def get_jwst_apertures(apertures_dict, include_oss_apertures=False, exact_patter
 
     all_aps = {}
     for j, instrument in enumerate(apertures_dict['instrument']):
-        siaf = Siaf(instrument)
+        siaf = get_cached_siaf(instrument)
         for AperName, aperture in siaf.apertures.items():
             if exact_pattern_match:
                 matched = AperName == apertures_dict['pattern'][j]
@@ -131,7 +924,8 @@ def get_jwst_apertures(apertures_dict, include_oss_apertures=False, exact_patter
             if matched:
                 if (include_oss_apertures is False) and ('_OSS' in AperName):
                     continue
-                all_aps[AperName] = aperture
+                # the cached Siaf is shared, return independent apertures
+                all_aps[AperName] = copy.deepcopy(aperture)
 
     return ApertureCollection(aperture_dict=all_aps)
 
@@ -139,7 +933,7 @@ def get_jwst_apertures(apertures_dict, include_oss_apertures=False, exact_patter
 def plot_all_apertures(subarrays=True, showorigin=True, detector_channels=True, **kwargs):
     """Plot all apertures."""
     for instr in ['NIRCam', 'NIRISS', 'NIRSpec', 'FGS', 'MIRI']:
-        aps = Siaf(instr)
+        aps = get_cached_siaf(instr)
         print("{0} has {1} apertures".format(aps.instrument, len(aps)))
 
         aps.plot(clear=False, subarrays=subarrays, **kwargs)
@@ -162,6 +956,7 @@ def plot_main_apertures(label=False, darkbg=False, detector_channels=False, fram
         Rotation matrix representing observatory attitude. Needed for sky frame plots.
 
     """
+    import matplotlib.pyplot as pl
 
     if frame not in ['tel', 'sky']:
         raise ValueError("Only the tel or sky frames make sense for plot_main_apertures")
@@ -175,11 +970,11 @@ def plot_main_apertures(label=False, darkbg=False, detector_channels=False, fram
         col_coron = 'green'
         col_msa = 'magenta'
 
-    nircam = Siaf('NIRCam')
-    niriss = Siaf('NIRISS')
-    fgs = Siaf('FGS')
-    nirspec = Siaf('NIRSpec')
-    miri = Siaf('MIRI')
+    nircam = get_cached_siaf('NIRCam')
+    niriss = get_cached_siaf('NIRISS')
+    fgs = get_cached_siaf('FGS')
+    nirspec = get_cached_siaf('NIRSpec')
+    miri = get_cached_siaf('MIRI')
 
     im_aps = [
         nircam['NRCA5_FULL'],
@@ -217,6 +1012,8 @@ def plot_main_apertures(label=False, darkbg=False, detector_channels=False, fram
         for ap in aplist:
 
             if frame=='sky':
+                # do not modify the apertures of the shared cached Siaf
+                ap = copy.deepcopy(ap)
                 ap.set_attitude_matrix(attitude_matrix)
 
             ap.plot(color=col, frame=frame, label=label, **kwargs)
@@ -237,6 +1034,7 @@ def plot_main_apertures(label=False, darkbg=False, detector_channels=False, fram
 
 def plot_master_apertures(**kwargs):
     """Plot only master apertures contours."""
+    import matplotlib.pyplot as pl
     siaf_detector_layout = read.read_siaf_detector_layout()
     master_aperture_names = siaf_detector_layout['AperName'].data
     apertures_dict = {'instrument': siaf_detector_layout['InstrName'].data}
@@ -290,7 +1088,7 @@ class Siaf(ApertureCollection):
 
     """
 
-    def __init__(self, instrument, filename=None, basepath=None, AperNames=None):
+    def __init__(self, instrument, filename=None, basepath=None, AperNames=None, compact=False):
         """Read a SIAF from disk.
 
         Parameters
@@ -301,6 +1099,9 @@ class Siaf(ApertureCollection):
             Directory to look in for SIAF files
         filename : string, optional
             Alternative method to specify a specific SIAF XML file.
+        compact : bool
+            If True, use aperture classes that store the PRD attributes in compact form, see
+            aperture.CompactAperture. This reduces the memory footprint of the Siaf.
 
         """
         super(Siaf, self).__init__()
@@ -324,6 +1125,10 @@ class Siaf(ApertureCollection):
             self.apertures = read.read_jwst_siaf(self.instrument, filename=filename, basepath=basepath)
             self.observatory = 'JWST'
 
+        if compact:
+            from .aperture import compact_apertures  # runtime import to avoid circular import on startup
+            self.apertures = compact_apertures(self.apertures)
+
     def __repr__(self):
         """Return string representation of instance."""
         return "<pysiaf.Siaf object Instrument={} >".format(self.instrument)
@@ -367,7 +1172,8 @@ class Siaf(ApertureCollection):
         return self.apertures.keys()
 
     def plot(self, frame='tel', names=None, label=False, units=None, clear=True,
-             show_frame_origin=None, mark_ref=False, subarrays=True, ax=None, **kwargs):
+             show_frame_origin=None, mark_ref=False, subarrays=True, ax=None, batch=True,
+             **kwargs):
         """Plot all apertures in this SIAF.
 
         Parameters
@@ -392,11 +1198,17 @@ class Siaf(ApertureCollection):
         ax : matplotlib.Axes
             Desired destination axes to plot into (If None, current
             axes are inferred from pyplot.)
+        batch : bool
+            If True, the outlines of all apertures are computed together and drawn as one
+            LineCollection and one PolyCollection, with the outline colors cycling over the
+            aperture types unless a color is given. Otherwise, and for keyword arguments
+            that collections do not support, Aperture.plot is called for every aperture.
 
         Other matplotlib standard parameters may be passed in via **kwargs
         to adjust the style of the displayed lines.
 
         """
+        import matplotlib.pyplot as pl
         if clear:
             pl.clf()
         if ax is None:
@@ -409,6 +1221,7 @@ class Siaf(ApertureCollection):
         else:
             iterable = self._getFullApertures
 
+        apertures = []
         for ap in iterable():
             if ap.AperType == "TRANSFORM":
                 continue
@@ -419,9 +1232,19 @@ class Siaf(ApertureCollection):
             if names is not None:
                 if ap.AperName not in names:
                     continue
-
-            ap.plot(frame=frame, label=label, ax=ax, units=units, mark_ref=mark_ref,
-                    show_frame_origin=show_frame_origin, **kwargs)
+            apertures.append(ap)
+
+        if batch and (frame in ['tel', 'idl', 'sci', 'det']) and \
+                set(kwargs).issubset(_COLLECTION_PLOT_KEYWORDS):
+            self._plot_collection(apertures, frame, ax, label=label, units=units,
+                                  mark_ref=mark_ref, **kwargs)
+            if show_frame_origin:
+                _plot_frame_origins(apertures, frame, show_frame_origin,
+                                    'arcsec' if units is None else units, ax)
+        else:
+            for ap in apertures:
+                ap.plot(frame=frame, label=label, ax=ax, units=units, mark_ref=mark_ref,
+                        show_frame_origin=show_frame_origin, **kwargs)
 
         if frame == 'Tel' or frame == 'Idl':
             # enforce V2 increasing toward the left
@@ -433,6 +1256,78 @@ class Siaf(ApertureCollection):
 
         self._last_plot_frame = frame
 
+    def _plot_collection(self, apertures, frame, ax, label=False, units=None, mark_ref=False,
+                         fill=True, fill_color='cyan', fill_alpha=None, **kwargs):
+        """Draw the outlines of apertures as matplotlib collections, see plot."""
+        from matplotlib.collections import LineCollection, PolyCollection
+        from .aperture import _units_scale  # runtime import to avoid circular import on startup
+
+        if units is None:
+            units = 'arcsec'
+        scale = _units_scale(units)
+
+        if frame == 'tel':
+            ax.set_xlabel('V2 ({0})'.format(units))
+            ax.set_ylabel('V3 ({0})'.format(units))
+        elif frame == 'idl':
+            ax.set_xlabel('Ideal X ({0})'.format(units))
+            ax.set_ylabel('Ideal Y ({0})'.format(units))
+        else:
+            ax.set_xlabel('X pixels ({0})'.format(frame))
+            ax.set_ylabel('Y pixels ({0})'.format(frame))
+
+        # outlines of quadrilateral apertures are evaluated together, see ApertureCollection.corners
+        quadrilateral = [getattr(ap, 'a_shape', None) != 'PICK' for ap in apertures]
+        corners = _aperture_corners([ap for ap, quad in zip(apertures, quadrilateral) if quad],
+                                    frame, rederive=False)
+        quadrilaterals = iter(corners * scale)
+        polygons = []
+        for ap, quad in zip(apertures, quadrilateral):
+            if quad:
+                polygons.append(next(quadrilaterals))
+            else:
+                x, y = ap.closed_polygon_points(frame, rederive=False)
+                polygons.append(np.vstack((x[:-1], y[:-1])).T * scale)
+        plotted = [k for k, polygon in enumerate(polygons) if not np.any(np.isnan(polygon))]
+        apertures = [apertures[k] for k in plotted]
+        polygons = [polygons[k] for k in plotted]
+        if len(polygons) == 0:
+            return
+
+        color = kwargs.pop('color', kwargs.pop('c', None))
+        if color is None:
+            # one color of the property cycle per aperture type
+            aperture_types = list(OrderedDict.fromkeys(ap.AperType for ap in apertures))
+            colors = ['C{:d}'.format(aperture_types.index(ap.AperType) % 10) for ap in apertures]
+        else:
+            colors = [color] * len(apertures)
+
+        line_keywords = {_COLLECTION_PLOT_KEYWORDS[key]: value for key, value in kwargs.items()}
+        ax.add_collection(LineCollection([np.vstack((polygon, polygon[:1])) for polygon in polygons],
+                                         colors=colors, **line_keywords))
+        if fill:
+            ax.add_collection(PolyCollection(polygons, facecolors=fill_color, edgecolors='none',
+                                             zorder=-40, alpha=fill_alpha,
+                                             transform=kwargs.get('transform', None)))
+
+        if label is not False:
+            for ap, polygon, aperture_color in zip(apertures, polygons, colors):
+                text = ap.AperName if label is True else label
+                ax.text(polygon[:, 0].mean(), polygon[:, 1].mean(), text,
+                        verticalalignment='center', horizontalalignment='center',
+                        color=aperture_color)
+        if mark_ref:
+            reference_points = np.array([ap.reference_point(frame) for ap in apertures])
+            ax.scatter(reference_points[:, 0] * scale, reference_points[:, 1] * scale, marker='+',
+                       c=colors)
+        ax.autoscale_view()
+
+        if (frame == 'tel') and (self.observatory == 'JWST'):
+            # ensure V2 increases to the left
+            xlim = ax.get_xlim()
+            if xlim[0] < xlim[1]:
+                ax.invert_xaxis()
+
     def plot_frame_origin(self, frame=None, which='sci', units='arcsec', ax=None):
         """Mark on the plot the frame's origin in Det and Sci coordinates.
 
@@ -451,19 +1346,20 @@ class Siaf(ApertureCollection):
             axes are inferred from pyplot.)
 
         """
+        import matplotlib.pyplot as pl
         if ax is None:
             ax = pl.gca()
 
         if frame is None:
             frame = self._last_plot_frame
-        for ap in self._getFullApertures():
-            ap.plot_frame_origin(frame=frame, which=which, units=units, ax=ax)
+        _plot_frame_origins(self._getFullApertures(), frame, which, units, ax)
 
     def plot_detector_channels(self, frame=None, ax=None):
         """Mark on the plot the various detector readout channels.
 
         These are depicted as alternating light/dark bars to show the
-        regions read out by each of the output amps.
+        regions read out by each of the output amps. The channels of all
+        full apertures are drawn as one PolyCollection.
 
         Parameters
         ----------
@@ -476,6 +1372,9 @@ class Siaf(ApertureCollection):
             axes are inferred from pyplot.)
 
         """
+        import matplotlib.pyplot as pl
+        from matplotlib.collections import PolyCollection
+        from matplotlib.colors import to_rgba
 
         if ax is None:
             ax = pl.gca()
@@ -483,6 +1382,222 @@ class Siaf(ApertureCollection):
         if frame is None:
             frame = self._last_plot_frame
 
-        for ap in self._getFullApertures():
-            ap.plot_detector_channels(frame=frame, ax=ax)
-            
\ No newline at end of file
+        # see the default styling of Aperture.plot_detector_channels
+        color, alpha, evenoddratio = '0.5', 0.3, 0.5
+        channel_colors = [to_rgba(color, alpha if chan % 2 == 1 else alpha * evenoddratio)
+                          for chan in range(4)]
+        vertices = [ap._detector_channel_vertices(frame) for ap in self._getFullApertures()]
+        if len(vertices) == 0:
+            return
+        ax.add_collection(PolyCollection(np.concatenate(vertices),
+                                         facecolors=channel_colors * len(vertices),
+                                         edgecolors='none', linewidths=0))
+        ax.autoscale_view()
+
+
+def _prd_basepath(instrument, prd_version):
+    """Return the SIAF XML directory of a JWST PRD version, None for the default."""
+    if prd_version is None:
+        return None
+    elif instrument.lower() not in JWST_INSTRUMENT_NAME_MAPPING:
+        raise ValueError('prd_version is only supported for JWST instruments.')
+    return os.path.join(_DATA_ROOT, 'JWST', prd_version, 'SIAFXML', 'SIAFXML')
+
+
+class SiafRegistry(object):
+    """Process-wide least-recently-used cache of Siaf objects.
+
+    The Siaf instances returned by the registry are shared between all callers. They are not
+    protected against modification, a change made by one caller is seen by every later caller of
+    the registry. Use copy.deepcopy to obtain an independent copy that can be modified.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of Siaf objects kept in the registry
+
+    Examples
+    --------
+    fgs_siaf = pysiaf.get_cached_siaf('FGS')
+    pysiaf.SIAF_REGISTRY.stats()
+    pysiaf.SIAF_REGISTRY.clear()
+
+    """
+
+    def __init__(self, maxsize=16):
+        """Initialize empty registry."""
+        self.maxsize = maxsize
+        self._siafs = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, instrument, prd_version=None, filename=None):
+        """Return the shared Siaf object for the given instrument, PRD version and file.
+
+        Parameters
+        ----------
+        instrument : str
+            one of 'NIRCam', 'NIRSpec', 'NIRISS', 'MIRI', 'FGS', 'HST', 'Roman'; case-insensitive.
+        prd_version : str
+            JWST PRD version, e.g. 'PRDOPSSOC-063'. Defaults to the version in use by pysiaf.
+        filename : str
+            Alternative method to specify a specific SIAF XML file.
+
+        Returns
+        -------
+        siaf : Siaf
+            Shared Siaf object, changes to it are seen by all callers
+
+        """
+        if (instrument is None) or (isinstance(instrument, str) is False):
+            raise RuntimeError('Please specify a valid instrument name.')
+
+        if instrument.lower() in JWST_INSTRUMENT_NAME_MAPPING and prd_version is None:
+            prd_version = JWST_PRD_VERSION
+        basepath = _prd_basepath(instrument, prd_version)
+        if filename is not None:
+            filename = os.path.abspath(filename)
+
+        key = (instrument.lower(), prd_version, filename)
+        with self._lock:
+            siaf = self._siafs.get(key)
+            if siaf is not None:
+                self._hits += 1
+                self._siafs.move_to_end(key)
+                return siaf
+            self._misses += 1
+
+        # read outside of the lock, concurrent misses may read the same file twice
+        siaf = Siaf(instrument, filename=filename, basepath=basepath)
+
+        with self._lock:
+            siaf = self._siafs.setdefault(key, siaf)
+            self._siafs.move_to_end(key)
+            while len(self._siafs) > max(self.maxsize, 0):
+                self._siafs.popitem(last=False)
+        return siaf
+
+    def clear(self):
+        """Remove all Siaf objects from the registry and reset the statistics."""
+        with self._lock:
+            self._siafs.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        """Return registry statistics.
+
+        Returns
+        -------
+        stats : dict
+            Number of hits and misses, current and maximum size, and the cached keys as
+            (instrument, prd_version, filename) tuples
+
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'currsize': len(self._siafs),
+                    'maxsize': self.maxsize, 'keys': list(self._siafs.keys())}
+
+
+# process-wide registry used by get_cached_siaf
+SIAF_REGISTRY = SiafRegistry()
+
+
+def get_cached_siaf(instrument, prd_version=None, filename=None):
+    """Return a shared Siaf object from the process-wide registry.
+
+    Repeated calls with the same arguments return the same object, the SIAF is read only once.
+    The object is not copied and not protected against modification, changes made by one caller
+    are seen by all later callers. See SiafRegistry for cache size, statistics and clearing.
+
+    Parameters
+    ----------
+    instrument : str
+        one of 'NIRCam', 'NIRSpec', 'NIRISS', 'MIRI', 'FGS', 'HST', 'Roman'; case-insensitive.
+    prd_version : str
+        JWST PRD version, e.g. 'PRDOPSSOC-063'. Defaults to the version in use by pysiaf.
+    filename : str
+        Alternative method to specify a specific SIAF XML file.
+
+    Returns
+    -------
+    siaf : Siaf
+        Shared Siaf object. Use copy.deepcopy to obtain a copy that can be modified.
+
+    """
+    return SIAF_REGISTRY.get(instrument, prd_version=prd_version, filename=filename)
+
+
+def _load_siaf(instrument, prd_version=None, filename=None, compact=False):
+    """Return a new Siaf object, module-level to be usable with process pools."""
+    return Siaf(instrument, filename=filename, basepath=_prd_basepath(instrument, prd_version),
+                compact=compact)
+
+
+def load_many(specs, executor=None, max_workers=None, compact=False, sequential=False):
+    """Read several SIAFs concurrently.
+
+    By default the files are read by a ThreadPoolExecutor with one thread per file, so that
+    reading is not serialized behind the slowest file where the parser can run in parallel. Much
+    of the xml parsing holds the GIL, therefore the gain over sequential reading depends on the
+    files and the Python build. With sequential=True the files are read one after the other in
+    the calling thread.
+
+    Parameters
+    ----------
+    specs : list
+        Each entry is an instrument name (e.g. 'NIRCam') or a tuple (instrument, prd_version) or
+        (instrument, prd_version, filename), where prd_version and filename can be None.
+    executor : concurrent.futures.Executor
+        Executor used to read the files. Defaults to a ThreadPoolExecutor that is shut down
+        when all files are read. With a ProcessPoolExecutor, the Siaf objects are pickled back to
+        the calling process.
+    max_workers : int
+        Number of threads of the default executor, ignored if executor is given.
+    compact : bool
+        If True, the Siaf objects use compact apertures, see aperture.CompactAperture.
+    sequential : bool
+        If True, read the files one after the other without executor.
+
+    Returns
+    -------
+    siafs : OrderedDict
+        Siaf objects keyed by the entries of specs, in the same order
+
+    Examples
+    --------
+    siafs = pysiaf.load_many(['NIRCam', 'NIRSpec', 'NIRISS', 'MIRI', 'FGS'])
+    nircam_siaf = siafs['NIRCam']
+
+    """
+    arguments = OrderedDict()
+    for spec in specs:
+        if isinstance(spec, str):
+            arguments[spec] = (spec, None, None)
+        elif isinstance(spec, tuple) and len(spec) in [2, 3]:
+            arguments[spec] = tuple(spec) + (None,) * (3 - len(spec))
+        else:
+            raise ValueError('Invalid SIAF specification {}. Use an instrument name or a tuple '
+                             '(instrument, prd_version[, filename]).'.format(spec))
+
+    if sequential:
+        if executor is not None:
+            raise ValueError('An executor cannot be used with sequential=True.')
+        return OrderedDict((spec, _load_siaf(instrument, prd_version, filename, compact))
+                           for spec, (instrument, prd_version, filename) in arguments.items())
+
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers if max_workers is not None else len(arguments) or None)
+    try:
+        futures = OrderedDict(
+            (spec, executor.submit(_load_siaf, instrument, prd_version, filename, compact))
+            for spec, (instrument, prd_version, filename) in arguments.items())
+        siafs = OrderedDict((spec, future.result()) for spec, future in futures.items())
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return siafs
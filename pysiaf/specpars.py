@@ -1,18 +1,47 @@
+import functools
+import importlib.resources as importlib_resources
+import os
+
+import numpy as np
+
+from .aperture import DISTORTION_ATTRIBUTES, DISTORTION_ATTRIBUTE_INDEX, \
+    POLYNOMIAL_COEFFICIENT_NAMES
+from .iando import read
+
+
 class SpecPars():
     """
     Class to contain the aXe-like parameterization of spectroscopic
     parameters for wavelength-to-pixel conversion for Roman WFI
     spectroscopic guiding.
 
+    The parameters are given at the grid positions of a SpecGridX x SpecGridY
+    grid of detector regions and are stored as numpy arrays with one element
+    per grid position.
+
     Note that pixels are in the SCIENCE frame!
     """
 
+    # per-position parameters: attribute name, XML tag, type
+    _POSITION_FIELDS = (('position', 'GridPosition', int),
+                        ('x_min', 'XMin', int),
+                        ('x_max', 'XMax', int),
+                        ('y_min', 'YMin', int),
+                        ('y_max', 'YMax', int),
+                        ('blue_x', 'BlueDeltaX', float),
+                        ('blue_y', 'BlueDeltaY', float),
+                        ('blue_wave', 'BlueWave20', float),
+                        ('red_x', 'RedDeltaX', float),
+                        ('red_y', 'RedDeltaY', float),
+                        ('red_wave', 'RedWave20', float))
+
     def __init__(self, spec_node):
         """
         Inputs
         ------
         spec_node (`xml.etree`):
-            XML object containing the spectroscopic mode SIAF parameters.
+            XML object containing the spectroscopic mode SIAF parameters,
+            i.e. a SpecPars element.
 
         Returns
         -------
@@ -20,52 +49,110 @@ class SpecPars():
         """
 
         # General info
-        self.position = list()
-
-        # X limits
-        self.x_min = list()
-        self.x_max = list()
-
-        # Y limits
-        self.y_min = list()
-        self.y_max = list()
-
-        # Spectroscopic parameters
-        self.blue_x = list()
-        self.blue_y = list()
-        self.red_x = list()
-        self.red_y = list()
-        self.red_wave = list()
-        self.blue_wave = list()
-
-        for position in spec_node:
-            if 'SpectralElement' in position.tag:
-                self.mode = spec_node.attrib(['SpectralElement'])
-            for child in position:
-                if 'GridPosition' in child.tag:
-                    self.position.append(int(child.tag))
-                if 'XMin' in child.tag:
-                    self.x_min.append(int(child.text))
-                if 'XMax' in child.tag:
-                    self.x_max.append(int(child.text))
-                if 'YMin' in child.tag:
-                    self.y_min.append(int(child.text))
-                if 'YMax' in child.tag:
-                    self.y_max.append(int(child.text))
-                if 'BlueDeltaX' in child.tag:
-                    self.blue_x.append(float(child.text))
-                if 'BlueDeltaY' in child.tag:
-                    self.blue_y.append(float(child.text))
-                if 'RedDeltaX' in child.tag:
-                    self.red_x.append(float(child.text))
-                if 'RedDeltaY' in child.tag:
-                    self.red_y.append(float(child.text))
-                if 'BlueWave20' in child.tag:
-                    self.blue_wave.append(float(child.text))
-                if 'RedWave20' in child.tag:
-                    self.blue_wave.append(float(child.text))
-                else:
-                    pass
+        self.mode = spec_node.findtext('SpectralElement')
+        self.grid_x = int(spec_node.findtext('SpecGridX'))
+        self.grid_y = int(spec_node.findtext('SpecGridY'))
+
+        positions = spec_node.findall('Position')
+        for name, tag, dtype in self._POSITION_FIELDS:
+            setattr(self, name, np.array([dtype(position.findtext(tag))
+                                          for position in positions], dtype=dtype))
+
+        self._build_grid()
+
+    def _build_grid(self):
+        """Arrange the trace parameters on the regular grid of detector regions."""
+        x_center = (self.x_min + self.x_max) / 2.
+        y_center = (self.y_min + self.y_max) / 2.
+        self._grid_x_center, ix = np.unique(x_center, return_inverse=True)
+        self._grid_y_center, iy = np.unique(y_center, return_inverse=True)
+        if len(self._grid_x_center) * len(self._grid_y_center) != len(self.position):
+            raise ValueError('{} grid positions do not form a regular {}x{} grid.'.format(
+                len(self.position), self.grid_x, self.grid_y))
+
+        # (parameter, y, x) array of blue_x, blue_y, blue_wave, red_x, red_y, red_wave
+        self._grid = np.empty((6, len(self._grid_y_center), len(self._grid_x_center)))
+        for k, values in enumerate([self.blue_x, self.blue_y, self.blue_wave,
+                                    self.red_x, self.red_y, self.red_wave]):
+            self._grid[k, iy, ix] = values
+
+    def parameters(self, x_sci, y_sci):
+        """
+        Purpose
+        -------
+        Return the trace parameters at arbitrary detector positions.
+
+        The parameters given at the centers of the grid regions are
+        interpolated bilinearly. Outside of the grid of centers, the values of
+        the nearest centers are used.
+
+        Inputs
+        ------
+        x_sci, y_sci (float or `~numpy.ndarray`):
+            Source positions in science pixels.
+
+        Returns
+        -------
+        parameters (`~numpy.ndarray`):
+            Array of shape (6,) + broadcast shape of the inputs holding
+            blue_x, blue_y, blue_wave, red_x, red_y, red_wave.
+        """
+        x_sci, y_sci = np.broadcast_arrays(np.asarray(x_sci, dtype=float),
+                                           np.asarray(y_sci, dtype=float))
+        ix0, tx = _grid_interpolation_index(self._grid_x_center, x_sci)
+        iy0, ty = _grid_interpolation_index(self._grid_y_center, y_sci)
+        ix1 = np.minimum(ix0 + 1, len(self._grid_x_center) - 1)
+        iy1 = np.minimum(iy0 + 1, len(self._grid_y_center) - 1)
+
+        parameters = np.empty((len(self._grid),) + x_sci.shape)
+        for k, grid in enumerate(self._grid):
+            parameters[k] = ((1 - ty) * ((1 - tx) * grid[iy0, ix0] + tx * grid[iy0, ix1]) +
+                             ty * ((1 - tx) * grid[iy1, ix0] + tx * grid[iy1, ix1]))
+        return parameters
+
+    def trace(self, x_sci, y_sci, wavelength):
+        """
+        Purpose
+        -------
+        Return the pixel positions of the spectral trace of sources.
+
+        The trace is linear in wavelength between its blue and red ends,
+        which are offset from the source position by (blue_x, blue_y) at
+        blue_wave and by (red_x, red_y) at red_wave. The parameters are
+        interpolated between grid positions, see parameters(). All inputs are
+        broadcast against each other.
+
+        Inputs
+        ------
+        x_sci, y_sci (float or `~numpy.ndarray`):
+            Source positions in science pixels.
+
+        wavelength (float or `~numpy.ndarray`):
+            Wavelength in the units of blue_wave and red_wave (micron).
+
+        Returns
+        -------
+        x_trace, y_trace (`~numpy.ndarray`):
+            Science pixel positions of the trace at the given wavelengths.
+        """
+        x_sci, y_sci, wavelength = np.broadcast_arrays(np.asarray(x_sci, dtype=float),
+                                                       np.asarray(y_sci, dtype=float),
+                                                       np.asarray(wavelength, dtype=float))
+        blue_x, blue_y, blue_wave, red_x, red_y, red_wave = self.parameters(x_sci, y_sci)
+
+        fraction = (wavelength - blue_wave) / (red_wave - blue_wave)
+        x_trace = x_sci + blue_x + fraction * (red_x - blue_x)
+        y_trace = y_sci + blue_y + fraction * (red_y - blue_y)
+        return x_trace, y_trace
+
+
+def _grid_interpolation_index(centers, values):
+    """Return lower grid index and interpolation weight of values on a sorted grid."""
+    if len(centers) == 1:
+        return np.zeros(values.shape, dtype=int), np.zeros(values.shape)
+    fractional_index = np.interp(values, centers, np.arange(len(centers)))
+    lower_index = np.minimum(fractional_index.astype(int), len(centers) - 2)
+    return lower_index, fractional_index - lower_index
 
 
 def get_distortion_coeffs(aperture_name, siaf_file=None, inverse=False):
@@ -97,51 +184,65 @@ def get_distortion_coeffs(aperture_name, siaf_file=None, inverse=False):
     y_coeffs (`~numpy.ndarray`):
         Array of polynomial coefficients describing the geometric distortion
         in the Y direction.
+
+    Both are empty if the aperture is not in the SIAF file.
     """
 
     if not siaf_file:
-        with importlib_resources.path('pysiaf.pysiaf.prd_data.Roman', 
-                                          'roman_siaf.xml') as sf:
-            siaf_file = sf
-
-    siaf_xml = ET.parse(siaf_file)
-    siaf_root = siaf_xml.getroot()
-
-    x_coeffs = {}
-    y_coeffs = {}
-
-    for child in siaf_root:
-        if not inverse:
-            if child[1].text == aperture_name:
-                # X = indices 33 to 53
-                # Y = indices 54 to 74
-                for i in np.arange(33, 54, 1):
-                    name = child[i].tag
-                    j = ast.literal_eval(name[-2])
-                    k = ast.literal_eval(name[-1])
-                    value = float(child[i].text)
-                    x_coeffs[f'c{j - k}_{k}'] = value
-                for i in np.arange(54, 75, 1):
-                    name = child[i].tag
-                    j = ast.literal_eval(name[-2])
-                    k = ast.literal_eval(name[-1])
-                    value = float(child[i].text)
-                    y_coeffs[f'c{j - k}_{k}'] = value
-        else:
-            if child[1].text == aperture_name:
-                # X = indices 75 to 95
-                # Y = indices 96 to 116
-                for i in np.arange(75, 95, 1):
-                    name = child[i].tag
-                    j = ast.literal_eval(name[-2])
-                    k = ast.literal_eval(name[-1])
-                    value = float(child[i].text)
-                    x_coeffs[f'c{j - k}_{k}'] = value
-                for i in np.arange(96, 116, 1):
-                    name = child[i].tag
-                    j = ast.literal_eval(name[-2])
-                    k = ast.literal_eval(name[-1])
-                    value = float(child[i].text)
-                    y_coeffs[f'c{j - k}_{k}'] = value
+        resource = importlib_resources.files('pysiaf.prd_data.Roman').joinpath('roman_siaf.xml')
+        with importlib_resources.as_file(resource) as sf:
+            coefficients = _read_distortion_coefficients(os.path.abspath(str(sf))).get(
+                aperture_name)
+    else:
+        coefficients = _read_distortion_coefficients(os.path.abspath(str(siaf_file))).get(
+            aperture_name)
+    if coefficients is None:
+        # aperture not in the file
+        return {}, {}
+
+    if not inverse:
+        x_seed, y_seed = 'Sci2IdlX', 'Sci2IdlY'
+    else:
+        x_seed, y_seed = 'Idl2SciX', 'Idl2SciY'
+
+    x_coeffs = dict(zip(_POLYNOMIAL_TERMS, coefficients[x_seed].tolist()))
+    y_coeffs = dict(zip(_POLYNOMIAL_TERMS, coefficients[y_seed].tolist()))
 
     return x_coeffs, y_coeffs
+
+
+# names of the coefficients of the astropy Polynomial2D model in SIAF order, e.g. c1_0 for X10
+_POLYNOMIAL_TERMS = ['c{}_{}'.format(int(name[-2]) - int(name[-1]), name[-1])
+                     for name in DISTORTION_ATTRIBUTES[0::len(POLYNOMIAL_COEFFICIENT_NAMES)]]
+
+
+@functools.lru_cache()
+def _read_distortion_coefficients(siaf_file):
+    """Return the distortion coefficients of all apertures in a Roman SIAF file.
+
+    The file is parsed once, later calls are served from memory.
+
+    Parameters
+    ----------
+    siaf_file : str
+        Absolute path to the SIAF xml file.
+
+    Returns
+    -------
+    coefficients : dict
+        Keyed by aperture name, each entry is a dict with the coefficient arrays (read-only)
+        keyed by Sci2IdlX, Sci2IdlY, Idl2SciX, Idl2SciY. Missing coefficients are NaN.
+
+    """
+    coefficients = {}
+    for entry in read._iter_siaf_entries(siaf_file):
+        aperture_coefficients = np.full((len(POLYNOMIAL_COEFFICIENT_NAMES),
+                                         len(_POLYNOMIAL_TERMS)), np.nan)
+        for node in entry:
+            index = DISTORTION_ATTRIBUTE_INDEX.get(node.tag)
+            if (index is not None) and (node.text is not None):
+                aperture_coefficients[index] = float(node.text)
+        aperture_coefficients.flags.writeable = False
+        coefficients[entry.findtext('AperName')] = dict(zip(POLYNOMIAL_COEFFICIENT_NAMES,
+                                                            aperture_coefficients))
+    return coefficients
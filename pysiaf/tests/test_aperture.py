@@ -7,6 +7,8 @@ Authors
 
 """
 
+import copy
+
 import numpy as np
 import pytest
 
@@ -284,3 +286,182 @@ def test_jwst_sky_transformations(verbose=False):
     # test to/from detector coords, to test all the intermediate transforms too
     # Below still fails
     #assert np.allclose(fgs_aperture.sky_to_det(*fgs_aperture.det_to_sky(d1,d2)), (d1,d2)), "sky_to_det(det_to_sky) was not an identity"
+
+
+def test_aperture_from_mapping():
+    """Test bulk construction of an aperture and the validation of attribute formats."""
+    from ..aperture import JwstAperture, PRD_REQUIRED_ATTRIBUTES_ORDERED
+
+    reference_aperture = Siaf('NIRISS')['NIS_CEN']
+    mapping = {key: getattr(reference_aperture, key) for key in PRD_REQUIRED_ATTRIBUTES_ORDERED}
+    aperture = JwstAperture.from_mapping(mapping)
+    for key in PRD_REQUIRED_ATTRIBUTES_ORDERED:
+        assert getattr(aperture, key) == getattr(reference_aperture, key)
+    assert np.allclose(aperture.sci_to_tel(100., 200.), reference_aperture.sci_to_tel(100., 200.))
+
+    for key, value in [('XDetSize', 2048.), ('AperName', 1), ('V2Ref', '0.0'),
+                       ('AperType', 'NOTATYPE')]:
+        with pytest.raises(AttributeError):
+            JwstAperture.from_mapping(dict(mapping, **{key: value}))
+        with pytest.raises(AttributeError):
+            setattr(aperture, key, value)
+
+    aperture.V2Ref = np.ma.masked
+    assert aperture.V2Ref == 0.0
+
+
+def test_polynomial_coefficient_array(siaf_objects):
+    """Test that the coefficient arrays stay in sync with the coefficient attributes."""
+    aperture = siaf_objects[0]['NRCA1_FULL']
+    degree = aperture.Sci2IdlDeg
+    coefficients = aperture.get_polynomial_coefficients()
+    for seed, values in coefficients.items():
+        expected = [getattr(aperture, '{}{}{}'.format(seed, i, j)) for i in range(degree + 1)
+                    for j in range(i + 1)]
+        assert np.all(values == expected)
+
+    new_aperture = copy.deepcopy(aperture)
+    new_aperture.Sci2IdlX10 = 0.5
+    assert new_aperture.get_polynomial_coefficients()['Sci2IdlX'][1] == 0.5
+    assert coefficients['Sci2IdlX'][1] == aperture.Sci2IdlX10
+
+    new_aperture.set_polynomial_coefficients(*[2 * values for values in coefficients.values()])
+    assert new_aperture.Idl2SciY11 == 2 * aperture.Idl2SciY11
+    for seed, values in new_aperture.get_polynomial_coefficients().items():
+        assert np.all(values == 2 * coefficients[seed])
+
+    # the returned arrays are independent copies
+    new_coefficients = new_aperture.get_polynomial_coefficients()
+    new_coefficients['Sci2IdlX'][1] = 0.
+    assert new_aperture.Sci2IdlX10 == 2 * aperture.Sci2IdlX10
+    new_aperture.set_polynomial_coefficients(*coefficients.values())
+    assert new_coefficients['Idl2SciY'][2] == 2 * aperture.Idl2SciY11
+
+    # the coefficients are validated like attribute assignments
+    with pytest.raises(AttributeError):
+        new_aperture.set_polynomial_coefficients(
+            *[[int(value) for value in values] for values in coefficients.values()])
+
+
+def test_compact_apertures():
+    """Test that compact apertures behave like the regular ones."""
+    from ..aperture import CompactAperture, PRD_REQUIRED_ATTRIBUTES_ORDERED
+
+    for instrument in ['NIRSpec', 'HST']:
+        siaf = Siaf(instrument)
+        compact_siaf = Siaf(instrument, compact=True)
+        assert list(siaf.apertures) == list(compact_siaf.apertures)
+        for aperture_name, aperture in siaf.apertures.items():
+            compact_aperture = compact_siaf[aperture_name]
+            assert isinstance(compact_aperture, CompactAperture)
+            assert isinstance(compact_aperture, type(aperture))
+            for key in PRD_REQUIRED_ATTRIBUTES_ORDERED:
+                assert getattr(compact_aperture, key) == getattr(aperture, key)
+
+    aperture = Siaf('NIRSpec', compact=True)['NRS1_FULL']
+    assert aperture._parent_apertures is None
+    assert isinstance(aperture._CLEAR_GWA_OTE, CompactAperture)
+    reference_aperture = Siaf('NIRSpec')['NRS1_FULL']
+    assert np.allclose(aperture.sci_to_tel(100., 200.), reference_aperture.sci_to_tel(100., 200.))
+
+    aperture.V2Ref = 1.5
+    aperture.XDetSize = 1024
+    assert (aperture.V2Ref, aperture.XDetSize) == (1.5, 1024)
+    assert isinstance(aperture.XDetSize, int)
+    assert 'V2Ref' not in aperture.__dict__
+    with pytest.raises(AttributeError):
+        aperture.XDetSize = 1024.
+
+
+def test_pixel_area_map(tmp_path):
+    """Compare the pixel area map with numerical derivatives and exercise the disk cache."""
+    aperture = copy.deepcopy(Siaf('NIRISS')['NIS_CEN'])
+    area_map = aperture.pixel_area_map(shape=(300, 200), cache_dir=str(tmp_path))
+    assert area_map.shape == (300, 200)
+    assert area_map.dtype == np.float32
+
+    # area spanned by the ideal frame images of pixel edges centred on two sample pixels
+    for x_sci, y_sci in [(1, 1), (150, 250)]:
+        delta = 0.5
+        x_idl, y_idl = aperture.sci_to_idl(np.array([x_sci - delta, x_sci + delta, x_sci, x_sci]),
+                                           np.array([y_sci, y_sci, y_sci - delta, y_sci + delta]))
+        area = np.abs((x_idl[1] - x_idl[0]) * (y_idl[3] - y_idl[2]) -
+                      (y_idl[1] - y_idl[0]) * (x_idl[3] - x_idl[2]))
+        assert np.isclose(area_map[y_sci - 1, x_sci - 1], area, rtol=1e-5)
+
+    # the cached map is returned
+    assert len(list(tmp_path.iterdir())) == 1
+    cached_map = aperture.pixel_area_map(shape=(300, 200), cache_dir=str(tmp_path))
+    assert np.array_equal(cached_map, area_map)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # changed coefficients are cached separately
+    coefficients = aperture.get_polynomial_coefficients()
+    sci2idlx = np.array(coefficients['Sci2IdlX'])
+    sci2idlx[1] *= 1.1
+    aperture.set_polynomial_coefficients(sci2idlx, coefficients['Sci2IdlY'],
+                                         coefficients['Idl2SciX'], coefficients['Idl2SciY'])
+    changed_map = aperture.pixel_area_map(shape=(300, 200), cache_dir=str(tmp_path))
+    assert not np.allclose(changed_map, area_map)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    full_map = aperture.pixel_area_map(cache=False, dtype=float)
+    assert full_map.shape == (aperture.YSciSize, aperture.XSciSize)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_content_hash(siaf_objects):
+    """Test aperture equality based on the content hash."""
+    aperture = siaf_objects[0]['NRCA1_FULL']
+    new_aperture = copy.deepcopy(aperture)
+    assert new_aperture == aperture
+    assert new_aperture.content_hash == aperture.content_hash
+    assert new_aperture != siaf_objects[0]['NRCA2_FULL']
+    # apertures hash by identity
+    assert len({new_aperture, aperture}) == 2
+
+    # the hash is discarded when an attribute is set
+    new_aperture.V3IdlYAngle = aperture.V3IdlYAngle + 1e-12
+    assert new_aperture != aperture
+    new_aperture.V3IdlYAngle = np.float64(aperture.V3IdlYAngle)
+    assert new_aperture == aperture
+
+    # only PRD attributes are hashed, NaN values are equal
+    new_aperture._correct_dva = True
+    new_aperture.comment = 'not hashed'
+    assert new_aperture == aperture
+    new_aperture.V2Ref = np.nan
+    aperture_copy = copy.deepcopy(aperture)
+    aperture_copy.V2Ref = float('nan')
+    assert new_aperture == aperture_copy
+
+    for instrument in ['NIRSpec', 'HST', 'Roman']:
+        siaf = Siaf(instrument)
+        compact_siaf = Siaf(instrument, compact=True)
+        for aperture_name, aperture in siaf.apertures.items():
+            assert compact_siaf[aperture_name] == aperture
+
+    # the same file read twice, the Roman apertures hold SpecPars objects
+    from ..utils.compare import dict_compare
+
+    siaf = Siaf('Roman')
+    other_siaf = Siaf('Roman')
+    for aperture_name, aperture in siaf.apertures.items():
+        assert other_siaf[aperture_name] is not aperture
+        assert other_siaf[aperture_name] == aperture
+    assert len(dict_compare(other_siaf.apertures, siaf.apertures)[2]) == 0
+
+    # the hash follows bulk changes of the distortion coefficients
+    for aperture in [siaf_objects[0]['NRCA1_FULL'], Siaf('NIRCam', compact=True)['NRCA1_FULL']]:
+        new_aperture = copy.deepcopy(aperture)
+        content_hash = new_aperture.content_hash
+        coefficients = new_aperture.get_polynomial_coefficients()
+        sci2idlx = coefficients['Sci2IdlX'].copy()
+        sci2idlx[1] += 1.
+        new_aperture.set_polynomial_coefficients(sci2idlx, coefficients['Sci2IdlY'],
+                                                 coefficients['Idl2SciX'],
+                                                 coefficients['Idl2SciY'])
+        assert new_aperture.content_hash != content_hash
+        assert new_aperture != aperture
+        modified = dict_compare({'NRCA1_FULL': new_aperture}, {'NRCA1_FULL': aperture})[2]
+        assert list(modified) == ['NRCA1_FULL']
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Test the SIAF comparison functions.
+
+"""
+
+import concurrent.futures
+import copy
+import io
+import os
+
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.pyplot as pl
+import numpy as np
+
+from ..aperture import compare_apertures
+from ..siaf import Siaf
+from ..utils import tools
+from ..utils.compare import compare_siaf_attributes, compare_transformation_roundtrip, \
+    plot_roundtrip_errors
+
+
+def test_compare_siaf_attributes():
+    """Compare the columnar SIAF difference with the per-aperture comparison."""
+    reference_siaf = Siaf('NIRISS')
+    comparison_siaf = copy.deepcopy(reference_siaf)
+    comparison_siaf['NIS_CEN'].V2Ref += 1.
+    comparison_siaf['NIS_CEN'].V3Ref += 1e-9
+    comparison_siaf['NIS_AMI1'].AperShape = 'CIRC'
+    comparison_siaf['NIS_AMI1'].XSciRef = None
+    comparison_siaf['NIS_SUB64'].V3IdlYAngle *= 1 + 1e-3
+
+    for absolute_tolerance in [2., 0.5, None]:
+        table = compare_siaf_attributes(reference_siaf, comparison_siaf,
+                                        absolute_tolerance=absolute_tolerance)
+        reference_table = [compare_apertures(reference_siaf[aperture_name],
+                                             comparison_siaf[aperture_name],
+                                             absolute_tolerance=absolute_tolerance,
+                                             print_file=io.StringIO())
+                           for aperture_name in reference_siaf.apertures]
+        rows = [tuple(row) for comparison_table in reference_table for row in comparison_table]
+        assert [tuple(row) for row in table] == rows
+
+    assert set(table['aperture'].astype(str)) == {'NIS_CEN', 'NIS_AMI1', 'NIS_SUB64'}
+    table = compare_siaf_attributes(reference_siaf, comparison_siaf, aperture_names=['NIS_CEN'],
+                                    ignore_attributes=['V3Ref'], fractional_tolerance=1e-12)
+    assert table['attribute'].astype(str).tolist() == ['V2Ref']
+    assert len(compare_siaf_attributes(reference_siaf, reference_siaf)) == 0
+
+
+def test_compare_transformation_roundtrip(tmp_path):
+    """Compare the stacked roundtrip errors with the per-aperture computation."""
+    reference_siaf = Siaf('FGS')
+    comparison_siaf = copy.deepcopy(reference_siaf)
+    aperture = comparison_siaf['FGS1_FULL']
+    coefficients = aperture.get_polynomial_coefficients()
+    idl2scix = np.array(coefficients['Idl2SciX'])
+    idl2scix[1] *= 1.001
+    aperture.set_polynomial_coefficients(coefficients['Sci2IdlX'], coefficients['Sci2IdlY'],
+                                         idl2scix, coefficients['Idl2SciY'])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        table = compare_transformation_roundtrip(comparison_siaf,
+                                                 reference_siaf_input=reference_siaf,
+                                                 verbose=False, report_file=os.devnull,
+                                                 executor=executor, chunk_size=3)
+    assert len(table) > 3
+    for row in table:
+        for j, siaf in enumerate([reference_siaf, comparison_siaf]):
+            aperture = siaf[row['AperName']]
+            coefficients = aperture.get_polynomial_coefficients()
+            errors = tools.compute_roundtrip_error(
+                coefficients['Sci2IdlX'], coefficients['Sci2IdlY'], coefficients['Idl2SciX'],
+                coefficients['Idl2SciY'], offset_x=aperture.XSciRef, offset_y=aperture.YSciRef,
+                instrument='FGS', grid_amplitude=aperture.XSciSize)
+            for k, tag in enumerate('metric dx_mean dy_mean dx_rms dy_rms'.split()):
+                assert np.isclose(row['siaf{}_{}'.format(j, tag)], errors[k], equal_nan=True)
+    difference = table['difference_dx_mean'][list(table['AperName']).index('FGS1_FULL')]
+    assert np.abs(difference) > 1e-3
+
+    plot_roundtrip_errors(table[0:1], reference_siaf, comparison_siaf,
+                          report_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 2
+    pl.close('all')
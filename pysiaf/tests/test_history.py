@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Test the PRD history index.
+
+"""
+
+import pytest
+
+from ..siaf import SIAF_REGISTRY, get_cached_siaf
+from ..utils.history import PrdHistory, available_prd_versions
+
+
+def test_available_prd_versions():
+    """Test the chronological order of PRD versions."""
+    prd_versions = available_prd_versions()
+    assert prd_versions.index('PRDOPSSOC-H-015') < prd_versions.index('PRDOPSSOC-M-024') < \
+        prd_versions.index('PRDOPSSOC-028') < prd_versions.index('PRDOPSSOC-040') < \
+        prd_versions.index('PRDOPSSOC-040-001') < prd_versions.index('PRDOPSSOC-043')
+
+
+def test_prd_history():
+    """Compare the history index with the apertures of the individual PRD versions."""
+    prd_versions = ['PRDOPSSOC-M-026', 'PRDOPSSOC-028', 'PRDOPSSOC-031', 'PRDOPSSOC-062']
+    registry_keys = SIAF_REGISTRY.stats()['keys']
+    history = PrdHistory('niriss', prd_versions=prd_versions)
+    # the shared registry is not used
+    assert SIAF_REGISTRY.stats()['keys'] == registry_keys
+
+    siafs = [get_cached_siaf('NIRISS', prd_version=prd_version) for prd_version in prd_versions]
+
+    for aperture_name in history.aperture_names:
+        present = [aperture_name in siaf.apertures for siaf in siafs]
+        statuses = [status for _, status, _ in history.aperture_history(aperture_name)]
+        assert statuses.count('added') == sum(
+            present[k] and (k == 0 or not present[k - 1]) for k in range(len(siafs)))
+
+        for attribute in ['V2Ref', 'V3IdlYAngle', 'XSciSize']:
+            changes = dict(history.attribute_history(aperture_name, attribute))
+            value = None
+            for prd_version, siaf in zip(prd_versions, siafs):
+                if aperture_name not in siaf.apertures:
+                    continue
+                value = changes.get(prd_version, value)
+                assert repr(value) == repr(getattr(siaf[aperture_name], attribute))
+
+    log = history.change_log()
+    assert log.colnames == ['prd_version', 'aperture', 'status', 'attribute', 'previous', 'value']
+    modified = log[log['status'] == 'modified']
+    for row in modified[0:20]:
+        assert row['attribute'] in dict(
+            (prd_version, attributes) for prd_version, _, attributes in
+            history.aperture_history(row['aperture']))[row['prd_version']]
+
+    assert history.digest('NIS_CEN', prd_versions[0]) != history.digest(
+        'NIS_CEN', prd_versions[-1])
+    assert history.digest('NIS_CEN', prd_versions[-1]) == siafs[-1]['NIS_CEN'].content_hash
+    with pytest.raises(KeyError):
+        history.aperture_history('NOT_AN_APERTURE')
+    with pytest.raises(ValueError):
+        PrdHistory('HST')
@@ -7,6 +7,9 @@ Authors
 
 """
 
+import numpy as np
+import pytest
+
 from ..aperture import HstAperture
 from ..iando import read
 from ..siaf import Siaf
@@ -30,3 +33,65 @@ def test_hst_amudotrep():
     amudotrep = read.read_hst_fgs_amudotrep()
     fgs_keys = [key for key in amudotrep if 'fgs' in key]
     assert len(fgs_keys) == 3
+
+
+def test_hst_fgs_tvs_matrix_cache():
+    """Test that the memoized FGS TVS matrix is reused and invalidated on attribute changes."""
+    hst_siaf = Siaf('HST')
+    fgs_aperture = hst_siaf['FGS1']
+
+    tvs = fgs_aperture.compute_tvs_matrix()
+    assert fgs_aperture.compute_tvs_matrix() is tvs
+    assert np.all(fgs_aperture.compute_tvs_matrix(transpose=True) == tvs.T)
+    assert np.allclose(tvs, fgs_aperture._compute_tvs_matrix(fgs_aperture.db_tvs_v2_arcsec,
+                                                             fgs_aperture.db_tvs_v3_arcsec,
+                                                             fgs_aperture.db_tvs_pa_deg))
+
+    # explicit override of the TVS parameters
+    tvs_offset = fgs_aperture.compute_tvs_matrix(v2_arcsec=fgs_aperture.db_tvs_v2_arcsec + 10.)
+    assert not np.allclose(tvs_offset, tvs)
+
+    # modifying the database parameters invalidates the cache
+    fgs_aperture.db_tvs_pa_deg += 0.1
+    assert not np.allclose(fgs_aperture.compute_tvs_matrix(), tvs)
+
+    # the cached matrices and the flip matrix cannot be modified in place
+    flip_reference = np.array(fgs_aperture.tvs_flip_matrix)
+    for array in [tvs, fgs_aperture.tvs_flip_matrix]:
+        with pytest.raises(ValueError):
+            array[0, 0] = 0.
+    flip = -np.array(fgs_aperture.tvs_flip_matrix)
+    fgs_aperture.tvs_flip_matrix = flip
+    tvs = fgs_aperture.compute_tvs_matrix()
+    flip[:] = 0
+    assert np.all(fgs_aperture.tvs_flip_matrix == -flip_reference)
+    assert fgs_aperture.compute_tvs_matrix() is tvs
+
+
+def test_hst_siaf_record_parsing():
+    """Test that the fixed-width records of the HST SIAF are parsed into aperture attributes."""
+    apertures = read.read_hst_siaf()
+
+    fgs_aperture = apertures['FGS1']
+    assert fgs_aperture.a_shape == 'PICK'
+    assert fgs_aperture.a_v2_ref == 725.58
+    assert fgs_aperture.pi_ext == 40.398
+
+    for aperture_name, aperture in apertures.items():
+        if hasattr(aperture, 'polynomial_coefficients'):
+            n_coefficients = int((aperture.ideg + 1) * (aperture.ideg + 2) / 2)
+            assert aperture.polynomial_coefficients.shape == (n_coefficients, 4)
+            assert aperture.Sci2IdlX00 == aperture.jwst_ordered_coefficients[0, 0]
+
+
+def test_hst_amudotrep_cached():
+    """Test that the cached amu.rep accessor reads each version only once."""
+    amudotrep = read.get_hst_fgs_amudotrep()
+    assert read.get_hst_fgs_amudotrep() is amudotrep
+    assert read.get_hst_fgs_amudotrep(version='1.09') is not amudotrep
+
+    amudotrep_uncached = read.read_hst_fgs_amudotrep()
+    for fgs_id in ['fgs1', 'fgs2', 'fgs3']:
+        assert np.all(amudotrep[fgs_id]['tvs'] == amudotrep_uncached[fgs_id]['tvs'])
+        assert len(amudotrep[fgs_id]['cone_parameters_fgs']) == 5
+        assert amudotrep[fgs_id]['cone_parameters_tel']['V3_PREV'].dtype.kind == 'f'
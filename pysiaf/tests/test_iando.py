@@ -66,3 +66,41 @@ def test_write_jwst_siaf_xlsx(tmpdir):
 
     # Remove temporary directory
     tmpdir.remove()
+
+
+def test_siaf_xml_field_format_module():
+    """Check that the precompiled field format agrees with the reference file."""
+    from .. import aperture
+    from ..iando import read
+    from ..siaf_xml_field_format import SIAF_XML_FIELDS
+
+    field_format = read.read_siaf_xml_field_format_reference_file()
+    assert [field[1] for field in SIAF_XML_FIELDS] == list(field_format['field_name'])
+    assert [field[2] for field in SIAF_XML_FIELDS] == list(field_format['format'])
+    for field, pyformat in zip(SIAF_XML_FIELDS, field_format['pyformat'].filled('')):
+        assert field[3] == pyformat
+
+    assert aperture.PRD_REQUIRED_ATTRIBUTES_ORDERED == list(field_format['field_name'])
+    assert list(aperture.SIAF_XML_FIELD_FORMAT['field_name']) == list(field_format['field_name'])
+
+
+def test_read_jwst_siaf_streaming():
+    """Check that the incremental reader returns all entries of a SIAF xml file."""
+    import lxml.etree as ET
+
+    from ..constants import JWST_PRD_DATA_ROOT
+    from ..iando import read
+
+    filename = os.path.join(JWST_PRD_DATA_ROOT, 'FGS_SIAF.xml')
+    tree = ET.parse(filename)
+    aperture_names = [entry.findtext('AperName') for entry in tree.getroot().iter('SiafEntry')]
+    assert read.get_jwst_siaf_instrument(tree) == 'FGS'
+
+    apertures = read.read_jwst_siaf(filename=filename)
+    assert list(apertures.keys()) == aperture_names
+    assert {aperture.InstrName for aperture in apertures.values()} == {'FGS'}
+
+    # processed entries are cleared
+    entries = list(read._iter_siaf_entries(filename))
+    assert len(entries) == len(aperture_names)
+    assert all(len(entry) == 0 for entry in entries)
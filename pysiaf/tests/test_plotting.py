@@ -13,6 +13,7 @@ import os
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as pl
+import numpy as np
 import pytest
 
 from ..constants import JWST_TEMPORARY_DATA_ROOT
@@ -68,3 +69,51 @@ def test_aperture_plotting():
         pl.savefig(fig_name, transparent=True, bbox_inches='tight', pad_inches=0.05)
 
     assert os.path.isfile(fig_name)
+
+
+def test_siaf_plot_batch():
+    """Compare the collection plot of a Siaf with the outlines of its apertures."""
+    siaf = Siaf('NIRISS')
+    pl.figure()
+    siaf.plot(frame='idl', color='k', lw=2, units='arcmin')
+    ax = pl.gca()
+    assert len(ax.lines) == 0
+    lines, fills = ax.collections
+    assert np.all(lines.get_linewidths() == 2)
+
+    apertures = [aperture for aperture in siaf.apertures.values()
+                 if aperture.AperType != 'TRANSFORM']
+    assert len(lines.get_segments()) == len(apertures)
+    for aperture, segment in zip(apertures, lines.get_segments()):
+        x, y = aperture.closed_polygon_points('idl', rederive=False)
+        assert np.allclose(segment, np.vstack((x, y)).T / 60.)
+
+    # unsupported keyword arguments fall back to plotting every aperture
+    siaf.plot(frame='idl', names=['NIS_CEN', 'NIS_AMI1'], marker='o', fill=False)
+    assert len(pl.gca().lines) == 2
+    pl.close('all')
+
+
+def test_detector_channels_and_frame_origins():
+    """Compare the batched channel and origin plots with the per-aperture plots."""
+    siaf = Siaf('NIRISS')
+    full_apertures = list(siaf._getFullApertures())
+
+    pl.figure()
+    siaf.plot_detector_channels(frame='tel')
+    siaf.plot_frame_origin(frame='tel', which=['det', 'sci'])
+    ax = pl.gca()
+    channels = ax.collections[0].get_paths()
+    det_origins, sci_origins = [line.get_xydata() for line in ax.lines]
+
+    pl.figure()
+    for aperture in full_apertures:
+        aperture.plot_detector_channels('tel')
+        aperture.plot_frame_origin('tel', which=['det', 'sci'])
+    ax = pl.gca()
+    assert len(channels) == len(ax.patches) == 4 * len(full_apertures)
+    for channel, patch in zip(channels, ax.patches):
+        assert np.allclose(channel.vertices[:4], patch.get_xy()[:4])
+    assert np.allclose(det_origins, [line.get_xydata()[0] for line in ax.lines[0::2]])
+    assert np.allclose(sci_origins, [line.get_xydata()[0] for line in ax.lines[1::2]])
+    pl.close('all')
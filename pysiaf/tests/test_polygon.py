@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Test the vectorized polygon functions.
+
+"""
+
+import numpy as np
+
+from ..siaf import Siaf
+from ..utils.polygon import intersect_polygons, polygon_area
+
+
+def test_intersect_polygons():
+    """Compare polygon intersections with analytic results and aperture outlines."""
+    square = np.array([[0., 0.], [2., 0.], [2., 2.], [0., 2.]])
+    # clockwise, shifted by one unit in x and y
+    shifted = square[::-1] + 1.
+    # rotated by 45 degrees about the centre of the square
+    diamond = np.array([[1., 1 - np.sqrt(2)], [1 + np.sqrt(2), 1.], [1., 1 + np.sqrt(2)],
+                        [1 - np.sqrt(2), 1.]])
+    far = square + 10.
+    missing = np.full((4, 2), np.nan)
+
+    polygons = np.array([square, shifted, diamond, far, missing])
+    intersections, areas = intersect_polygons(polygons[:1], polygons)
+    assert intersections.shape == (5, 8, 2)
+    assert np.allclose(areas, [4., 1., 4 * (np.sqrt(2) - 1) * 2, 0., 0.])
+    assert np.all(np.isnan(intersections[3:]))
+    assert np.sum(~np.isnan(intersections[2, :, 0])) == 8
+
+    # selected pairs and symmetry
+    _, pair_areas = intersect_polygons(polygons, polygons, pairs=[[1, 0], [2, 1], [1, 2]])
+    assert np.allclose(pair_areas[0], 1.)
+    assert np.isclose(pair_areas[1], pair_areas[2])
+
+    # subarrays are contained in their full frame apertures
+    siaf = Siaf('NIRCam')
+    names = list(siaf.apertures)
+    corners = siaf.corners('idl')
+    full = names.index('NRCA1_FULL')
+    subarray = names.index('NRCA1_SUB320')
+    _, areas = intersect_polygons(corners, corners, pairs=[[full, full], [full, subarray]])
+    assert np.isclose(areas[0], polygon_area(corners[full, :, 0], corners[full, :, 1]))
+    assert np.isclose(areas[1], polygon_area(corners[subarray, :, 0], corners[subarray, :, 1]))
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+"""Tests for the pysiaf siaf module.
+
+"""
+
+import concurrent.futures
+import copy
+
+from astropy import units as u
+from matplotlib.path import Path
+import numpy as np
+import pytest
+
+from ..constants import JWST_PRD_VERSION
+from ..utils import rotations
+from ..siaf import ApertureIndex, Siaf, SiafRegistry, get_cached_siaf, get_jwst_apertures, \
+    load_many
+
+
+def test_siaf_registry():
+    """Test memoization, eviction and statistics of the Siaf registry."""
+    registry = SiafRegistry(maxsize=2)
+
+    fgs_siaf = registry.get('FGS')
+    assert isinstance(fgs_siaf, Siaf)
+    assert registry.get('fgs') is fgs_siaf
+    assert registry.get('FGS', prd_version=JWST_PRD_VERSION) is fgs_siaf
+    stats = registry.stats()
+    assert (stats['hits'], stats['misses'], stats['currsize']) == (2, 1, 1)
+
+    niriss_siaf = registry.get('NIRISS')
+    registry.get('FGS')
+    registry.get('MIRI')
+    # NIRISS was the least recently used entry
+    assert registry.stats()['keys'] == [('fgs', JWST_PRD_VERSION, None),
+                                        ('miri', JWST_PRD_VERSION, None)]
+    assert registry.get('NIRISS') is not niriss_siaf
+
+    with pytest.raises(ValueError):
+        registry.get('HST', prd_version=JWST_PRD_VERSION)
+
+    registry.clear()
+    assert registry.stats()['currsize'] == 0
+    assert registry.stats()['hits'] == 0
+
+
+def test_get_jwst_apertures_are_independent():
+    """Apertures returned by get_jwst_apertures must not be shared with the cached Siaf."""
+    apertures_dict = {'instrument': ['FGS', 'FGS'], 'pattern': ['FGS1_FULL', 'FGS2_FULL']}
+    apertures = get_jwst_apertures(apertures_dict, exact_pattern_match=True)
+    assert list(apertures.apertures.keys()) == ['FGS1_FULL', 'FGS2_FULL']
+
+    aperture = apertures['FGS1_FULL']
+    aperture.V2Ref = 0.
+    assert get_cached_siaf('FGS')['FGS1_FULL'].V2Ref != 0.
+
+
+def test_load_many():
+    """Test loading of several SIAFs with the default executor, a given executor and sequentially."""
+    specs = ['FGS', ('NIRISS', JWST_PRD_VERSION), ('MIRI', None, None)]
+    siafs = load_many(specs)
+    assert list(siafs.keys()) == specs
+    for spec, siaf in siafs.items():
+        assert siaf.instrument == (spec if isinstance(spec, str) else spec[0]).lower()
+        assert len(siaf) == len(get_cached_siaf(siaf.instrument))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        siafs = load_many(['FGS'], executor=executor, compact=True)
+    assert siafs['FGS']['FGS1_FULL'].V2Ref == get_cached_siaf('FGS')['FGS1_FULL'].V2Ref
+
+    siafs = load_many(['FGS'], sequential=True)
+    assert len(siafs['FGS']) == len(get_cached_siaf('FGS'))
+
+    with pytest.raises(ValueError):
+        load_many([['FGS']])
+    with pytest.raises(ValueError):
+        load_many(['FGS'], executor=executor, sequential=True)
+
+
+def test_locate():
+    """Test the vectorized lookup of the apertures containing many positions."""
+    siaf = Siaf('Roman')
+    names = list(siaf.apernames)
+    v2 = []
+    v3 = []
+    expected = []
+    for aperture_name in ['WFI01_FULL', 'WFI10_FULL', 'WFI18_FULL']:
+        aperture = siaf[aperture_name]
+        x_sci = np.array([10., aperture.XSciRef, aperture.XSciSize - 10.])
+        y_sci = np.array([20., aperture.YSciRef, aperture.YSciSize - 20.])
+        v2_aperture, v3_aperture = aperture.sci_to_tel(x_sci, y_sci)
+        v2.extend(v2_aperture)
+        v3.extend(v3_aperture)
+        expected.extend([names.index(aperture_name)] * 3)
+    # a point outside of all detectors
+    v2.append(0.)
+    v3.append(0.)
+    expected.append(-1)
+
+    aperture_index, x_sci, y_sci = siaf.locate(np.array(v2), np.array(v3))
+    assert aperture_index.tolist() == expected
+    assert np.isnan(x_sci[-1]) and np.isnan(y_sci[-1])
+    for k in range(len(expected) - 1):
+        aperture = siaf[names[aperture_index[k]]]
+        assert np.allclose(aperture.sci_to_tel(x_sci[k], y_sci[k]), (v2[k], v3[k]))
+
+    # compare with the matplotlib path of each aperture
+    v2 = np.linspace(-2500., 2500., 101)
+    v3 = np.linspace(-3000., -500., 101)
+    v2, v3 = np.meshgrid(v2, v3)
+    aperture_index, x_sci, y_sci = siaf.locate(v2, v3, aperture_types='FULLSCA')
+    assert aperture_index.shape == v2.shape
+    for aperture_name in ['WFI01_FULL', 'WFI10_FULL']:
+        inside = siaf[aperture_name].path('tel').contains_points(np.c_[v2.flat, v3.flat])
+        assert np.all(inside == (aperture_index.flat == names.index(aperture_name)))
+
+    # sky coordinates with an explicit attitude
+    attitude = rotations.attitude(0., -1000., 30., -60., 15.)
+    ra, dec = rotations.tel_to_sky(attitude, v2.ravel() * u.arcsec, v3.ravel() * u.arcsec)
+    sky_index = siaf.locate(ra.to(u.deg).value, dec.to(u.deg).value, frame='sky',
+                            attitude=attitude)[0]
+    # points on the outlines can fall on either side after the round trip
+    assert np.mean(sky_index == aperture_index.ravel()) > 0.99
+
+    with pytest.raises(ValueError):
+        siaf.locate(0., 0., frame='idl')
+    with pytest.raises(ValueError):
+        siaf.locate(30., -60., frame='sky')
+
+
+def test_aperture_index():
+    """Test point, box and polygon queries of the spatial index and its invalidation."""
+    siafs = [Siaf('FGS'), Siaf('NIRISS')]
+    index = ApertureIndex(siafs)
+    assert 'NIRISS_FULL' not in index.names  # TRANSFORM aperture
+    assert len(index) == len(index.names)
+
+    aperture = siafs[0]['FGS1_FULL']
+    v2, v3 = aperture.reference_point('tel')
+    candidates = index.query_point(v2, v3)
+    names = index.query_point(v2, v3, exact=True)
+    assert 'FGS1_FULL' in names
+    assert set(names) <= set(candidates)
+    assert not any(name.startswith('NIS') for name in names)
+    for name in candidates:
+        outline = index.outlines[index.names.index(name)]
+        inside = Path(np.array(outline).T).contains_point((v2, v3))
+        assert inside == (name in names)
+
+    v2_corners, v3_corners = aperture.corners('tel')
+    names = index.query_box(v2_corners.min(), v2_corners.max(), v3_corners.min(),
+                            v3_corners.max(), exact=True)
+    assert 'FGS1_FULL' in names and 'FGS2_FULL' not in names
+    assert index.query_polygon(v2_corners, v3_corners, exact=True) == names
+    assert index.query_point(1e5, 1e5) == []
+
+    # changes to apertures that are not indexed do not invalidate the index
+    outlines = index.outlines
+    scratch_aperture = copy.deepcopy(aperture)
+    scratch_aperture.V2Ref += 1e4
+    index.query_point(v2, v3)
+    assert index.outlines is outlines
+
+    # the index is rebuilt when the geometry of an aperture changes
+    aperture.V2Ref += 1e4
+    assert 'FGS1_FULL' not in index.query_point(v2, v3, exact=True)
+    assert 'FGS1_FULL' in index.query_point(v2 + 1e4, v3, exact=True)
+
+    # and when apertures are removed
+    siafs[0].delete_aperture(['FGS1_FULL'])
+    assert 'FGS1_FULL' not in index.query_point(v2 + 1e4, v3)
+    assert 'FGS1_FULL' not in index.names
+
+    assert siafs[1].spatial_index() is siafs[1].spatial_index()
+
+
+def test_project_catalog():
+    """Compare the catalog projection with the per-aperture sky_to_sci transformation."""
+    siaf = Siaf('NIRISS')
+    attitude = rotations.attitude(-290., -700., 80., -30., 20.)
+    rng = np.random.default_rng(0)
+    ra = 80. + rng.uniform(-0.1, 0.1, 20000)
+    dec = -30. + rng.uniform(-0.1, 0.1, 20000)
+
+    table = siaf.project_catalog(ra, dec, attitude, chunk_size=3000)
+    assert table.colnames == ['source_index', 'aperture', 'x_sci', 'y_sci']
+    assert np.all(np.diff(table['source_index']) >= 0)
+
+    aperture = copy.deepcopy(siaf['NIS_CEN'])
+    aperture.set_attitude_matrix(attitude)
+    x_sci, y_sci = aperture.sky_to_sci(ra, dec)
+    inside = aperture.path('tel').contains_points(np.array(aperture.sky_to_tel(ra, dec)).T)
+    assert np.sum(inside) > 0
+    rows = table[table['aperture'] == 'NIS_CEN']
+    assert np.all(rows['source_index'] == np.flatnonzero(inside))
+    assert np.allclose(rows['x_sci'], x_sci[inside])
+    assert np.allclose(rows['y_sci'], y_sci[inside])
+
+    # sources far from the pointing are culled
+    assert len(siaf.project_catalog(ra + 180., dec, attitude)) == 0
+
+
+def test_project_catalog_overlapping_apertures():
+    """Check that sources in overlapping apertures are projected into all of them."""
+    siaf = Siaf('NIRCam')
+    v2, v3 = siaf['NRCA5_FULL'].reference_point('tel')
+    attitude = rotations.attitude(v2, v3, 80., -30., 20.)
+    rng = np.random.default_rng(0)
+    ra = 80. + rng.uniform(-0.05, 0.05, 20000)
+    dec = -30. + rng.uniform(-0.05, 0.05, 20000)
+
+    table = siaf.project_catalog(ra, dec, attitude, chunk_size=7000)
+    for aperture_name in ['NRCA5_FULL', 'NRCA1_FULL', 'NRCA3_FULL']:
+        aperture = copy.deepcopy(siaf[aperture_name])
+        aperture.set_attitude_matrix(attitude)
+        inside = aperture.path('tel').contains_points(np.array(aperture.sky_to_tel(ra, dec)).T)
+        assert np.sum(inside) > 0
+        rows = table[table['aperture'] == aperture_name]
+        assert np.all(rows['source_index'] == np.flatnonzero(inside))
+        x_sci, y_sci = aperture.sky_to_sci(ra[inside], dec[inside])
+        assert np.allclose(rows['x_sci'], x_sci)
+        assert np.allclose(rows['y_sci'], y_sci)
+
+    # most sources on a short wavelength detector are also in the long wavelength detector
+    long_wavelength = set(table['source_index'][table['aperture'] == 'NRCA5_FULL'])
+    short_wavelength = set(table['source_index'][table['aperture'] == 'NRCA1_FULL'])
+    assert len(short_wavelength & long_wavelength) > 0.5 * len(short_wavelength)
+
+
+def test_corners():
+    """Compare the collection corners with the memoized per-aperture corners."""
+    siaf = Siaf('NIRCam')
+    for frame in ['sci', 'idl', 'tel', 'det']:
+        for rederive in [True, False]:
+            corners = siaf.corners(frame, rederive=rederive)
+            assert corners.shape == (len(siaf), 4, 2)
+            for k, aperture in enumerate(siaf.apertures.values()):
+                if (frame in ['sci', 'det']) and (aperture.XSciSize is None):
+                    assert np.all(np.isnan(corners[k]))
+                    continue
+                x, y = aperture.corners(frame,
+                                        rederive=rederive and (aperture.XSciSize is not None))
+                assert np.allclose(corners[k, :, 0], x, atol=1e-9)
+                assert np.allclose(corners[k, :, 1], y, atol=1e-9)
+    assert np.array_equal(siaf.corners('sci'), siaf.corners('sci', rederive=False), equal_nan=True)
+
+    # HST quadrilaterals, including the FGS apertures transformed with the TVS matrix
+    siaf = Siaf('HST')
+    for frame in ['idl', 'tel']:
+        corners = siaf.corners(frame)
+        for k, aperture in enumerate(siaf.apertures.values()):
+            if getattr(aperture, 'a_shape', None) == 'QUAD':
+                x, y = aperture.corners(frame)
+                assert np.allclose(corners[k], np.vstack((x, y)).T, atol=1e-9)
+    siaf = Siaf('NIRCam')
+
+    with pytest.raises(ValueError):
+        siaf.corners('sky')
+
+    # memoized corners are copies and follow geometry changes
+    aperture = siaf['NRCA1_FULL']
+    x, y = aperture.corners('tel')
+    x[0] = np.nan
+    assert not np.isnan(aperture.corners('tel')[0][0])
+    aperture.V2Ref += 10.
+    x_shifted, y_shifted = aperture.corners('tel')
+    assert np.allclose(x_shifted[1:], x[1:] + 10.)
+    assert np.allclose(y_shifted, y)
+    assert np.allclose(siaf.corners('tel')[list(siaf.apertures).index('NRCA1_FULL'), :, 0],
+                       x_shifted)
+
+
+def test_nirspec_slit_corners():
+    """Check the corners of NIRSpec slits, which are computed with their parent apertures."""
+    siaf = Siaf('NIRSpec')
+    names = list(siaf.apertures)
+    for frame in ['sci', 'det', 'tel']:
+        corners = siaf.corners(frame)
+        for name in ['NRS_S200A1_SLIT', 'NRS_S1600A1_SLIT', 'NRS1_FULL']:
+            x, y = siaf[name].corners(frame)
+            assert np.allclose(corners[names.index(name)], np.vstack((x, y)).T)
+    # slits without usable parent aperture
+    assert np.all(np.isnan(siaf.corners('sci')[names.index('NRS_FULL_MSA')]))
+
+    # the memoized corners follow changes of the parent aperture
+    aperture = siaf['NRS_S1600A1_SLIT']
+    x_sci, y_sci = aperture.corners('sci')
+    siaf['NRS1_FULL'].XSciRef += 10.
+    x_shifted, y_shifted = aperture.corners('sci')
+    assert not np.allclose(x_shifted, x_sci)
+    assert np.allclose(siaf.corners('sci')[names.index('NRS_S1600A1_SLIT'), :, 0], x_shifted)
+
+
+def test_linear_parameters():
+    """Compare the vectorized linear parameters with the per-aperture evaluation."""
+    siaf = Siaf('NIRISS')
+    table = siaf.linear_parameters()
+    assert len(table) == len([aperture for aperture in siaf.apertures.values()
+                              if aperture.Sci2IdlDeg is not None])
+    for row in table:
+        parameters = siaf[row['AperName']].get_polynomial_linear_parameters()
+        for key, value in parameters.items():
+            assert np.isclose(row[key], value, equal_nan=True)
+
+    aperture = siaf['NIS_CEN']
+    x_sci = np.linspace(1, aperture.XSciSize, 7)
+    y_sci = np.linspace(1, aperture.YSciSize, 5)[:, np.newaxis]
+    parameter_maps = aperture.get_polynomial_linear_parameters_at(x_sci, y_sci)
+    assert parameter_maps['scale_x'].shape == (5, 7)
+    for i, j in [(0, 0), (2, 3), (4, 6)]:
+        parameters = aperture.get_polynomial_linear_parameters(location={'x': x_sci[j],
+                                                                         'y': y_sci[i, 0]})
+        for key, value in parameters.items():
+            assert np.isclose(parameter_maps[key][i, j], value)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Tests for the pysiaf specpars module (Roman).
+
+"""
+
+import numpy as np
+
+from ..siaf import Siaf
+from ..specpars import get_distortion_coeffs, _read_distortion_coefficients
+
+
+def test_get_distortion_coeffs():
+    """Check the Roman distortion coefficients against the apertures of the Roman SIAF."""
+    _read_distortion_coefficients.cache_clear()
+    siaf = Siaf('Roman')
+    for aperture_name in ['WFI01_FULL', 'WFI18_FULL']:
+        aperture = siaf[aperture_name]
+        for inverse, seed in [(False, 'Sci2Idl'), (True, 'Idl2Sci')]:
+            x_coeffs, y_coeffs = get_distortion_coeffs(aperture_name, inverse=inverse)
+            assert len(x_coeffs) == len(y_coeffs) == 21
+            for i in range(6):
+                for j in range(i + 1):
+                    key = 'c{}_{}'.format(i - j, j)
+                    assert x_coeffs[key] == getattr(aperture, '{}X{}{}'.format(seed, i, j))
+                    assert y_coeffs[key] == getattr(aperture, '{}Y{}{}'.format(seed, i, j))
+
+    # unknown apertures have no coefficients
+    assert get_distortion_coeffs('NOT_AN_APERTURE') == ({}, {})
+
+    # the file is parsed only once
+    assert _read_distortion_coefficients.cache_info().misses == 1
+
+
+def test_spec_pars_trace():
+    """Check the vectorized trace evaluation of the Roman grism and prism parameters."""
+    siaf = Siaf('Roman')
+    spec_pars = siaf['WFI01_FULL'].SpecPars
+    assert [sp.mode for sp in spec_pars] == ['Grism', 'Prism']
+    assert siaf['WFI_CEN'].SpecPars is None
+
+    for sp in spec_pars:
+        assert len(sp.position) == sp.grid_x * sp.grid_y
+
+        # at the grid position centers the tabulated offsets are recovered
+        x_center = (sp.x_min + sp.x_max) / 2.
+        y_center = (sp.y_min + sp.y_max) / 2.
+        x_blue, y_blue = sp.trace(x_center, y_center, sp.blue_wave)
+        x_red, y_red = sp.trace(x_center, y_center, sp.red_wave)
+        np.testing.assert_allclose(x_blue - x_center, sp.blue_x)
+        np.testing.assert_allclose(y_blue - y_center, sp.blue_y)
+        np.testing.assert_allclose(x_red - x_center, sp.red_x)
+        np.testing.assert_allclose(y_red - y_center, sp.red_y)
+
+        # batch evaluation matches element-wise evaluation
+        x_sci = np.array([-1000., 10., 2044.5, 4000.])
+        y_sci = np.array([100., 3000., 2044.5, 5000.])
+        wavelength = np.linspace(sp.blue_wave.min(), sp.red_wave.max(), 4)
+        x_trace, y_trace = sp.trace(x_sci, y_sci, wavelength)
+        assert x_trace.shape == y_trace.shape == (4,)
+        for k in range(4):
+            x, y = sp.trace(x_sci[k], y_sci[k], wavelength[k])
+            assert np.isclose(x, x_trace[k]) and np.isclose(y, y_trace[k])
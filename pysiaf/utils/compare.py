@@ -18,14 +18,14 @@ import os
 import sys
 
 
-from astropy.table import vstack, Table
+from astropy.table import Table
 import numpy as np
 import matplotlib.pyplot as pl
 
 from ..constants import JWST_PRD_VERSION
 from ..iando.read import get_siaf, read_siaf_aperture_definitions
-from ..siaf import Siaf
-from ..aperture import Aperture
+from ..siaf import get_cached_siaf
+from ..aperture import Aperture, PRD_REQUIRED_ATTRIBUTES_ORDERED
 from ..utils import tools
 from ..aperture import compare_apertures
 
@@ -76,7 +76,7 @@ def compare_siaf(comparison_siaf_input, fractional_tolerance=1e-4, reference_sia
         print(instrument)
 
     if reference_siaf_input is None:
-        reference_siaf = Siaf(instrument)
+        reference_siaf = get_cached_siaf(instrument)
         reference_siaf_description = '{}-{}'.format(instrument, JWST_PRD_VERSION)
     else:
         reference_siaf = get_siaf(reference_siaf_input)
@@ -152,7 +152,6 @@ def compare_siaf(comparison_siaf_input, fractional_tolerance=1e-4, reference_sia
     print('{:25} {:>15} {:>21} {:>21} {:>15} {:>10}'.format('Aperture', 'Attribute', 'Reference',
                                                             'Comparison', 'Difference', 'Percent'),
           file=print_file)
-    report_table = None
 
     # sort SIAF entries in the order of the aperture definition file
     siaf_aperture_definitions = read_siaf_aperture_definitions(instrument)
@@ -160,18 +159,14 @@ def compare_siaf(comparison_siaf_input, fractional_tolerance=1e-4, reference_sia
     modified_apertures = OrderedDict(
         sorted(modified_apertures.items(), key=lambda t: aperture_name_list.index(t[0])))
 
-    for aperture_name in modified_apertures.keys():
-        if (selected_aperture_name is not None) and (aperture_name not in list(selected_aperture_name)):
-            continue
-        comparison_table = compare_apertures(reference_siaf[aperture_name],
-                                             comparison_siaf[aperture_name],
-                                             fractional_tolerance=fractional_tolerance,
-                                             print_file=print_file, verbose=False,
-                                             ignore_attributes=ignore_attributes)
-        if report_table is None:
-            report_table = comparison_table.copy()
-        else:
-            report_table = vstack((report_table, comparison_table))
+    aperture_names = [aperture_name for aperture_name in modified_apertures.keys()
+                      if (selected_aperture_name is None) or
+                      (aperture_name in list(selected_aperture_name))]
+    report_table = compare_siaf_attributes(reference_siaf, comparison_siaf,
+                                           aperture_names=aperture_names,
+                                           fractional_tolerance=fractional_tolerance,
+                                           ignore_attributes=ignore_attributes)
+    _print_difference_table(report_table, print_file)
 
     if report_file is not None:
         print_file.close()
@@ -208,14 +203,133 @@ def compare_siaf(comparison_siaf_input, fractional_tolerance=1e-4, reference_sia
                                dpi=300)
 
 
+def compare_siaf_attributes(reference_siaf, comparison_siaf, aperture_names=None,
+                            fractional_tolerance=1e-6, absolute_tolerance=None,
+                            attribute_list=None, ignore_attributes=None):
+    """Return the significant attribute differences between two SIAFs as one table.
+
+    Columnar equivalent of calling aperture.compare_apertures for every aperture. The
+    apertures are aligned by AperName, every attribute is compared for all apertures at once,
+    and the table is built once from the significant differences.
+
+    Parameters
+    ----------
+    reference_siaf : pysiaf.Siaf or ApertureCollection
+        The reference SIAF
+    comparison_siaf : pysiaf.Siaf or ApertureCollection
+        The SIAF that is compared to the reference
+    aperture_names : list of str
+        Apertures to compare, in the order of the returned rows. Defaults to the apertures
+        present in both SIAFs, in the order of the reference.
+    fractional_tolerance : float
+        Numeric differences are significant if their fraction of the larger absolute value
+        exceeds this value
+    absolute_tolerance : float
+        If set, numeric differences within this value are not significant
+    attribute_list : list of str
+        Attributes to compare, defaults to PRD_REQUIRED_ATTRIBUTES_ORDERED
+    ignore_attributes : list of str
+        Attributes that are not compared
+
+    Returns
+    -------
+    comparison_table : astropy.table.Table
+        Columns aperture, attribute, reference, comparison, difference, and percent, one row per
+        significant difference
+
+    """
+    if attribute_list is None:
+        attribute_list = PRD_REQUIRED_ATTRIBUTES_ORDERED
+    if ignore_attributes is not None:
+        attribute_list = [attribute for attribute in attribute_list
+                          if attribute not in list(ignore_attributes)]
+    if aperture_names is None:
+        aperture_names = [aperture_name for aperture_name in reference_siaf.apertures
+                          if aperture_name in comparison_siaf.apertures]
+
+    reference_apertures = [reference_siaf[aperture_name] for aperture_name in aperture_names]
+    comparison_apertures = [comparison_siaf[aperture_name] for aperture_name in aperture_names]
+    if set(attribute_list) <= set(PRD_REQUIRED_ATTRIBUTES_ORDERED):
+        # apertures with equal content hash have no differences
+        changed = [k for k in range(len(aperture_names))
+                   if reference_apertures[k] != comparison_apertures[k]]
+        aperture_names = [aperture_names[k] for k in changed]
+        reference_apertures = [reference_apertures[k] for k in changed]
+        comparison_apertures = [comparison_apertures[k] for k in changed]
+    number_of_apertures = len(aperture_names)
+
+    # attribute values as (attribute, aperture) object arrays
+    reference_values = np.empty((len(attribute_list), number_of_apertures), dtype=object)
+    comparison_values = np.empty((len(attribute_list), number_of_apertures), dtype=object)
+    for j, attribute in enumerate(attribute_list):
+        reference_values[j] = [getattr(aperture, attribute) for aperture in reference_apertures]
+        comparison_values[j] = [getattr(aperture, attribute) for aperture in comparison_apertures]
+
+    numeric_types = (int, float, np.float64)
+    numeric = np.vectorize(lambda value: type(value) in numeric_types, otypes=[bool])
+    both_numeric = np.zeros(reference_values.shape, dtype=bool)
+    if reference_values.size != 0:
+        both_numeric = numeric(reference_values) & numeric(comparison_values)
+    show = reference_values != comparison_values
+
+    reference_numbers = np.where(both_numeric, reference_values, np.nan).astype(float)
+    comparison_numbers = np.where(both_numeric, comparison_values, np.nan).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        difference = np.abs(comparison_numbers - reference_numbers)
+        fractional_difference = difference / np.maximum(np.abs(reference_numbers),
+                                                        np.abs(comparison_numbers))
+        insignificant = fractional_difference <= fractional_tolerance
+        if absolute_tolerance is not None:
+            # same criterion as math.isclose with the default relative tolerance
+            insignificant |= difference <= np.maximum(
+                1e-9 * np.maximum(np.abs(reference_numbers), np.abs(comparison_numbers)),
+                absolute_tolerance)
+    show &= ~(both_numeric & insignificant)
+
+    # rows ordered by aperture, then by attribute
+    aperture_index, attribute_index = np.nonzero(show.T)
+    rows = []
+    for k, j in zip(aperture_index, attribute_index):
+        if both_numeric[j, k]:
+            difference_string = '{:.6f}'.format(difference[j, k])
+            fractional_difference_percent_string = '{:.4f}'.format(
+                fractional_difference[j, k] * 100.)
+        else:
+            difference_string = 'N/A'
+            fractional_difference_percent_string = 'N/A'
+        rows.append((aperture_names[k], attribute_list[j], str(reference_values[j, k]),
+                     str(comparison_values[j, k]), difference_string,
+                     fractional_difference_percent_string))
+
+    names = ('aperture', 'attribute', 'reference', 'comparison', 'difference', 'percent')
+    if len(rows) == 0:
+        return Table(names=names, dtype=['S50'] * 6)
+    return Table(rows=rows, names=names, dtype=['S50'] * 6)
+
+
+def _print_difference_table(comparison_table, print_file):
+    """Print a difference table in the format of aperture.compare_apertures."""
+    columns = [comparison_table[name].astype(str).tolist() for name in comparison_table.colnames]
+    aperture_names = columns[0]
+    for k, row in enumerate(zip(*columns)):
+        print('{:25} {:>15} {:>21} {:>21} {:>15} {:>10}'.format(*row), file=print_file)
+        if (k == len(aperture_names) - 1) or (aperture_names[k + 1] != aperture_names[k]):
+            print('', file=print_file)
+
+
 def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance=1e-4,
                                      reference_siaf_input=None, report_file=None, report_dir=None,
                                      verbose=True, make_figures=False, selected_aperture_name=None,
                                      skipped_aperture_type=None,
-                                     instrument=None, make_plot=False, tags=None):
+                                     instrument=None, make_plot=False, tags=None, executor=None,
+                                     chunk_size=100):
     """Compare the forward-backward roundtrip transformations of two SIAF files.
     and write a difference file.
-    
+
+    The roundtrip errors are computed with stacked coefficient arrays of many apertures at
+    once, see tools.compute_roundtrip_errors. No figures are created unless make_plot is set
+    or report_dir is given.
+
     Parameters
     ----------
     comparison_siaf_input : str (absolute file name) or pysiaf.Siaf object
@@ -234,8 +348,13 @@ def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance
     skipped_aperture_type : str or list
         aperture type(s) not to include in plot
     instrument
-    make_plot
-    
+    make_plot : bool
+        Plot the roundtrip errors of every aperture, see plot_roundtrip_errors
+    executor : concurrent.futures.Executor
+        If given, chunks of apertures are evaluated concurrently by the executor
+    chunk_size : int
+        Number of apertures per executor task
+
     Returns
     -------
     roundtrip_table : astropy.table.Table object
@@ -249,7 +368,7 @@ def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance
         print(instrument)
 
     if reference_siaf_input is None:
-        reference_siaf = Siaf(instrument)
+        reference_siaf = get_cached_siaf(instrument)
         reference_siaf_description = '{}-{}'.format(instrument, JWST_PRD_VERSION)
     else:
         reference_siaf = get_siaf(reference_siaf_input)
@@ -285,60 +404,27 @@ def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance
     roundtrip_dict = OrderedDict()
     round_trip_tags = 'metric dx_mean dy_mean dx_rms dy_rms'.split()
 
-    for key in 'AperName'.split() + ['siaf{}_{}'.format(j, tag) for j in range(len(siaf_list)) for
-                                     tag in round_trip_tags]:
-        roundtrip_dict[key] = []
-
-    # index 0 is for reference SIAF (defaults to PRD)
-    # index 1 is for comparison SIAF
+    # apertures with distortion coefficients in both SIAFs
+    aperture_names = []
     for AperName, aperture in reference_siaf.apertures.items():
-        pl.ion()
-        pl.close('all')
         if (selected_aperture_name is not None) and (AperName not in list(selected_aperture_name)):
             continue
         if (skipped_aperture_type is not None) and (aperture.AperType in list(skipped_aperture_type)):
             continue
         if AperName not in comparison_siaf.apertures: # skip removed apertures
             continue
-        for j, siaf in enumerate(siaf_list):
-            aperture = siaf[AperName]
-            coefficients = aperture.get_polynomial_coefficients()
-            if (coefficients is not None) and (coefficients['Sci2IdlX'][0] is not None):
-                if AperName not in roundtrip_dict['AperName']:
-                    roundtrip_dict['AperName'].append(AperName)
-                roundtrip_errors = tools.compute_roundtrip_error(coefficients['Sci2IdlX'],
-                                                                 coefficients['Sci2IdlY'],
-                                                                 coefficients['Idl2SciX'],
-                                                                 coefficients['Idl2SciY'],
-                                                                 offset_x=aperture.XSciRef,
-                                                                 offset_y=aperture.YSciRef,
-                                                                 instrument=instrument,
-                                                                 grid_amplitude=aperture.XSciSize)
-                for k, tag in enumerate(round_trip_tags):
-                    # if tag != 'data':
-                    roundtrip_dict['siaf{}_{}'.format(j, tag)].append(roundtrip_errors[k])
-
-                if make_plot:
-                    data = roundtrip_errors[-1]
-                    pl.figure(figsize=(6, 6), facecolor='w', edgecolor='k')
-                    pl.quiver(data['x'], data['y'], data['x']-data['x2'], data['y']-data['y2'],
-                              angles='xy')
-                    pl.xlabel('x_sci')
-                    pl.ylabel('y_sci')
-                    aperture.plot(frame='sci', ax=pl.gca())
-                    ax = pl.gca()
-                    pl.text(0.5, 0.9, 'Maximum arrow length {:3.3f} pix'.format(
-                        np.max(np.linalg.norm([data['x']-data['x2'], data['y']-data['y2']],
-                                              axis=0))), horizontalalignment='center',
-                            transform=ax.transAxes)
-                    pl.title('siaf{}: {} Roundtrip error sci->idl->sci'.format(j, AperName))
-
-                    outdir = show_save_plot(report_dir=report_dir)
-
-                    if outdir is not None:
-                        figure_name = os.path.join(outdir, '{}_{}_siaf{}_roundtrip_error.pdf'.
-                                                   format(instrument, AperName, j)).replace(' ', '_')
-                        pl.savefig(figure_name, transparent=True, bbox_inches='tight', pad_inches=0)
+        if all(_has_distortion_coefficients(siaf[AperName]) for siaf in siaf_list):
+            aperture_names.append(AperName)
+    roundtrip_dict['AperName'] = aperture_names
+
+    # index 0 is for reference SIAF (defaults to PRD)
+    # index 1 is for comparison SIAF
+    for j, siaf in enumerate(siaf_list):
+        roundtrip_errors = _roundtrip_errors([siaf[AperName] for AperName in aperture_names],
+                                             instrument, executor=executor,
+                                             chunk_size=chunk_size)
+        for k, tag in enumerate(round_trip_tags):
+            roundtrip_dict['siaf{}_{}'.format(j, tag)] = roundtrip_errors[k]
 
     roundtrip_table = Table(roundtrip_dict)
     for k, tag in enumerate(round_trip_tags):
@@ -359,6 +445,10 @@ def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance
     roundtrip_table[bad_index].pprint()
     # roundtrip_table.write()
 
+    if make_plot:
+        plot_roundtrip_errors(roundtrip_table, reference_siaf, comparison_siaf,
+                              report_dir=report_dir)
+
     if report_dir is not None:
         # pl.close('all')
 
@@ -393,6 +483,88 @@ def compare_transformation_roundtrip(comparison_siaf_input, fractional_tolerance
     return roundtrip_table
 
 
+def plot_roundtrip_errors(roundtrip_table, reference_siaf, comparison_siaf, report_dir=None):
+    """Plot the roundtrip errors of the apertures in a roundtrip table.
+
+    Post-processing step of compare_transformation_roundtrip, the roundtrip errors of the
+    apertures in the table are recomputed and shown as quiver plots, one figure per aperture
+    and SIAF.
+
+    Parameters
+    ----------
+    roundtrip_table : astropy.table.Table
+        table returned by compare_transformation_roundtrip
+    reference_siaf : pysiaf.Siaf
+        SIAF with index 0 in the table
+    comparison_siaf : pysiaf.Siaf
+        SIAF with index 1 in the table
+    report_dir : str
+        Directory of the saved figures
+
+    """
+    instrument = comparison_siaf.instrument
+    aperture_names = [str(AperName) for AperName in roundtrip_table['AperName']]
+    for j, siaf in enumerate([reference_siaf, comparison_siaf]):
+        apertures = [siaf[AperName] for AperName in aperture_names]
+        data = _roundtrip_errors(apertures, instrument)[-1]
+        for k, aperture in enumerate(apertures):
+            AperName = aperture.AperName
+            pl.figure(figsize=(6, 6), facecolor='w', edgecolor='k')
+            pl.quiver(data['x'][k], data['y'][k], data['x'][k]-data['x2'][k],
+                      data['y'][k]-data['y2'][k], angles='xy')
+            pl.xlabel('x_sci')
+            pl.ylabel('y_sci')
+            aperture.plot(frame='sci', ax=pl.gca())
+            ax = pl.gca()
+            pl.text(0.5, 0.9, 'Maximum arrow length {:3.3f} pix'.format(
+                np.max(np.linalg.norm([data['x'][k]-data['x2'][k], data['y'][k]-data['y2'][k]],
+                                      axis=0))), horizontalalignment='center',
+                    transform=ax.transAxes)
+            pl.title('siaf{}: {} Roundtrip error sci->idl->sci'.format(j, AperName))
+
+            outdir = show_save_plot(report_dir=report_dir)
+
+            if outdir is not None:
+                figure_name = os.path.join(outdir, '{}_{}_siaf{}_roundtrip_error.pdf'.
+                                           format(instrument, AperName, j)).replace(' ', '_')
+                pl.savefig(figure_name, transparent=True, bbox_inches='tight', pad_inches=0)
+
+
+def _has_distortion_coefficients(aperture):
+    """Return whether an aperture defines the sci/idl distortion polynomials."""
+    coefficients = aperture.get_polynomial_coefficients()
+    return (coefficients is not None) and (not np.isnan(coefficients['Sci2IdlX'][0]))
+
+
+def _roundtrip_errors(apertures, instrument, executor=None, chunk_size=100):
+    """Return the stacked roundtrip errors of apertures, see tools.compute_roundtrip_errors.
+
+    With an executor, chunks of chunk_size apertures are evaluated concurrently.
+
+    """
+    if executor is not None and len(apertures) > chunk_size:
+        chunks = [apertures[k:k + chunk_size] for k in range(0, len(apertures), chunk_size)]
+        futures = [executor.submit(_roundtrip_errors, chunk, instrument) for chunk in chunks]
+        results = [future.result() for future in futures]
+        data = {key: np.concatenate([result[-1][key] for result in results])
+                for key in results[0][-1]}
+        return tuple(np.concatenate([result[k] for result in results]) for k in range(5)) + \
+            (data,)
+
+    if len(apertures) == 0:
+        return tuple(np.zeros(0) for k in range(5)) + \
+            ({key: np.zeros((0, 100)) for key in ['x', 'y', 'x2', 'y2']},)
+
+    coefficients = [aperture.get_polynomial_coefficients() for aperture in apertures]
+    return tools.compute_roundtrip_errors(
+        *[[aperture_coefficients[name] for aperture_coefficients in coefficients]
+          for name in ['Sci2IdlX', 'Sci2IdlY', 'Idl2SciX', 'Idl2SciY']],
+        offset_x=[aperture.XSciRef for aperture in apertures],
+        offset_y=[aperture.YSciRef for aperture in apertures], instrument=instrument,
+        grid_amplitude=[np.nan if aperture.XSciSize is None else aperture.XSciSize
+                        for aperture in apertures])
+
+
 def dict_compare(dictionary_1, dictionary_2):
     """Compare two dictionaries and return keys of the differing items.
     From https://stackoverflow.com/questions/4527942/comparing-two-dictionaries-in-python/4527957
@@ -417,16 +589,14 @@ def dict_compare(dictionary_1, dictionary_2):
     added = d1_keys - d2_keys
     removed = d2_keys - d1_keys
     modified = {}
+    same = set()
     for o in intersect_keys:
-        for key in dictionary_1[o].__dict__.keys():
-            if isinstance(dictionary_1[o].__dict__[key], Aperture) and isinstance(dictionary_2[o].__dict__[key], Aperture):
-                # No need to compare apertures a second time since they're part of original dictionary_1/2
-                continue
-            else:
-                if dictionary_1[o].__dict__[key] != dictionary_2[o].__dict__[key]:
-                    modified[o] = (dictionary_1[o], dictionary_2[o])
+        # apertures are compared by their content hash
+        if dictionary_1[o] == dictionary_2[o]:
+            same.add(o)
+        else:
+            modified[o] = (dictionary_1[o], dictionary_2[o])
 
-    same = set(o for o in intersect_keys if dictionary_1[o].__dict__ == dictionary_2[o].__dict__)
     return added, removed, modified, same
 
 
@@ -460,7 +630,7 @@ def compare_inspection_figures(comparison_siaf_input, reference_siaf_input=None,
     instrument = comparison_siaf.instrument
 
     if reference_siaf_input is None:
-        reference_siaf = Siaf(instrument)
+        reference_siaf = get_cached_siaf(instrument)
         reference_siaf_description = '{}-{}'.format(instrument, JWST_PRD_VERSION)
     else:
         reference_siaf = get_siaf(reference_siaf_input)
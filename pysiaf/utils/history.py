@@ -0,0 +1,207 @@
+"""Functions to follow the changes of SIAF apertures across JWST PRD versions.
+
+"""
+
+from __future__ import absolute_import, print_function, division
+from collections import OrderedDict
+import os
+import re
+
+from astropy.table import Table
+
+from ..aperture import PRD_REQUIRED_ATTRIBUTES_ORDERED, _canonical_value
+from ..constants import _DATA_ROOT
+from ..siaf import JWST_INSTRUMENT_NAME_MAPPING, Siaf, _prd_basepath
+
+# e.g. PRDOPSSOC-H-014, PRDOPSSOC-045, PRDOPSSOC-045-003
+_PRD_VERSION_PATTERN = r'^PRDOPSSOC-(?:[A-Z]-)?(\d+)(?:-(\d+))?$'
+
+
+def available_prd_versions():
+    """Return the JWST PRD versions shipped with pysiaf in chronological order.
+
+    Returns
+    -------
+    prd_versions : list of str
+        PRD versions, e.g. 'PRDOPSSOC-G-011', ..., 'PRDOPSSOC-040-001', ...
+
+    """
+    prd_versions = [prd_version for prd_version in os.listdir(os.path.join(_DATA_ROOT, 'JWST'))
+                    if re.match(_PRD_VERSION_PATTERN, prd_version)]
+    return sorted(prd_versions, key=_prd_version_key)
+
+
+def _prd_version_key(prd_version):
+    """Return a sort key that orders PRD versions chronologically."""
+    match = re.match(_PRD_VERSION_PATTERN, prd_version)
+    if match is None:
+        raise ValueError('Unknown PRD version format {}.'.format(prd_version))
+    return int(match.group(1)), int(match.group(2) or 0)
+
+
+class PrdHistory(object):
+    """Index of the changes of the apertures of a JWST instrument across PRD versions.
+
+    Every PRD version is read once, without going through the process-wide Siaf registry, and
+    only the previous version is kept in memory. Apertures whose content hash (see
+    Aperture.content_hash) differs from the previous version are compared attribute by attribute.
+    After the index is built, the history of an aperture or of one of its attributes is a
+    dictionary lookup.
+
+    Examples
+    --------
+    history = PrdHistory('NIRCam')
+    history.attribute_history('NRCA3_FULL', 'V3IdlYAngle')
+
+    """
+
+    def __init__(self, instrument, prd_versions=None, attributes=None):
+        """Build the change index.
+
+        Parameters
+        ----------
+        instrument : str
+            JWST instrument name, case-insensitive
+        prd_versions : list of str
+            PRD versions in chronological order, defaults to available_prd_versions()
+        attributes : list of str
+            Attributes that are followed, defaults to PRD_REQUIRED_ATTRIBUTES_ORDERED
+
+        """
+        if instrument.lower() not in JWST_INSTRUMENT_NAME_MAPPING:
+            raise ValueError('PRD history is only supported for JWST instruments.')
+        self.instrument = JWST_INSTRUMENT_NAME_MAPPING[instrument.lower()]
+        if prd_versions is None:
+            prd_versions = available_prd_versions()
+        self.prd_versions = list(prd_versions)
+        if attributes is None:
+            attributes = PRD_REQUIRED_ATTRIBUTES_ORDERED
+        self.attributes = list(attributes)
+        self._build()
+
+    def _build(self):
+        """Read all PRD versions and record the changes between consecutive versions."""
+        # aperture name -> list of (prd_version, status, changed attributes)
+        self._aperture_changes = OrderedDict()
+        # (aperture name, attribute) -> list of (prd_version, value)
+        self._attribute_changes = {}
+        # (aperture name, prd_version) -> content hash of the aperture
+        self._digests = {}
+        log = []
+
+        previous = OrderedDict()
+        for prd_version in self.prd_versions:
+            siaf = Siaf(self.instrument, basepath=_prd_basepath(self.instrument, prd_version))
+            current = OrderedDict()
+            for aperture_name, aperture in siaf.apertures.items():
+                digest = aperture.content_hash
+                self._digests[(aperture_name, prd_version)] = digest
+                current[aperture_name] = (digest, aperture)
+
+                if aperture_name not in previous:
+                    status = 'added'
+                    changed_attributes = list(self.attributes)
+                    values = tuple(getattr(aperture, attribute, None)
+                                   for attribute in self.attributes)
+                    log.append((prd_version, aperture_name, status, '', '', ''))
+                elif digest != previous[aperture_name][0]:
+                    status = 'modified'
+                    values = tuple(getattr(aperture, attribute, None)
+                                   for attribute in self.attributes)
+                    previous_values = tuple(getattr(previous[aperture_name][1], attribute, None)
+                                            for attribute in self.attributes)
+                    changed_attributes = [
+                        attribute for attribute, old, new in
+                        zip(self.attributes, previous_values, values)
+                        if _canonical_value(old) != _canonical_value(new)]
+                    if len(changed_attributes) == 0:
+                        # only attributes that are not followed changed
+                        continue
+                    for attribute in changed_attributes:
+                        index = self.attributes.index(attribute)
+                        log.append((prd_version, aperture_name, status, attribute,
+                                    str(previous_values[index]), str(values[index])))
+                else:
+                    continue
+
+                self._aperture_changes.setdefault(aperture_name, []).append(
+                    (prd_version, status, [] if status == 'added' else changed_attributes))
+                for attribute in changed_attributes:
+                    self._attribute_changes.setdefault((aperture_name, attribute), []).append(
+                        (prd_version, values[self.attributes.index(attribute)]))
+
+            for aperture_name in previous:
+                if aperture_name not in current:
+                    self._aperture_changes[aperture_name].append((prd_version, 'removed', []))
+                    log.append((prd_version, aperture_name, 'removed', '', '', ''))
+            previous = current
+
+        self._log = log
+
+    @property
+    def aperture_names(self):
+        """Names of all apertures that exist in at least one PRD version."""
+        return list(self._aperture_changes.keys())
+
+    def aperture_history(self, aperture_name):
+        """Return the PRD versions in which an aperture was added, modified, or removed.
+
+        Parameters
+        ----------
+        aperture_name : str
+            Aperture name
+
+        Returns
+        -------
+        history : list of tuples
+            (prd_version, status, changed_attributes) with status one of 'added', 'modified',
+            'removed'. changed_attributes lists the modified attributes.
+
+        """
+        if aperture_name not in self._aperture_changes:
+            raise KeyError('Aperture {} is not defined in any of the PRD versions.'.format(
+                aperture_name))
+        return [(prd_version, status, list(changed_attributes)) for
+                prd_version, status, changed_attributes in self._aperture_changes[aperture_name]]
+
+    def attribute_history(self, aperture_name, attribute):
+        """Return the PRD versions in which an attribute of an aperture took a new value.
+
+        Parameters
+        ----------
+        aperture_name : str
+            Aperture name
+        attribute : str
+            Attribute name, e.g. 'V3IdlYAngle'
+
+        Returns
+        -------
+        history : list of tuples
+            (prd_version, value), the first entry holds the value at the first appearance of the
+            aperture
+
+        """
+        if (aperture_name, attribute) not in self._attribute_changes:
+            raise KeyError('No history of {} of aperture {}.'.format(attribute, aperture_name))
+        return list(self._attribute_changes[(aperture_name, attribute)])
+
+    def digest(self, aperture_name, prd_version):
+        """Return the content hash of an aperture in a PRD version, see Aperture.content_hash."""
+        return self._digests[(aperture_name, prd_version)]
+
+    def change_log(self):
+        """Return all changes as a compact table.
+
+        Added and removed apertures take one row each, modifications one row per changed
+        attribute. The table can be exported with its write method, e.g. in ecsv format.
+
+        Returns
+        -------
+        log : astropy.table.Table
+            Columns prd_version, aperture, status, attribute, previous, and value
+
+        """
+        names = ('prd_version', 'aperture', 'status', 'attribute', 'previous', 'value')
+        if len(self._log) == 0:
+            return Table(names=names, dtype=[str] * len(names))
+        return Table(rows=self._log, names=names)
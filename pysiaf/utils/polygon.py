@@ -0,0 +1,293 @@
+"""A collection of vectorized functions to support operations on aperture outlines.
+
+"""
+
+import numpy as np
+
+
+def bounding_box(polygon_x, polygon_y):
+    """Return the axis-aligned bounding box of a polygon.
+
+    Parameters
+    ----------
+    polygon_x : numpy array
+        x coordinates of polygon vertices
+    polygon_y : numpy array
+        y coordinates of polygon vertices
+
+    Returns
+    -------
+    x_min, x_max, y_min, y_max : tuple of floats
+        limits of the bounding box
+
+    """
+    return np.min(polygon_x), np.max(polygon_x), np.min(polygon_y), np.max(polygon_y)
+
+
+def points_in_polygon(x, y, polygon_x, polygon_y):
+    """Return which points are inside a polygon.
+
+    Uses the even-odd (ray casting) rule, evaluated for all points at once. The polygon may be
+    given open or closed, i.e. with the first vertex repeated at the end.
+
+    Parameters
+    ----------
+    x : numpy array
+        x coordinates of points
+    y : numpy array
+        y coordinates of points
+    polygon_x : numpy array
+        x coordinates of polygon vertices
+    polygon_y : numpy array
+        y coordinates of polygon vertices
+
+    Returns
+    -------
+    inside : numpy array of bool
+        True for points inside the polygon, same shape as x
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    polygon_x = np.asarray(polygon_x, dtype=float)
+    polygon_y = np.asarray(polygon_y, dtype=float)
+
+    inside = np.zeros(x.shape, dtype=bool)
+    previous_x = np.roll(polygon_x, 1)
+    previous_y = np.roll(polygon_y, 1)
+    for x1, y1, x2, y2 in zip(polygon_x, polygon_y, previous_x, previous_y):
+        if y1 == y2:
+            # horizontal edges never cross the ray
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def polygons_overlap(polygon1_x, polygon1_y, polygon2_x, polygon2_y):
+    """Return whether two polygons overlap.
+
+    The polygons overlap if any of their edges cross or if a vertex or edge midpoint of one
+    polygon lies inside the other. The result for polygons that only touch is undefined.
+
+    Parameters
+    ----------
+    polygon1_x, polygon1_y : numpy arrays
+        coordinates of the vertices of the first polygon
+    polygon2_x, polygon2_y : numpy arrays
+        coordinates of the vertices of the second polygon
+
+    Returns
+    -------
+    overlap : bool
+        True if the polygons overlap
+
+    """
+    polygon1_x = np.asarray(polygon1_x, dtype=float)
+    polygon1_y = np.asarray(polygon1_y, dtype=float)
+    polygon2_x = np.asarray(polygon2_x, dtype=float)
+    polygon2_y = np.asarray(polygon2_y, dtype=float)
+
+    for x, y, other_x, other_y in [(polygon1_x, polygon1_y, polygon2_x, polygon2_y),
+                                   (polygon2_x, polygon2_y, polygon1_x, polygon1_y)]:
+        test_x = np.hstack((x, (x + np.roll(x, -1)) / 2.))
+        test_y = np.hstack((y, (y + np.roll(y, -1)) / 2.))
+        if np.any(points_in_polygon(test_x, test_y, other_x, other_y)):
+            return True
+
+    # edges of polygon 1 along the first axis, edges of polygon 2 along the second axis
+    x1 = polygon1_x[:, np.newaxis]
+    y1 = polygon1_y[:, np.newaxis]
+    x2 = np.roll(polygon1_x, -1)[:, np.newaxis]
+    y2 = np.roll(polygon1_y, -1)[:, np.newaxis]
+    x3 = polygon2_x[np.newaxis, :]
+    y3 = polygon2_y[np.newaxis, :]
+    x4 = np.roll(polygon2_x, -1)[np.newaxis, :]
+    y4 = np.roll(polygon2_y, -1)[np.newaxis, :]
+
+    # the edges intersect if the end points of each edge lie on opposite sides of the other
+    side3 = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
+    side4 = (x2 - x1) * (y4 - y1) - (y2 - y1) * (x4 - x1)
+    side1 = (x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)
+    side2 = (x4 - x3) * (y2 - y3) - (y4 - y3) * (x2 - x3)
+    return bool(np.any((side3 * side4 < 0) & (side1 * side2 < 0)))
+
+
+def polygon_area(polygon_x, polygon_y):
+    """Return the area of polygons using the shoelace formula.
+
+    Parameters
+    ----------
+    polygon_x : numpy array
+        x coordinates of polygon vertices, the last axis runs over the vertices. Trailing NaN
+        vertices are ignored, which allows for stacks of polygons with different vertex counts.
+    polygon_y : numpy array
+        y coordinates of polygon vertices
+
+    Returns
+    -------
+    area : float or numpy array
+        unsigned area of the polygons, zero for polygons without valid vertices
+
+    """
+    polygon_x = np.asarray(polygon_x, dtype=float)
+    polygon_y = np.asarray(polygon_y, dtype=float)
+    return np.abs(_signed_area(polygon_x, polygon_y))
+
+
+def _signed_area(polygon_x, polygon_y):
+    """Return the signed area of NaN-padded polygons, positive for counterclockwise vertices."""
+    valid = ~(np.isnan(polygon_x) | np.isnan(polygon_y))
+    count = np.sum(valid, axis=-1)
+    x = np.where(valid, polygon_x, 0.)
+    y = np.where(valid, polygon_y, 0.)
+    # the successor of the last valid vertex is the first vertex
+    index = np.arange(polygon_x.shape[-1])
+    successor = np.where(index + 1 < count[..., np.newaxis], index + 1, 0)
+    next_x = np.take_along_axis(x, successor, axis=-1)
+    next_y = np.take_along_axis(y, successor, axis=-1)
+    return 0.5 * np.sum(np.where(valid, x * next_y - next_x * y, 0.), axis=-1)
+
+
+def clip_convex_polygons(subject_x, subject_y, clip_x, clip_y):
+    """Return the intersections of stacks of convex polygons.
+
+    Applies the Sutherland-Hodgman algorithm to all pairs of polygons at once. Polygons can
+    be oriented clockwise or counterclockwise, e.g. the outlines of apertures with negative
+    parity.
+
+    Parameters
+    ----------
+    subject_x : numpy array
+        x coordinates of the polygon vertices, shape (M, n). Trailing vertices may be NaN.
+    subject_y : numpy array
+        y coordinates of the polygon vertices, shape (M, n)
+    clip_x : numpy array
+        x coordinates of the convex clipping polygons, shape (M, m)
+    clip_y : numpy array
+        y coordinates of the convex clipping polygons, shape (M, m)
+
+    Returns
+    -------
+    intersection_x, intersection_y : numpy arrays
+        vertices of the intersection polygons, shape (M, n+m). Unused vertices are NaN, pairs
+        that do not intersect have only NaN vertices.
+
+    """
+    subject_x = np.atleast_2d(np.asarray(subject_x, dtype=float))
+    subject_y = np.atleast_2d(np.asarray(subject_y, dtype=float))
+    clip_x = np.atleast_2d(np.asarray(clip_x, dtype=float))
+    clip_y = np.atleast_2d(np.asarray(clip_y, dtype=float))
+    number_of_pairs = subject_x.shape[0]
+    size = subject_x.shape[1] + clip_x.shape[1]
+
+    x = np.full((number_of_pairs, size), np.nan)
+    y = np.full((number_of_pairs, size), np.nan)
+    x[:, :subject_x.shape[1]] = subject_x
+    y[:, :subject_y.shape[1]] = subject_y
+
+    # orient the half-plane tests by the winding direction of each clipping polygon
+    orientation = np.sign(_signed_area(clip_x, clip_y))[:, np.newaxis]
+    clip_count = np.sum(~np.isnan(clip_x), axis=1)
+    rows = np.arange(number_of_pairs)[:, np.newaxis]
+    index = np.arange(size)[np.newaxis, :]
+
+    for j in range(clip_x.shape[1]):
+        edge = j < clip_count
+        next_j = np.where(j + 1 < clip_count, j + 1, 0)
+        x1 = clip_x[:, j][:, np.newaxis]
+        y1 = clip_y[:, j][:, np.newaxis]
+        x2 = clip_x[np.arange(number_of_pairs), next_j][:, np.newaxis]
+        y2 = clip_y[np.arange(number_of_pairs), next_j][:, np.newaxis]
+
+        valid = ~np.isnan(x)
+        count = np.sum(valid, axis=1)[:, np.newaxis]
+        successor = np.where(index + 1 < count, index + 1, 0)
+        next_x = x[rows, successor]
+        next_y = y[rows, successor]
+
+        side = orientation * ((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1))
+        next_side = orientation * ((x2 - x1) * (next_y - y1) - (y2 - y1) * (next_x - x1))
+        inside = side >= 0
+        next_inside = next_side >= 0
+
+        # every vertex contributes itself if inside and the edge crossing if any
+        crossing = valid & (inside != next_inside)
+        keep = valid & inside
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = side / (side - next_side)
+            crossing_x = x + fraction * (next_x - x)
+            crossing_y = y + fraction * (next_y - y)
+        candidate_x = np.stack((x, crossing_x), axis=2).reshape(number_of_pairs, -1)
+        candidate_y = np.stack((y, crossing_y), axis=2).reshape(number_of_pairs, -1)
+        candidate_valid = np.stack((keep, crossing), axis=2).reshape(number_of_pairs, -1)
+
+        # move the retained vertices to the front, preserving their order
+        order = np.argsort(~candidate_valid, axis=1, kind='stable')[:, :size]
+        retained = np.take_along_axis(candidate_valid, order, axis=1)
+        clipped_x = np.where(retained, np.take_along_axis(candidate_x, order, axis=1), np.nan)
+        clipped_y = np.where(retained, np.take_along_axis(candidate_y, order, axis=1), np.nan)
+
+        # skip padding edges of clipping polygons with fewer vertices
+        x = np.where(edge[:, np.newaxis], clipped_x, x)
+        y = np.where(edge[:, np.newaxis], clipped_y, y)
+
+    return x, y
+
+
+def intersect_polygons(polygons1, polygons2, pairs=None):
+    """Return the intersection polygons and areas of pairs of convex polygons.
+
+    Pairs whose bounding boxes do not overlap are discarded before clipping, so that large
+    numbers of candidate pairs can be evaluated efficiently.
+
+    Parameters
+    ----------
+    polygons1 : numpy array
+        vertices of the first set of convex polygons, shape (N1, n, 2), e.g. the output of
+        ApertureCollection.corners. Polygons with NaN vertices never intersect.
+    polygons2 : numpy array
+        vertices of the second set of convex polygons, shape (N2, m, 2)
+    pairs : numpy array
+        indices into polygons1 and polygons2 of the pairs to evaluate, shape (P, 2). By default
+        all N1*N2 pairs are evaluated, in the order of numpy.ndindex((N1, N2)).
+
+    Returns
+    -------
+    intersections : numpy array
+        vertices of the intersection polygons, shape (P, n+m, 2). Unused vertices are NaN.
+    areas : numpy array
+        areas of the intersections, shape (P,)
+
+    """
+    polygons1 = np.asarray(polygons1, dtype=float)
+    polygons2 = np.asarray(polygons2, dtype=float)
+    if pairs is None:
+        pairs = np.stack(np.meshgrid(np.arange(len(polygons1)), np.arange(len(polygons2)),
+                                     indexing='ij'), axis=-1).reshape(-1, 2)
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    size = polygons1.shape[1] + polygons2.shape[1]
+
+    intersections = np.full((len(pairs), size, 2), np.nan)
+    areas = np.zeros(len(pairs))
+
+    with np.errstate(invalid='ignore'):
+        # bounding boxes of polygons with NaN vertices are NaN and never overlap
+        minimum1 = np.min(polygons1, axis=1)
+        maximum1 = np.max(polygons1, axis=1)
+        minimum2 = np.min(polygons2, axis=1)
+        maximum2 = np.max(polygons2, axis=1)
+        candidate = np.all((minimum1[pairs[:, 0]] <= maximum2[pairs[:, 1]]) &
+                           (minimum2[pairs[:, 1]] <= maximum1[pairs[:, 0]]), axis=1)
+    candidate = np.flatnonzero(candidate)
+    if len(candidate) == 0:
+        return intersections, areas
+
+    subject = polygons1[pairs[candidate, 0]]
+    clip = polygons2[pairs[candidate, 1]]
+    x, y = clip_convex_polygons(subject[:, :, 0], subject[:, :, 1], clip[:, :, 0], clip[:, :, 1])
+    intersections[candidate, :, 0] = x
+    intersections[candidate, :, 1] = y
+    areas[candidate] = polygon_area(x, y)
+    return intersections, areas
@@ -12,7 +12,6 @@ from __future__ import absolute_import, print_function, division
 from collections import OrderedDict
 
 import numpy as np
-from scipy import linalg
 
 
 def add_rotation(A, B, theta_deg):
@@ -370,9 +369,14 @@ def jacob(a, b, x, y):
     area : array
         area in (u,v) coordinates matching unit area in the (x,y) coordinates.
 
+    Notes
+    -----
+    x and y only have to be broadcastable, e.g. a row and a column of pixel positions yield
+    the area of all pixels in the grid they span.
 
     """
-    j = dpdx(a, x, y)*dpdy(b, x, y) - dpdx(b, x, y)*dpdy(a, x, y)
+    da_dx, da_dy, db_dx, db_dy = partial_derivatives(a, b, x, y)
+    j = da_dx*db_dy - db_dx*da_dy
     area = np.fabs(j)
     return area
 
@@ -386,6 +390,53 @@ def number_of_coefficients(poly_degree):
         raise TypeError('Argument has to be of type int')
 
 
+def partial_derivatives(a, b, x, y):
+    """Return the partial derivatives of two polynomials.
+
+    This is equivalent to calling dpdx and dpdy for both polynomials, but the powers of x and y
+    are computed only once and shared by the four derivatives.
+
+    Parameters
+    ----------
+    a : array
+        set of polynomial coefficients converting from (x,y) to u
+    b : array
+        set of polynomial coefficients converting from (x,y) to v, of the same degree as a
+    x : array
+        x position or array of x positions
+    y : array
+        y position or array of y positions, broadcastable with x
+
+    Returns
+    -------
+    da_dx, da_dy, db_dx, db_dy : tuple of arrays
+        partial derivatives at the given (x,y) point(s)
+
+    """
+    poly_degree = polynomial_degree(len(a))
+
+    x_powers = [np.ones_like(x, dtype=float)]
+    y_powers = [np.ones_like(y, dtype=float)]
+    for i in range(1, poly_degree):
+        x_powers.append(x_powers[-1] * x)
+        y_powers.append(y_powers[-1] * y)
+
+    da_dx = db_dx = da_dy = db_dy = 0.0
+    k = 1  # index for coefficients
+    for i in range(1, poly_degree + 1):
+        for j in range(i + 1):
+            if i - j > 0:
+                term = (i - j) * x_powers[i - j - 1] * y_powers[j]
+                da_dx = da_dx + a[k] * term
+                db_dx = db_dx + b[k] * term
+            if j > 0:
+                term = j * x_powers[i - j] * y_powers[j - 1]
+                da_dy = da_dy + a[k] * term
+                db_dy = db_dy + b[k] * term
+            k += 1
+    return da_dx, da_dy, db_dx, db_dy
+
+
 def poly(a, x, y, order=4):
     """Polynomial evaluation.
 
@@ -452,6 +503,7 @@ def polyfit(u, x, y, order):
         polynomial coefficients being the solution to the fit.
 
     """
+    from scipy import linalg
     # First set up x and y powers for each coefficient
     px = []
     py = []
@@ -7,8 +7,6 @@ Authors
 """
 
 import numpy as np
-from astropy.modeling import models as astmodels
-from astropy.modeling import rotations as astrotations
 import astropy.units as u
 
 
@@ -43,6 +41,8 @@ def project_to_tangent_plane(ra, dec, ra_ref, dec_ref, scale=1.):
         pixel coordinates in decimal degrees if scale = 1.0
 
     """
+    from astropy.modeling import models as astmodels
+    from astropy.modeling import rotations as astrotations
     # for zenithal projections, i.e. gnomonic, i.e. TAN:
     if isinstance(ra_ref, u.Quantity):
         lonpole = 180. * u.deg
@@ -95,6 +95,8 @@ def deproject_from_tangent_plane(x, y, ra_ref, dec_ref, scale=1., unwrap=True):
         declination in decimal degrees
 
     """
+    from astropy.modeling import models as astmodels
+    from astropy.modeling import rotations as astrotations
     # for zenithal projections, i.e. gnomonic, i.e. TAN
     if isinstance(ra_ref, u.Quantity):
         lonpole = 180. * u.deg
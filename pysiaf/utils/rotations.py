@@ -11,7 +11,6 @@ import copy
 import numpy as np
 
 import astropy.units as u
-from astropy.modeling.rotations import rotation_matrix
 
 
 def attitude(v2, v3, ra, dec, pa):
@@ -116,6 +115,7 @@ def attitude_matrix(nu2, nu3, ra, dec, pa, convention='JWST'):
         the attitude matrix
 
     """
+    from astropy.modeling.rotations import rotation_matrix
     if convention == 'JWST':
         pa_sign = -1.
 
@@ -17,7 +17,7 @@ from ..constants import V3_TO_YAN_OFFSET_DEG
 from ..iando import read
 from .polynomial import shift_coefficients, flip_y, flip_x, add_rotation, \
     prepend_rotation_to_polynomial, poly, print_triangle
-from ..siaf import Siaf
+from ..siaf import get_cached_siaf
 from ..utils import rotations
 
 
@@ -117,6 +117,100 @@ def compute_roundtrip_error(A, B, C, D, offset_x=0., offset_y=0., verbose=False,
     return error_estimation_metric, dx.mean(), dy.mean(), dx.std(), dy.std(), data
 
 
+def compute_roundtrip_errors(A, B, C, D, offset_x=0., offset_y=0., instrument='',
+                             grid_amplitude=None):
+    """Return the roundtrip errors of many distortion transformations at once.
+
+    Stacked equivalent of compute_roundtrip_error, every row of the coefficient arrays defines
+    one transformation. Coefficient rows of lower degree are padded with zeros.
+
+    Parameters
+    ----------
+    A : numpy array or list of arrays
+        polynomial coefficients, one row per transformation
+    B : numpy array or list of arrays
+        polynomial coefficients
+    C : numpy array or list of arrays
+        polynomial coefficients
+    D : numpy array or list of arrays
+        polynomial coefficients
+    offset_x : float or numpy array
+        Offsets subtracted from input coordinates
+    offset_y : float or numpy array
+        Offsets subtracted from input coordinates
+    instrument : str
+        Instrument name
+    grid_amplitude : float or numpy array
+        Grid extents, nan entries use the instrument default
+
+    Returns
+    -------
+    error_estimation_metric, dx_mean, dy_mean, dx_std, dy_std, data : tuple
+        arrays with one entry per transformation, data holds the (N, 100) arrays x, y, x2, y2
+
+    """
+    coefficients = []
+    for rows in [A, B, C, D]:
+        width = max(len(row) for row in rows)
+        stacked = np.zeros((len(rows), width))
+        for k, row in enumerate(rows):
+            stacked[k, 0:len(row)] = row
+        coefficients.append(stacked)
+    width = max(stacked.shape[1] for stacked in coefficients)
+    coefficients = [np.pad(stacked, ((0, 0), (0, width - stacked.shape[1])))
+                    for stacked in coefficients]
+    order = int((np.sqrt(8 * width + 1) - 3) / 2)
+    number_of_transformations = len(coefficients[0])
+
+    if instrument.lower() == 'miri':
+        default_amplitude = 1024
+    else:
+        default_amplitude = 2048
+    if grid_amplitude is None:
+        grid_amplitude = default_amplitude
+    grid_amplitude = np.broadcast_to(np.asarray(grid_amplitude, dtype=float),
+                                     (number_of_transformations,))
+    grid_amplitude = np.where(np.isnan(grid_amplitude), default_amplitude, grid_amplitude)
+
+    # regular grids of points as in get_grid_coordinates, one row per transformation
+    centre = grid_amplitude / 2 + 1
+    linear = np.linspace(centre - grid_amplitude / 2, centre + grid_amplitude / 2, 10, axis=1)
+    x = np.tile(linear, 10)
+    y = np.repeat(linear, 10, axis=1)
+
+    offset_x = np.broadcast_to(np.asarray(offset_x, dtype=float),
+                               (number_of_transformations,))[:, np.newaxis]
+    offset_y = np.broadcast_to(np.asarray(offset_y, dtype=float),
+                               (number_of_transformations,))[:, np.newaxis]
+    A, B, C, D = [stacked.T[:, :, np.newaxis] for stacked in coefficients]
+
+    x_in = x - offset_x
+    y_in = y - offset_y
+
+    # transform in one direction
+    u = poly(A, x_in, y_in, order)
+    v = poly(B, x_in, y_in, order)
+
+    # transform back the opposite direction
+    x2 = poly(C, u, v, order) + offset_x
+    y2 = poly(D, u, v, order) + offset_y
+
+    data = {'x': x, 'y': y, 'x2': x2, 'y2': y2}
+
+    # absolute coordinate differences
+    dx = np.abs(x2 - x)
+    dy = np.abs(y2 - y)
+    dx_mean = dx.mean(axis=1)
+    dy_mean = dy.mean(axis=1)
+    dx_std = dx.std(axis=1)
+    dy_std = dy.std(axis=1)
+
+    # see compute_roundtrip_error
+    with np.errstate(invalid='ignore', divide='ignore'):
+        error_estimation_metric = np.abs(dx_mean / dx_std) + np.abs(dx_mean / dx_std)
+    return error_estimation_metric, dx_mean, dy_mean, dx_std, dy_std, data
+
+
 def convert_polynomial_coefficients(A_in, B_in, C_in, D_in, oss=False, inverse=False,
                                     parent_aperture=None):
     """Emulate some transformation made in nircam_get_polynomial_both.
@@ -302,7 +396,7 @@ def jwst_fgs_to_fgs_matrix(direction='fgs2_to_fgs1', siaf=None, verbose=False):
 
     """
     if siaf is None:
-        siaf = Siaf('fgs')
+        siaf = get_cached_siaf('fgs')
 
     if direction=='fgs2_to_fgs1':
         fgs1 = siaf['FGS2_FULL_OSS']